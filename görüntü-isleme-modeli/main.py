@@ -3,17 +3,28 @@ Ana Uygulama - İHA Görüntü İşleme ve Kontrol Sistemi
 """
 
 import cv2
-import yaml
+import time
+import numpy as np
 import argparse
 from pathlib import Path
 from loguru import logger
 from datetime import datetime
 
 from src.core.sensor_manager import CameraManager, PixhawkManager
+from src.core.config_manager import ConfigManager
+from src.core.video_recorder import VideoRecorder
+from src.core.event_capture import EventCapture
+from src.core.startup import StartupOrchestrator
+from src.core.adaptive_controller import AdaptiveController
 from src.vision.color_filter import ColorFilter
+from src.vision.frame_quality import FrameQualityGate
 from src.vision.target_detector import TargetDetector
+from src.vision.target_tracker import TargetTracker
+from src.vision.hybrid_detector import HybridDetector
+from src.vision.hud_renderer import HudRenderer
 from src.decision.decision_engine import DecisionEngine, TourType
 from src.localization.map_manager import MapManager
+from src.localization.camera_model import CameraModel
 
 
 class UAVSystem:
@@ -26,9 +37,9 @@ class UAVSystem:
         Args:
             config_path: Konfigürasyon dosyası yolu
         """
-        # Konfigürasyonu yükle
-        with open(config_path, 'r', encoding='utf-8') as f:
-            self.config = yaml.safe_load(f)
+        # Konfigürasyonu yükle ve doğrula
+        self.config_manager = ConfigManager(config_path)
+        self.config = self.config_manager.config
 
         # Loglama ayarları
         self._setup_logging()
@@ -38,13 +49,54 @@ class UAVSystem:
         self.pixhawk = PixhawkManager(self.config)
         self.color_filter = ColorFilter(self.config)
         self.target_detector = TargetDetector(self.config)
-        self.decision_engine = DecisionEngine(self.config)
+        self.target_tracker = TargetTracker(self.config)
+        self.hybrid_detector = HybridDetector(self.config, self.color_filter, self.target_detector)
+        self.adaptive = AdaptiveController(self.config, self.color_filter, self.target_detector)
+        # Kamera modeli işlenen frame boyutunda (ölçekli MJPEG çözümünde küçültülmüş)
+        self.camera_model = CameraModel(self.config, self.camera.frame_size)
+        self.decision_engine = DecisionEngine(self.config, self.camera_model)
+        # Bulanıklık eşiği tam çözünürlük pikseli; odak uzaklığı ölçekli çözümden geri çevrilir
+        self.quality_gate = FrameQualityGate(self.config, self.camera_model.focal_length * self.camera.decode_scale)
         self.map_manager = MapManager(self.config)
+        self.hud = HudRenderer()
+        self.recorder = VideoRecorder(self.config)
+        self.event_capture = EventCapture(self.config)
 
         # Durum değişkenleri
         self.current_tour = None
         self.target_color = None
         self.running = False
+        # Son işlenen frame'de görülen onaylı izler (haritaya toplu izdüşürülür)
+        self.visible_tracks = []
+
+        # Çalışma anında değiştirilebilen ayarlar
+        self._apply_runtime_config(self.config)
+        self._subscribe_config()
+
+    def _subscribe_config(self):
+        """Bileşenleri ilgili konfigürasyon bölümlerine abone et"""
+        cm = self.config_manager
+        # Renk filtresi ve YOLO ayarları adaptif seviye uygulanarak yüklenir
+        cm.subscribe('image_processing.color_filters', self.adaptive.reload)
+        cm.subscribe('image_processing.morphology', self.adaptive.reload)
+        cm.subscribe('image_processing.contour', self.adaptive.reload)
+        cm.subscribe('image_processing.strip_parallel', self.adaptive.reload)
+        cm.subscribe('detection', self.adaptive.reload)
+        cm.subscribe('adaptive', self.adaptive.reload)
+        cm.subscribe('image_processing.ballistics', self.decision_engine.reload)
+        cm.subscribe('image_processing.frame_quality', self.quality_gate.reload)
+        cm.subscribe('image_processing.hybrid', self.hybrid_detector.reload)
+        cm.subscribe('tracking', self.target_tracker.reload)
+        cm.subscribe('decision', self.decision_engine.reload)
+        cm.subscribe('logging', self._apply_runtime_config)
+        cm.subscribe('localization.map_update_rate', self._apply_runtime_config)
+        cm.subscribe('firing_system', self._apply_runtime_config)
+
+    def _apply_runtime_config(self, config):
+        """Ana döngünün kullandığı ayarları önceden hesapla"""
+        self.config = config
+        self.save_images = config['logging']['save_images']
+        self.map_interval = 1.0 / config['localization']['map_update_rate']
 
     def _setup_logging(self):
         """Loglama sistemini ayarla"""
@@ -60,38 +112,77 @@ class UAVSystem:
         logger.info("Loglama sistemi başlatıldı")
 
     def initialize(self) -> bool:
-        """Tüm bileşenleri başlat"""
+        """
+        Tüm bileşenleri başlat
+
+        Kamera, Pixhawk, YOLO ve harita eş zamanlı ve süre sınırlı başlatılır.
+        Kamera zorunludur; diğerleri süresinde hazır olmazsa ana döngü onlarsız
+        başlar ve bileşen hazır olduğunda kendiliğinden devreye girer.
+        """
         logger.info("Sistem başlatılıyor...")
 
-        # Kamera başlat
-        if not self.camera.initialize():
-            logger.error("Kamera başlatılamadı")
-            return False
+        self.startup = StartupOrchestrator(self.config)
+        self.startup.add('camera', self.camera.initialize, required=True)
 
         # Pixhawk bağlantısı (opsiyonel - simülasyon modu için)
         if self.config['sensors']['pixhawk']['connection_string']:
-            if not self.pixhawk.initialize():
-                logger.warning("Pixhawk bağlantısı kurulamadı - Simülasyon modunda devam ediliyor")
+            self.startup.add('pixhawk', self._initialize_pixhawk)
 
-        # YOLO modeli yükle (eğer kullanılacaksa)
+        # YOLO modeli yükle ve ısıt (eğer kullanılacaksa)
         if self.config['image_processing']['tour_detection']['enabled']:
-            if not self.target_detector.initialize():
-                logger.warning("YOLO modeli yüklenemedi")
+            self.startup.add('detector', self._initialize_detector)
+
+        # Canlı harita dışa aktarımı ve karo sunucusu (arka plan)
+        self.startup.add('map', self._initialize_map)
+
+        self.startup.start()
+
+        # config.yaml değişikliklerini izle
+        self.config_manager.start_watching()
+
+        # Trajectory kaydı (arka plan)
+        self.map_manager.start_persistence()
+
+        # Video ve olay kaydı (arka plan)
+        self.recorder.start()
+        self.event_capture.start()
+
+        if not self.startup.wait():
+            logger.error("Kamera başlatılamadı")
+            return False
 
         logger.info("Sistem başarıyla başlatıldı")
         return True
 
+    def _initialize_pixhawk(self) -> bool:
+        if not self.pixhawk.initialize():
+            logger.warning("Pixhawk bağlantısı kurulamadı - Simülasyon modunda devam ediliyor")
+            return False
+        return True
+
+    def _initialize_detector(self) -> bool:
+        if not self.target_detector.initialize():
+            logger.warning("YOLO modeli yüklenemedi")
+            return False
+        return True
+
+    def _initialize_map(self) -> bool:
+        self.map_manager.start_export()
+        return True
+
     def set_tour(self, tour_type: TourType, target_color: str = None):
         """
         Tur tipini ayarla
 
         Args:
-            tour_type: Tur tipi (TUR_1 veya TUR_2)
-            target_color: Hedef rengi (TUR_1 için: 'red', 'green', 'blue')
+            tour_type: Tur tipi (TUR_1, TUR_2 veya HIBRIT)
+            target_color: Hedef rengi (TUR_1 ve HIBRIT için: 'red', 'green', 'blue')
         """
         self.current_tour = tour_type
         self.target_color = target_color
+        self.target_tracker.reset()
         self.decision_engine.set_tour_type(tour_type)
+        self.pixhawk.set_stream_profile('mission')
 
         logger.info(f"Tur ayarlandı: {tour_type.name}, Renk: {target_color}")
 
@@ -109,12 +200,14 @@ class UAVSystem:
             logger.error("Hedef renk ayarlanmamış")
             return frame, None
 
-        # Renk filtresi ile hedef tespiti
-        detection = self.color_filter.process_frame(frame, self.target_color)
+        # Renk filtresi ile tüm adayları bul (adaptif çözünürlükte), izlenen hedefi seç
+        detections = self.color_filter.detect_targets(self.adaptive.downscale(frame), self.target_color)
+        detections = self.adaptive.upscale(detections)
+        detection = self._select_tracked_target(detections)
 
         if detection:
             # Tespit sonucunu çiz
-            frame = self.color_filter.draw_detection(frame, detection)
+            frame = self.color_filter.draw_detection(frame, detection, copy=False)
 
         return frame, detection
 
@@ -128,33 +221,82 @@ class UAVSystem:
         Returns:
             İşlenmiş frame ve tespit sonucu
         """
+        # Model arka planda yükleniyorsa tespit atlanır
+        if self.target_detector.model is None:
+            return frame, None
+
         # YOLO ile hedef tespiti
-        detections = self.target_detector.detect(frame)
+        detections = self.adaptive.upscale(self.target_detector.detect(self.adaptive.downscale(frame)))
 
         if detections:
             # Tespitleri çiz
-            frame = self.target_detector.draw_detections(frame, detections)
+            frame = self.target_detector.draw_detections(frame, detections, copy=False)
+
+        # Hedef sınıfındaki tespitleri izle, kilitli izi seç
+        targets = [d for d in detections if d['class_name'] == 'target']
+        return frame, self._select_tracked_target(targets)
+
+    def process_tour_hybrid(self, frame):
+        """
+        Hibrit işleme - Renk filtresi ve YOLO paralel, sonuçlar birleştirilir
+
+        Args:
+            frame: Kameradan gelen görüntü
+
+        Returns:
+            İşlenmiş frame ve tespit sonucu
+        """
+        detections = self.hybrid_detector.detect(self.adaptive.downscale(frame), self.target_color)
+        detections = self.adaptive.upscale(detections)
+
+        if detections:
+            frame = self.target_detector.draw_detections(frame, detections, copy=False)
+
+        return frame, self._select_tracked_target(detections)
 
-            # En iyi hedefi seç
-            best_target = self.target_detector.get_best_target(detections)
-            return frame, best_target
+    def _select_tracked_target(self, detections):
+        """
+        Tespitleri takipçiye ver ve karar motorunun seçtiği izi döndür
 
-        return frame, None
+        Args:
+            detections: Frame'deki aday tespitler
+
+        Returns:
+            İz kimliği eklenmiş tespit veya None
+        """
+        tracks = self.target_tracker.update(detections)
+        self.visible_tracks = [t for t in tracks if t.time_since_update == 0]
+        track = self.decision_engine.select_track(tracks)
+
+        return track.as_detection() if track else None
 
     def run(self):
         """Ana döngü"""
         self.running = True
         frame_count = 0
+        last_map_export = time.monotonic()
 
         logger.info("Ana döngü başlatıldı")
 
         try:
             while self.running:
+                # Bekleyen konfigürasyon değişikliklerini frame'ler arasında uygula
+                self.config_manager.apply_pending()
+
                 # Frame oku
                 frame = self.camera.read_frame()
                 if frame is None:
                     logger.warning("Frame okunamadı")
                     continue
+                frame_start = time.perf_counter()
+
+                # Ham akış tam çözünürlükte: MJPEG modunda kamera verisi yeniden kodlanmadan,
+                # aksi halde tespit ve HUD aynı frame üzerine çizildiği için kopyalanarak kaydedilir
+                encoded = self.camera.encoded_frame()
+                if encoded is not None:
+                    self.recorder.record_encoded('raw', encoded, frame_count, self.camera.resolution)
+                else:
+                    self.recorder.record('raw', self.camera.full_frame(), frame_count)
 
                 # Sensör verilerini güncelle
                 self.pixhawk.update_telemetry()
@@ -162,11 +304,23 @@ class UAVSystem:
                 altitude = self.pixhawk.get_altitude()
                 attitude = self.pixhawk.get_attitude()
 
+                # Bulanık veya pozlaması bozuk frame'lerde tespit/karar atlanır, durum korunur
+                usable, _ = self.quality_gate.assess(frame, attitude)
+
+                # Yük altında tespit her N frame'de bir çalışır; aradaki frame'lerde de durum korunur
+                detect = usable and self.adaptive.should_detect(frame_count)
+
                 # Görüntü işleme (tur tipine göre)
-                if self.current_tour == TourType.TUR_1:
+                self.visible_tracks = []
+                if not detect:
+                    processed_frame = frame
+                    detection = None
+                elif self.current_tour == TourType.TUR_1:
                     processed_frame, detection = self.process_tour_1(frame)
                 elif self.current_tour == TourType.TUR_2:
                     processed_frame, detection = self.process_tour_2(frame)
+                elif self.current_tour == TourType.HIBRIT:
+                    processed_frame, detection = self.process_tour_hybrid(frame)
                 else:
                     processed_frame = frame
                     detection = None
@@ -179,11 +333,15 @@ class UAVSystem:
                     'attitude': attitude
                 }
 
-                decision = self.decision_engine.process_decision(detection, sensor_data)
+                if detect:
+                    decision = self.decision_engine.process_decision(detection, sensor_data)
+                else:
+                    decision = self.decision_engine.hold_decision()
 
                 # Ateş kararı
                 if decision['can_fire']:
                     logger.info("ATEŞ ETME KOMUTU!")
+                    self.event_capture.trigger('fire', frame_count, {'fire_solution': decision['fire_solution']})
                     self.fire_weapon()
 
                 # Harita güncelleme
@@ -191,23 +349,43 @@ class UAVSystem:
                     coords = (gps_data['lat'], gps_data['lon'])
                     self.map_manager.add_trajectory_point(coords, altitude)
 
-                    if detection:
-                        self.map_manager.add_target_location(
-                            coords,
-                            'target',
-                            detection.get('confidence', 1.0)
+                    if self.visible_tracks and altitude > 0:
+                        # Frame'deki tüm onaylı izlerin merkezlerini tek çağrıda yere izdüşür
+                        target_coords = self.camera_model.pixels_to_ground(
+                            [track.center for track in self.visible_tracks], gps_data, altitude, attitude
                         )
 
+                        for track, coords in zip(self.visible_tracks, target_coords):
+                            if not np.isnan(coords).any():
+                                self.map_manager.add_target_location(
+                                    (float(coords[0]), float(coords[1])),
+                                    'target',
+                                    track.confidence
+                                )
+
+                # Canlı harita (arka planda üretilir)
+                now = time.monotonic()
+                if now - last_map_export >= self.map_interval:
+                    self.map_manager.request_export()
+                    last_map_export = now
+
                 # Bilgi overlay
-                self._draw_overlay(processed_frame, sensor_data, decision)
+                if self.adaptive.overlay:
+                    self._draw_overlay(processed_frame, sensor_data, decision)
+                self.event_capture.push(processed_frame, frame_count, sensor_data, decision)
 
-                # Görüntüyü göster
-                cv2.imshow('UAV System', processed_frame)
+                # Görüntüyü göster ve işaretlenmiş akışı kaydet
+                if self.adaptive.should_stream(frame_count):
+                    self.recorder.record('annotated', processed_frame, frame_count, copy=False)
+                    cv2.imshow('UAV System', processed_frame)
 
                 # Kayıt (opsiyonel)
-                if self.config['logging']['save_images'] and frame_count % 30 == 0:
+                if self.save_images and frame_count % 30 == 0:
                     self._save_frame(processed_frame, frame_count)
 
+                # Frame süresine göre kalite seviyesini ayarla
+                self.adaptive.update(time.perf_counter() - frame_start)
+
                 frame_count += 1
 
                 # Çıkış kontrolü
@@ -219,6 +397,8 @@ class UAVSystem:
                     self.set_tour(TourType.TUR_1, 'red')
                 elif key == ord('2'):
                     self.set_tour(TourType.TUR_2)
+                elif key == ord('3'):
+                    self.set_tour(TourType.HIBRIT, 'red')
 
         except KeyboardInterrupt:
             logger.info("Keyboard interrupt - Sistem kapatılıyor")
@@ -242,44 +422,12 @@ class UAVSystem:
         logger.info(f"ATEŞ EDİLDİ! Kanal: {servo_channel}")
 
         # Kısa bir süre sonra servo'yu eski konumuna getir
-        import time
         time.sleep(fire_duration / 1000.0)
         self.pixhawk.send_servo_command(servo_channel, 1500)
 
     def _draw_overlay(self, frame, sensor_data, decision):
-        """Görüntü üzerine bilgi ekle"""
-        h, w = frame.shape[:2]
-
-        # Arka plan
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (10, 10), (400, 150), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.5, frame, 0.5, 0, frame)
-
-        # Metin bilgileri
-        texts = []
-
-        if sensor_data['gps']:
-            gps = sensor_data['gps']
-            texts.append(f"GPS: {gps['lat']:.6f}, {gps['lon']:.6f}")
-            texts.append(f"Alt: {sensor_data['altitude']:.1f}m")
-
-        texts.append(f"Status: {decision['target_status']}")
-
-        if decision['can_fire']:
-            texts.append(">>> FIRE READY <<<")
-
-        # Metinleri çiz
-        y_offset = 30
-        for text in texts:
-            cv2.putText(frame, text, (20, y_offset),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
-            y_offset += 25
-
-        # Hedef işareti (ekran merkezi)
-        cx, cy = w // 2, h // 2
-        cv2.line(frame, (cx - 20, cy), (cx + 20, cy), (0, 255, 0), 2)
-        cv2.line(frame, (cx, cy - 20), (cx, cy + 20), (0, 255, 0), 2)
-        cv2.circle(frame, (cx, cy), 30, (0, 255, 0), 2)
+        """Görüntü üzerine bilgi ekle (önbellekli HUD katmanları)"""
+        self.hud.render(frame, sensor_data, decision)
 
     def _save_frame(self, frame, frame_num):
         """Frame'i kaydet"""
@@ -293,8 +441,15 @@ class UAVSystem:
         """Kaynakları temizle"""
         logger.info("Sistem kapatılıyor...")
 
+        self.config_manager.stop_watching()
         self.camera.release()
         self.pixhawk.close()
+        self.hybrid_detector.close()
+        self.color_filter.close()
+        self.map_manager.stop_export()
+        self.map_manager.stop_persistence()
+        self.recorder.close()
+        self.event_capture.close()
         cv2.destroyAllWindows()
 
         # Haritayı kaydet
@@ -311,6 +466,9 @@ class UAVSystem:
         # İstatistikler
         stats = self.map_manager.get_statistics()
         logger.info(f"İstatistikler: {stats}")
+        logger.info(f"Frame kalite kontrolü: {self.quality_gate.get_statistics()}")
+        logger.info(f"Video kaydı: {self.recorder.get_statistics()}")
+        logger.info(f"Adaptif işleme: {self.adaptive.get_statistics()}")
 
         logger.info("Sistem kapatıldı")
 
@@ -320,10 +478,10 @@ def main():
     parser = argparse.ArgumentParser(description='İHA Görüntü İşleme ve Kontrol Sistemi')
     parser.add_argument('--config', type=str, default='config.yaml',
                        help='Konfigürasyon dosyası yolu')
-    parser.add_argument('--tour', type=int, choices=[1, 2], default=1,
-                       help='Tur tipi (1: Renk filtresi, 2: Sensör tabanlı)')
+    parser.add_argument('--tour', type=int, choices=[1, 2, 3], default=1,
+                       help='Tur tipi (1: Renk filtresi, 2: Sensör tabanlı, 3: Hibrit)')
     parser.add_argument('--color', type=str, choices=['red', 'green', 'blue'],
-                       default='red', help='Hedef rengi (Tur 1 için)')
+                       default='red', help='Hedef rengi (Tur 1 ve hibrit mod için)')
 
     args = parser.parse_args()
 
@@ -335,8 +493,8 @@ def main():
         return
 
     # Tur tipini ayarla
-    tour_type = TourType.TUR_1 if args.tour == 1 else TourType.TUR_2
-    target_color = args.color if args.tour == 1 else None
+    tour_type = TourType(args.tour)
+    target_color = args.color if tour_type != TourType.TUR_2 else None
     system.set_tour(tour_type, target_color)
 
     # Sistemi çalıştır
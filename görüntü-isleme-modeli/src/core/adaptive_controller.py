@@ -0,0 +1,237 @@
+"""
+Adaptif İşleme Kontrol Modülü
+Frame işleme süresini kamera periyoduna göre izler; süre aşılınca kalite ayarlarını
+tanımlı sırayla düşürür, yük azalınca histerezisle geri alır
+"""
+
+import copy
+import cv2
+import numpy as np
+from typing import Dict, Any, List, Optional
+from loguru import logger
+
+from src.vision.color_filter import ColorFilter
+from src.vision.target_detector import TargetDetector
+
+
+# Seviye 0 (tam kalite) ayarları; config'deki her seviye bir öncekinin üzerine yazılır
+LEVEL_DEFAULTS = {
+    'process_scale': 1.0,  # tespitin çalıştığı çözünürlük oranı
+    'morphology_iterations': None,  # None ise config değeri
+    'yolo_input_size': None,  # None ise detection.input_size
+    'detection_interval': 1,  # tespit her N frame'de bir çalışır
+    'overlay': True,  # HUD çizimi
+    'stream_interval': 1  # ekran ve işaretlenmiş kayıt her N frame'de bir
+}
+
+
+def scale_detections(detections: List[Dict[str, Any]], factor: float) -> List[Dict[str, Any]]:
+    """
+    Küçültülmüş frame'de bulunan tespitleri işlenen frame koordinatlarına çevir
+
+    Args:
+        detections: ColorFilter, TargetDetector veya hibrit tespitler
+        factor: Koordinat çarpanı (1 / process_scale)
+
+    Returns:
+        Ölçeklenmiş tespit kopyaları
+    """
+    scaled = []
+    for detection in detections:
+        result = dict(detection)
+        result['center'] = tuple(int(round(v * factor)) for v in detection['center'])
+        result['area'] = detection['area'] * factor * factor
+        if 'bbox' in detection:
+            result['bbox'] = tuple(int(round(v * factor)) for v in detection['bbox'])
+        if 'bounding_box' in detection:
+            result['bounding_box'] = tuple(int(round(v * factor)) for v in detection['bounding_box'])
+        if 'contour' in detection:
+            result['contour'] = np.round(detection['contour'] * factor).astype(np.int32)
+        # Maske küçük çözünürlükte kalır; tam çözünürlük kopyası üretilmez
+        result.pop('mask', None)
+        scaled.append(result)
+    return scaled
+
+
+class AdaptiveController:
+    """
+    Frame süresi geri beslemeli kalite kontrolcüsü
+
+    Üstel ortalama frame süresi deadline * degrade_ratio değerini degrade_after
+    frame boyunca aşarsa bir seviye düşülür; deadline * restore_ratio altında
+    restore_after frame kalırsa bir seviye geri alınır. Geri alınan seviyede
+    hemen tekrar düşülürse bir sonraki geri alma beklemesi ikiye katlanır.
+    """
+
+    def __init__(self, config: Dict[str, Any], color_filter: ColorFilter, target_detector: TargetDetector):
+        self.color_filter = color_filter
+        self.target_detector = target_detector
+
+        self.level = 0
+        self.average: Optional[float] = None
+        self.frames = 0
+        self.changes = 0
+        self.level_frames: Dict[int, int] = {}
+
+        self._over = 0
+        self._under = 0
+        self._last_restore: Optional[int] = None
+
+        self.reload(config)
+
+    def reload(self, config: Dict[str, Any]):
+        """Kontrolcü parametrelerini güncelle, bileşenleri geçerli seviyeyle yeniden yükle"""
+        self.config = config
+        adaptive_config = config['adaptive']
+        self.enabled = adaptive_config['enabled']
+        self.deadline = adaptive_config['deadline'] or 1.0 / config['camera']['fps']
+        self.smoothing = adaptive_config['smoothing']
+        self.degrade_ratio = adaptive_config['degrade_ratio']
+        self.restore_ratio = adaptive_config['restore_ratio']
+        self.degrade_after = adaptive_config['degrade_after']
+        self.restore_after = adaptive_config['restore_after']
+        self.restore_hold = self.restore_after
+
+        # Birikimli seviye ayarları
+        self.levels = [dict(LEVEL_DEFAULTS)]
+        for overrides in adaptive_config['levels']:
+            settings = dict(self.levels[-1])
+            settings.update(overrides)
+            self.levels.append(settings)
+
+        if not self.enabled:
+            self.level = 0
+        self.level = min(self.level, len(self.levels) - 1)
+        self._apply()
+
+    def effective_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Geçerli seviyenin ayarlarını uygulanmış konfigürasyon kopyası
+
+        Args:
+            config: Temel konfigürasyon
+
+        Returns:
+            Renk filtresi ve YOLO'ya verilecek konfigürasyon
+        """
+        settings = self.settings
+        effective = copy.deepcopy(config)
+        processing = effective['image_processing']
+
+        # Kontur alan sınırları (tam çözünürlük pikseli) kameranın ölçekli çözümü ve
+        # tespit ölçeğiyle küçültülmüş frame'in piksel ölçeğine çekilir
+        capture_scale = 1.0 / config['camera']['capture']['decode_scale']
+        scale_sq = (capture_scale * settings['process_scale']) ** 2
+        processing['contour']['min_area'] *= scale_sq
+        processing['contour']['max_area'] *= scale_sq
+
+        if settings['morphology_iterations'] is not None:
+            morphology = processing['morphology']
+            morphology['iterations'] = min(morphology['iterations'], settings['morphology_iterations'])
+
+        if settings['yolo_input_size'] is not None:
+            detection = effective['detection']
+            detection['input_size'] = min(detection['input_size'], settings['yolo_input_size'])
+
+        return effective
+
+    def _apply(self):
+        self.settings = self.levels[self.level]
+        effective = self.effective_config(self.config)
+        self.color_filter.reload(effective)
+        self.target_detector.reload(effective)
+
+    @property
+    def overlay(self) -> bool:
+        """HUD çizilmeli mi"""
+        return self.settings['overlay']
+
+    def should_detect(self, frame_index: int) -> bool:
+        """Bu frame'de tespit çalıştırılmalı mı"""
+        return frame_index % self.settings['detection_interval'] == 0
+
+    def should_stream(self, frame_index: int) -> bool:
+        """Bu frame gösterilmeli ve işaretlenmiş akışa kaydedilmeli mi"""
+        return frame_index % self.settings['stream_interval'] == 0
+
+    def downscale(self, frame: np.ndarray) -> np.ndarray:
+        """Frame'i tespit çözünürlüğüne küçült"""
+        scale = self.settings['process_scale']
+        if scale == 1.0:
+            return frame
+        return cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    def upscale(self, detections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Tespitleri işlenen frame koordinatlarına çevir"""
+        scale = self.settings['process_scale']
+        if scale == 1.0 or not detections:
+            return detections
+        return scale_detections(detections, 1.0 / scale)
+
+    def update(self, elapsed: float):
+        """
+        Frame işleme süresini kaydet, gerekirse seviye değiştir
+
+        Args:
+            elapsed: Frame okuma sonrasından döngü sonuna kadar geçen süre (saniye)
+        """
+        self.frames += 1
+        self.level_frames[self.level] = self.level_frames.get(self.level, 0) + 1
+        if not self.enabled:
+            return
+
+        if self.average is None:
+            self.average = elapsed
+        else:
+            self.average += self.smoothing * (elapsed - self.average)
+
+        if self.average > self.deadline * self.degrade_ratio:
+            self._over += 1
+            self._under = 0
+        elif self.average < self.deadline * self.restore_ratio:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = 0
+            self._under = 0
+
+        if self._over >= self.degrade_after and self.level < len(self.levels) - 1:
+            # Geri alınan seviye yükü kaldıramadı; aynı salınımı tekrarlamamak için daha uzun bekle
+            if self._last_restore is not None and self.frames - self._last_restore < self.restore_hold:
+                self.restore_hold = min(self.restore_hold * 2, self.restore_after * 8)
+            self._change(self.level + 1)
+        elif self._under >= self.restore_hold and self.level > 0:
+            self._last_restore = self.frames
+            self._change(self.level - 1)
+
+    def _change(self, level: int):
+        previous, average = self.level, self.average
+        self.level = level
+        self._apply()
+
+        # Yeni seviyenin etkisi temiz bir ortalamayla ölçülür
+        self.average = None
+        self._over = 0
+        self._under = 0
+        self.changes += 1
+
+        changed = {k: v for k, v in self.settings.items() if self.levels[previous][k] != v}
+        message = (
+            f"Adaptif seviye {previous} -> {level} "
+            f"(ortalama {average * 1000:.1f} ms, hedef {self.deadline * 1000:.1f} ms): "
+            + ', '.join(f"{k}={v}" for k, v in changed.items())
+        )
+        if level > previous:
+            logger.warning(message)
+        else:
+            logger.info(message)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Seviye değişimleri ve seviye başına frame sayıları"""
+        return {
+            'level': self.level,
+            'changes': self.changes,
+            'level_frames': dict(sorted(self.level_frames.items())),
+            'average_ms': self.average * 1000 if self.average is not None else None,
+            'deadline_ms': self.deadline * 1000
+        }
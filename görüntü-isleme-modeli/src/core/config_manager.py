@@ -0,0 +1,357 @@
+"""
+Konfigürasyon Yönetim Modülü
+config.yaml dosyasını doğrular, değişiklikleri izler ve frame'ler arasında atomik olarak uygular
+"""
+
+import copy
+import threading
+import yaml
+from pathlib import Path
+from typing import Dict, Any, List, Callable, Optional
+from loguru import logger
+
+
+# Çalışırken değiştirilemeyen bölümler (yeniden başlatma gerekir)
+RESTART_REQUIRED = (
+    'camera',
+    'sensors',
+    'detection.model_path',
+    'localization.persistence',
+    'localization.tiles',
+    'logging.recording',
+    'logging.events',
+    'startup'
+)
+
+
+# adaptive.levels girdilerinde kullanılabilen ayarlar (src/core/adaptive_controller.py)
+LEVEL_KEYS = (
+    'process_scale',
+    'morphology_iterations',
+    'yolo_input_size',
+    'detection_interval',
+    'overlay',
+    'stream_interval'
+)
+
+
+class ConfigError(ValueError):
+    """Geçersiz konfigürasyon"""
+
+
+def get_path(config: Dict[str, Any], path: str) -> Any:
+    """
+    Noktalı yol ile iç içe değeri oku
+
+    Args:
+        config: Konfigürasyon sözlüğü
+        path: 'image_processing.morphology' gibi yol
+
+    Returns:
+        Değer veya yol yoksa None
+    """
+    value = config
+    for key in path.split('.'):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def set_path(config: Dict[str, Any], path: str, value: Any):
+    """
+    Noktalı yol ile iç içe değeri yaz (eksik ara bölümler oluşturulur)
+
+    Args:
+        config: Konfigürasyon sözlüğü
+        path: 'image_processing.morphology.iterations' gibi yol
+        value: Yeni değer
+    """
+    keys = path.split('.')
+    target = config
+    for key in keys[:-1]:
+        target = target.setdefault(key, {})
+    target[keys[-1]] = value
+
+
+def _require(condition: bool, message: str):
+    if not condition:
+        raise ConfigError(message)
+
+
+def validate_config(config: Dict[str, Any]):
+    """
+    Çalışma anında değiştirilebilen parametreleri doğrula
+
+    Args:
+        config: Konfigürasyon sözlüğü
+
+    Raises:
+        ConfigError: Geçersiz değer bulunursa
+    """
+    capture = config['camera']['capture']
+    _require(capture['mode'] in ('decoded', 'mjpeg'), "camera.capture.mode 'decoded' veya 'mjpeg' olmalı")
+    _require(capture['decode_scale'] in (1, 2, 4, 8), "camera.capture.decode_scale 1, 2, 4 veya 8 olmalı")
+
+    processing = config.get('image_processing')
+    _require(isinstance(processing, dict), "image_processing bölümü eksik")
+
+    for color, color_range in processing['color_filters'].items():
+        for key in ('lower_hsv', 'upper_hsv'):
+            values = color_range.get(key)
+            _require(
+                isinstance(values, list) and len(values) == 3 and all(isinstance(v, int) for v in values),
+                f"color_filters.{color}.{key} üç tam sayı olmalı"
+            )
+            _require(0 <= values[0] <= 180, f"color_filters.{color}.{key} ton değeri 0-180 olmalı")
+            _require(all(0 <= v <= 255 for v in values[1:]), f"color_filters.{color}.{key} S/V 0-255 olmalı")
+
+        # Kırmızının ton aralığı 180'den 0'a sarılabilir (lower ton > upper ton, ör. 170 -> 10)
+        lows, highs = color_range['lower_hsv'], color_range['upper_hsv']
+        _require(
+            all(lo <= hi for lo, hi in zip(lows[1:], highs[1:])) and (color == 'red' or lows[0] <= highs[0]),
+            f"color_filters.{color}: lower_hsv upper_hsv'den büyük olamaz (sadece kırmızı ton aralığı 180'den 0'a sarılabilir)"
+        )
+
+    morphology = processing['morphology']
+    _require(
+        isinstance(morphology['kernel_size'], int) and morphology['kernel_size'] > 0,
+        "morphology.kernel_size pozitif tam sayı olmalı"
+    )
+    _require(
+        isinstance(morphology['iterations'], int) and morphology['iterations'] >= 0,
+        "morphology.iterations negatif olamaz"
+    )
+
+    strip_parallel = processing['strip_parallel']
+    _require(
+        isinstance(strip_parallel['workers'], int) and strip_parallel['workers'] >= 0,
+        "strip_parallel.workers negatif olmayan tam sayı olmalı"
+    )
+    _require(strip_parallel['min_strip_rows'] > 0, "strip_parallel.min_strip_rows pozitif olmalı")
+
+    contour = processing['contour']
+    _require(0 <= contour['min_area'] <= contour['max_area'], "contour: 0 <= min_area <= max_area olmalı")
+
+    detection = config['detection']
+    for key in ('confidence_threshold', 'iou_threshold'):
+        _require(0.0 <= detection[key] <= 1.0, f"detection.{key} 0-1 arasında olmalı")
+
+    _require(
+        isinstance(detection['input_size'], int) and detection['input_size'] > 0 and detection['input_size'] % 32 == 0,
+        "detection.input_size 32'nin pozitif katı olmalı"
+    )
+
+    tracking = config['tracking']
+    _require(0.0 <= tracking['iou_threshold'] <= 1.0, "tracking.iou_threshold 0-1 arasında olmalı")
+    _require(tracking['max_distance'] > 0, "tracking.max_distance pozitif olmalı")
+    _require(tracking['min_hits'] >= 1 and tracking['max_age'] >= 0, "tracking.min_hits/max_age geçersiz")
+
+    recording = config['logging']['recording']
+    _require(recording['drop_policy'] in ('oldest', 'newest'), "recording.drop_policy 'oldest' veya 'newest' olmalı")
+    _require(
+        recording['format'] == 'mjpeg' or len(recording['format']) == 4,
+        "recording.format 'mjpeg' veya dört karakterli fourcc olmalı"
+    )
+    _require(all(name in ('raw', 'annotated') for name in recording['streams']), "recording.streams: raw/annotated")
+    _require(recording['queue_size'] > 0 and recording['fps'] > 0, "recording.queue_size/fps pozitif olmalı")
+
+    events = config['logging']['events']
+    _require(all(t in ('lock', 'fire', 'lost') for t in events['types']), "events.types: lock/fire/lost")
+    _require(events['pre_seconds'] >= 0 and events['post_seconds'] >= 0, "events.pre/post_seconds negatif olamaz")
+    _require(0 < events['scale'] <= 1.0, "events.scale 0-1 arasında olmalı")
+
+    adaptive = config['adaptive']
+    _require(adaptive['deadline'] >= 0, "adaptive.deadline negatif olamaz")
+    _require(0 < adaptive['smoothing'] <= 1.0, "adaptive.smoothing 0-1 arasında olmalı")
+    _require(
+        0 < adaptive['restore_ratio'] < adaptive['degrade_ratio'],
+        "adaptive: 0 < restore_ratio < degrade_ratio olmalı"
+    )
+    _require(adaptive['degrade_after'] >= 1 and adaptive['restore_after'] >= 1, "adaptive.degrade/restore_after en az 1")
+    for i, level in enumerate(adaptive['levels']):
+        prefix = f"adaptive.levels[{i}]"
+        _require(
+            isinstance(level, dict) and all(key in LEVEL_KEYS for key in level),
+            f"{prefix}: geçerli anahtarlar {', '.join(LEVEL_KEYS)}"
+        )
+        _require(0 < level.get('process_scale', 1.0) <= 1.0, f"{prefix}.process_scale 0-1 arasında olmalı")
+        _require(level.get('morphology_iterations', 0) >= 0, f"{prefix}.morphology_iterations negatif olamaz")
+        _require(level.get('yolo_input_size', 32) % 32 == 0, f"{prefix}.yolo_input_size 32'nin katı olmalı")
+        for key in ('detection_interval', 'stream_interval'):
+            value = level.get(key, 1)
+            _require(isinstance(value, int) and value >= 1, f"{prefix}.{key} pozitif tam sayı olmalı")
+
+    pixhawk = config['sensors']['pixhawk']
+    _require(pixhawk['heartbeat_timeout'] > 0, "sensors.pixhawk.heartbeat_timeout pozitif olmalı")
+    _require(1 <= pixhawk['source_system'] <= 255, "sensors.pixhawk.source_system 1-255 arasında olmalı")
+    _require(1 <= pixhawk['source_component'] <= 255, "sensors.pixhawk.source_component 1-255 arasında olmalı")
+    timeouts = config['startup']['timeouts']
+    _require(
+        all(name in timeouts for name in ('camera', 'pixhawk', 'detector', 'map')),
+        "startup.timeouts: camera/pixhawk/detector/map süreleri gerekli"
+    )
+    _require(all(t > 0 for t in timeouts.values()), "startup.timeouts pozitif olmalı")
+
+    decision = config['decision']
+    _require(decision['detection_stability_frames'] >= 1, "decision.detection_stability_frames en az 1 olmalı")
+    _require(decision['target_real_size'] > 0, "decision.target_real_size pozitif olmalı")
+
+
+def load_config(config_path: str) -> Dict[str, Any]:
+    """
+    Konfigürasyonu oku ve doğrula
+
+    Args:
+        config_path: YAML dosya yolu
+
+    Returns:
+        Konfigürasyon sözlüğü
+
+    Raises:
+        ConfigError: Dosya okunamaz veya geçersizse
+    """
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError) as e:
+        raise ConfigError(f"Konfigürasyon okunamadı: {e}") from e
+
+    try:
+        validate_config(config)
+    except (KeyError, TypeError) as e:
+        raise ConfigError(f"Konfigürasyon alanı eksik veya hatalı: {e}") from e
+
+    return config
+
+
+class ConfigManager:
+    """Doğrulanmış konfigürasyon, dosya izleme ve çalışma anında yeniden yükleme"""
+
+    def __init__(self, config_path: str):
+        self.config_path = Path(config_path)
+        self.config = load_config(config_path)
+
+        runtime_config = self.config['runtime']
+        self.hot_reload = runtime_config['hot_reload']
+        self.poll_interval = runtime_config['reload_poll_interval']
+
+        self._subscribers: List[tuple] = []
+        self._pending: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._mtime = self._read_mtime()
+
+    def _read_mtime(self) -> float:
+        try:
+            return self.config_path.stat().st_mtime
+        except OSError:
+            return 0.0
+
+    def subscribe(self, path: str, callback: Callable[[Dict[str, Any]], None]):
+        """
+        Yol altındaki değerler değiştiğinde çağrılacak fonksiyonu kaydet
+
+        Args:
+            path: Noktalı konfigürasyon yolu
+            callback: Yeni konfigürasyonu alan fonksiyon
+        """
+        self._subscribers.append((path, callback))
+
+    def start_watching(self):
+        """Dosya değişikliklerini arka planda izlemeye başla"""
+        if not self.hot_reload or self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._watch, name='config-watcher', daemon=True)
+        self._thread.start()
+        logger.info(f"Konfigürasyon izleniyor: {self.config_path}")
+
+    def stop_watching(self):
+        """İzlemeyi durdur"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval * 2)
+            self._thread = None
+
+    def _watch(self):
+        """Dosya değişim zamanını periyodik kontrol et"""
+        while not self._stop.wait(self.poll_interval):
+            mtime = self._read_mtime()
+            if mtime != self._mtime:
+                self._mtime = mtime
+                self.request_reload()
+
+    def request_reload(self) -> bool:
+        """
+        Dosyayı şimdi oku; geçerliyse bir sonraki frame arasında uygulanmak üzere beklet
+
+        Returns:
+            Yeni konfigürasyon kabul edildiyse True
+        """
+        try:
+            new_config = load_config(str(self.config_path))
+        except ConfigError as e:
+            logger.error(f"Yeni konfigürasyon reddedildi, eski ayarlar korunuyor: {e}")
+            return False
+
+        with self._lock:
+            self._pending = new_config
+        return True
+
+    def apply_pending(self) -> List[str]:
+        """
+        Bekleyen konfigürasyonu uygula (ana döngüde frame'ler arasında çağrılır)
+
+        Sadece değeri değişen yollara abone olan bileşenler yeniden derlenir.
+
+        Returns:
+            Değişen abone yollarının listesi
+        """
+        if self._pending is None:
+            return []
+
+        with self._lock:
+            new_config, self._pending = self._pending, None
+
+        old_config = self.config
+
+        for path in RESTART_REQUIRED:
+            if get_path(old_config, path) != get_path(new_config, path):
+                logger.warning(f"'{path}' değişikliği yeniden başlatma gerektirir - şimdilik uygulanmadı")
+                self._restore(new_config, old_config, path)
+
+        changed = []
+        callbacks = []
+        for path, callback in self._subscribers:
+            if get_path(old_config, path) != get_path(new_config, path):
+                if path not in changed:
+                    changed.append(path)
+                if callback not in callbacks:
+                    callbacks.append(callback)
+
+        self.config = new_config
+        for callback in callbacks:
+            try:
+                callback(new_config)
+            except Exception as e:
+                logger.error(f"Konfigürasyon uygulama hatası: {e}")
+
+        if changed:
+            logger.info(f"Konfigürasyon güncellendi: {', '.join(changed)}")
+        return changed
+
+    @staticmethod
+    def _restore(new_config: Dict[str, Any], old_config: Dict[str, Any], path: str):
+        """Yeniden başlatma gerektiren değeri eski haline döndür"""
+        keys = path.split('.')
+        target = new_config
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+
+        old_value = get_path(old_config, path)
+        if old_value is None:
+            target.pop(keys[-1], None)
+        else:
+            target[keys[-1]] = copy.deepcopy(old_value)
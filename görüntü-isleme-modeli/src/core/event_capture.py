@@ -0,0 +1,250 @@
+"""
+Olay Tabanlı Görüntü Kayıt Modülü
+Son saniyeleri sıkıştırılmış halka tamponda tutar; kilit, ateş ve hedef kaybı olaylarında
+olay öncesi ve sonrası frame'leri telemetri ve karar durumuyla birlikte diske yazar
+"""
+
+import json
+import time
+import queue
+import threading
+import dataclasses
+import cv2
+import numpy as np
+from enum import Enum
+from pathlib import Path
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from loguru import logger
+
+
+# Karar durumu geçişlerinden üretilen olaylar
+STATUS_EVENTS = {
+    'locked': 'lock',
+    'lost': 'lost'
+}
+
+
+def _to_json(value):
+    """Karar/telemetri değerlerini JSON'a uygun hale getir"""
+    if dataclasses.is_dataclass(value):
+        return _to_json(dataclasses.asdict(value))
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+
+class _ActiveEvent:
+    """Olay sonrası frame'leri toplanan olay"""
+
+    def __init__(self, directory: Path, until: float):
+        self.directory = directory
+        self.until = until
+        self.frames: List[Dict[str, Any]] = []
+
+
+class EventCapture:
+    """Sıkıştırılmış halka tampon ve olay tetikli asenkron frame kaydı"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        events_config = config['logging']['events']
+        self.enabled = events_config['enabled']
+        self.directory = Path(events_config['directory'])
+        self.pre_seconds = events_config['pre_seconds']
+        self.post_seconds = events_config['post_seconds']
+        self.types = set(events_config['types'])
+        self.cooldown = events_config['cooldown']
+        self.scale = events_config['scale']
+        self.jpeg_params = [cv2.IMWRITE_JPEG_QUALITY, events_config['jpeg_quality']]
+
+        self.session = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.event_count = 0
+        self.dropped = 0
+        self._last_status: Optional[str] = None
+        self._last_trigger: Dict[str, float] = {}
+
+        # Kodlayıcı iş parçacığına sırayla giden frame'ler ve olay işaretleri; sadece
+        # frame'ler queue_size ile sınırlanır, olay işaretleri hiç düşmez
+        self.queue_size = events_config['queue_size']
+        self._queue = queue.Queue()
+        # Diske yazılacak (yol, veri) çiftleri; kodlamayı disk gecikmesinden ayırır
+        self._write_queue = queue.Queue()
+
+        # Sadece kodlayıcı iş parçacığı erişir
+        self._ring: deque = deque()
+        self._active: List[_ActiveEvent] = []
+
+        self._encoder = None
+        self._writer = None
+
+    def start(self):
+        """Kodlayıcı ve disk yazıcı iş parçacıklarını başlat"""
+        if not self.enabled or self._encoder is not None:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._encoder = threading.Thread(target=self._encode_worker, name='event-encoder', daemon=True)
+        self._writer = threading.Thread(target=self._write_worker, name='event-writer', daemon=True)
+        self._encoder.start()
+        self._writer.start()
+        logger.info(
+            f"Olay kaydı başlatıldı: {', '.join(sorted(self.types))} "
+            f"(-{self.pre_seconds:.1f} s / +{self.post_seconds:.1f} s) -> {self.directory}"
+        )
+
+    def trigger(self, event_type: str, seq: int, info: Optional[Dict[str, Any]] = None):
+        """
+        Olay kaydını tetikle (ana döngüyü bekletmez)
+
+        Args:
+            event_type: 'lock', 'fire', 'lost'
+            seq: Olayın gerçekleştiği frame sıra numarası
+            info: Olaya eklenecek ek bilgi
+        """
+        if self._encoder is None or event_type not in self.types:
+            return
+
+        now = time.time()
+        if now - self._last_trigger.get(event_type, 0.0) < self.cooldown:
+            return
+        self._last_trigger[event_type] = now
+
+        self._queue.put(('event', event_type, seq, now, info or {}))
+
+    def push(self, frame: np.ndarray, seq: int, sensor_data: Dict[str, Any], decision: Dict[str, Any]):
+        """
+        Frame'i halka tampona ekle; karar durumu geçişlerinden olay üret
+
+        Frame kopyalanmaz; çağıran frame'i bu çağrıdan sonra değiştirmemelidir.
+
+        Args:
+            frame: BGR görüntü (işaretlenmiş)
+            seq: Frame sıra numarası
+            sensor_data: GPS/irtifa/attitude verileri
+            decision: Karar motoru çıktısı
+        """
+        if self._encoder is None:
+            return
+
+        status = decision['target_status']
+        if status != self._last_status and status in STATUS_EVENTS:
+            self.trigger(STATUS_EVENTS[status], seq, {'previous_status': self._last_status})
+        self._last_status = status
+
+        if self._queue.qsize() >= self.queue_size:
+            self.dropped += 1
+            if self.dropped % 100 == 1:
+                logger.warning(f"Olay kayıt kuyruğu dolu - düşen frame: {self.dropped}")
+            return
+
+        state = {'seq': seq, 't': time.time(), 'telemetry': sensor_data, 'decision': decision}
+        self._queue.put(('frame', frame, state))
+
+    def _encode_worker(self):
+        """Frame'leri JPEG'e sıkıştırıp halka tampona ekle, olayları işle"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            try:
+                if item[0] == 'event':
+                    self._start_event(*item[1:])
+                else:
+                    self._add_frame(*item[1:])
+            except Exception as e:
+                logger.error(f"Olay kaydı hatası: {e}")
+
+        for event in self._active:
+            self._finish_event(event)
+        self._active = []
+        self._write_queue.put(None)
+
+    def _add_frame(self, frame: np.ndarray, state: Dict[str, Any]):
+        if self.scale != 1.0:
+            frame = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+
+        ok, jpeg = cv2.imencode('.jpg', frame, self.jpeg_params)
+        if not ok:
+            return
+
+        # Telemetri ve karar frame ile birlikte bir kez serileştirilir
+        entry = (state['seq'], state['t'], jpeg.tobytes(), _to_json(state))
+        self._ring.append(entry)
+
+        while self._ring and entry[1] - self._ring[0][1] > self.pre_seconds:
+            self._ring.popleft()
+
+        for event in list(self._active):
+            self._write_frame(event, entry)
+            if entry[1] >= event.until:
+                self._finish_event(event)
+                self._active.remove(event)
+
+    def _start_event(self, event_type: str, seq: int, timestamp: float, info: Dict[str, Any]):
+        """Olay klasörünü oluştur, olay öncesi frame'leri yazmaya gönder"""
+        self.event_count += 1
+        directory = self.directory / f"{self.session}_{self.event_count:04d}_{event_type}"
+        directory.mkdir(parents=True, exist_ok=True)
+
+        meta = {
+            'type': event_type,
+            'seq': seq,
+            't': timestamp,
+            'time': datetime.fromtimestamp(timestamp).isoformat(),
+            'pre_seconds': self.pre_seconds,
+            'post_seconds': self.post_seconds,
+            'info': _to_json(info)
+        }
+        self._write_queue.put((directory / 'event.json', json.dumps(meta, indent=2, default=str).encode('utf-8')))
+
+        event = _ActiveEvent(directory, timestamp + self.post_seconds)
+        for entry in self._ring:
+            self._write_frame(event, entry)
+        self._active.append(event)
+
+        logger.info(f"Olay kaydı: {event_type} (frame {seq}, {len(self._ring)} önceki frame)")
+
+    def _write_frame(self, event: _ActiveEvent, entry: tuple):
+        seq, _, jpeg, state = entry
+        self._write_queue.put((event.directory / f"frame_{seq:06d}.jpg", jpeg))
+        event.frames.append(state)
+
+    def _finish_event(self, event: _ActiveEvent):
+        """Frame başına telemetri ve karar durumunu yaz"""
+        lines = ''.join(json.dumps(state, separators=(',', ':'), default=str) + '\n' for state in event.frames)
+        self._write_queue.put((event.directory / 'frames.ndjson', lines.encode('utf-8')))
+
+    def _write_worker(self):
+        """Dosyaları sırayla diske yaz"""
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                break
+            path, data = item
+            try:
+                with open(path, 'wb') as f:
+                    f.write(data)
+            except Exception as e:
+                logger.error(f"Olay dosyası yazılamadı ({path}): {e}")
+
+    def close(self):
+        """Bekleyen frame'leri ve açık olayları yazıp iş parçacıklarını durdur"""
+        if self._encoder is None:
+            return
+
+        self._queue.put(None)
+        self._encoder.join()
+        self._writer.join()
+        self._encoder = None
+        self._writer = None
+        logger.info(f"Olay kaydı kapatıldı: {self.event_count} olay, {self.dropped} düşen frame")
@@ -0,0 +1,222 @@
+"""
+Hızlı MAVLink Çözücü Modülü
+Sadece abone olunan mesajları önceden derlenmiş struct ile doğrudan telemetri dizilerine çözer
+"""
+
+import time
+import struct
+import argparse
+import numpy as np
+from typing import Dict, Any, List, Iterable, Tuple
+from loguru import logger
+from pymavlink import mavutil
+
+from src.core.mavlink_frame import FrameParser, MESSAGE_CLASSES, field_offsets
+
+
+mavlink = mavutil.mavlink
+
+
+def compile_unpacker(msg_class, fields: List[str]) -> Tuple[struct.Struct, List[str]]:
+    """
+    Sadece istenen alanları okuyan struct oluştur (aradaki baytlar atlanır)
+
+    Args:
+        msg_class: pymavlink mesaj sınıfı
+        fields: Okunacak skaler alanlar
+
+    Returns:
+        (struct.Struct, ofset sırasındaki alan adları)
+    """
+    offsets = field_offsets(msg_class)
+    selected = sorted(fields, key=lambda name: offsets[name][0])
+
+    fmt = '<'
+    position = 0
+    for name in selected:
+        offset, code, array_length = offsets[name]
+        if array_length:
+            raise ValueError(f"{msg_class.msgname}.{name} dizi alanı desteklenmiyor")
+        if offset > position:
+            fmt += f'{offset - position}x'
+        fmt += code
+        position = offset + struct.calcsize('<' + code)
+
+    return struct.Struct(fmt), selected
+
+
+class FastTelemetryDecoder:
+    """Çerçeveyi başlıktan filtreleyip abone mesajları numpy dizilerine yazan çözücü"""
+
+    def __init__(self, subscriptions: Dict[str, List[str]], passthrough: Iterable[str] = ()):
+        """
+        Args:
+            subscriptions: mesaj adı -> hızlı çözülecek alanlar
+            passthrough: pymavlink ile tam çözülecek seyrek mesajlar (ör. HEARTBEAT, COMMAND_ACK)
+        """
+        self.parser = FrameParser()
+        self.mav = mavlink.MAVLink(None)
+
+        self._unpackers = {}
+        self.fields: Dict[str, List[str]] = {}
+        self.values: Dict[str, np.ndarray] = {}
+        self.updates: Dict[str, int] = {}
+
+        for name, fields in subscriptions.items():
+            msg_id = getattr(mavlink, f'MAVLINK_MSG_ID_{name}')
+            msg_class = MESSAGE_CLASSES[msg_id]
+            unpacker, ordered = compile_unpacker(msg_class, fields)
+
+            # MAVLink 2 sondaki sıfırları kırpar; kısa yükler bu uzunluğa tamamlanır
+            self._unpackers[msg_id] = (name, unpacker, unpacker.size)
+            self.fields[name] = ordered
+            self.values[name] = np.zeros(len(ordered), dtype=np.float64)
+            self.updates[name] = 0
+
+        self.passthrough = {getattr(mavlink, f'MAVLINK_MSG_ID_{name}') for name in passthrough}
+        self.wanted = set(self._unpackers) | self.passthrough
+        self._reported_counts: Dict[int, int] = {}
+
+    def index(self, msg_name: str, field: str) -> int:
+        """Alanın values dizisindeki indeksi"""
+        return self.fields[msg_name].index(field)
+
+    def feed(self, data: bytes) -> List[Any]:
+        """
+        Baytları işle; abone mesajları values dizilerine yaz
+
+        Args:
+            data: Bağlantıdan okunan ham baytlar
+
+        Returns:
+            Tam çözülen passthrough mesajları (pymavlink nesneleri)
+        """
+        messages = []
+        unpackers = self._unpackers
+        values = self.values
+        updates = self.updates
+
+        for frame in self.parser.feed(data, self.wanted):
+            entry = unpackers.get(frame.msg_id)
+            if entry is not None:
+                name, unpacker, size = entry
+                payload = frame.payload
+                if len(payload) < size:
+                    payload = payload + bytes(size - len(payload))
+                values[name][:] = unpacker.unpack_from(payload)
+                updates[name] += 1
+                continue
+
+            try:
+                msg = self.mav.decode(bytearray(frame.raw))
+            except Exception as e:
+                logger.debug(f"MAVLink çözme hatası ({frame.name}): {e}")
+                continue
+            messages.append(msg)
+
+        return messages
+
+    def pop_counts(self) -> Dict[str, int]:
+        """
+        Son çağrıdan beri başlıktan sayılan mesaj adetleri (çözülmeyenler dahil)
+
+        Returns:
+            mesaj adı -> adet
+        """
+        result = {}
+        for msg_id, count in self.parser.counts.items():
+            delta = count - self._reported_counts.get(msg_id, 0)
+            if delta:
+                cls = MESSAGE_CLASSES.get(msg_id)
+                result[cls.msgname if cls else f'UNKNOWN_{msg_id}'] = delta
+        self._reported_counts = dict(self.parser.counts)
+        return result
+
+
+def _benchmark_stream(n_messages: int) -> bytes:
+    """Tipik otopilot trafiğine benzeyen MAVLink 2 bayt akışı üret"""
+    mav = mavlink.MAVLink(None, srcSystem=1, srcComponent=1)
+    encoders = [
+        lambda i: mav.attitude_encode(i, 0.1, -0.05, 1.2, 0.01, 0.02, 0.03),
+        lambda i: mav.global_position_int_encode(i, 399000000, 328000000, 950000, 50000, 120, -30, 5, 9000),
+        lambda i: mav.vfr_hud_encode(18.0, 17.5, 90, 55, 50.0, 0.2),
+        lambda i: mav.raw_imu_encode(i * 1000, 10, 20, 1000, 1, 2, 3, 100, 200, 300),
+        lambda i: mav.sys_status_encode(0, 0, 0, 500, 12600, 1500, 80, 0, 0, 0, 0, 0, 0),
+        lambda i: mav.gps_raw_int_encode(i * 1000, 3, 399000000, 328000000, 950000, 90, 120, 1800, 9000, 14),
+        lambda i: mav.servo_output_raw_encode(i * 1000, 0, 1500, 1500, 1500, 1500, 1100, 1500, 1500, 1500),
+        lambda i: mav.rc_channels_encode(i, 16, *([1500] * 18), 255),
+        lambda i: mav.scaled_pressure_encode(i, 1013.0, 0.1, 2500),
+        lambda i: mav.heartbeat_encode(1, 3, 81, 10, 4)
+    ]
+
+    chunks = []
+    for i in range(n_messages):
+        msg = encoders[i % len(encoders)](i)
+        chunks.append(msg.pack(mav))
+        mav.seq = (mav.seq + 1) % 256
+    return b''.join(chunks)
+
+
+def benchmark(n_messages: int = 200000, chunk_size: int = 1024) -> Dict[str, float]:
+    """
+    pymavlink genel ayrıştırıcısı ile hızlı çözücüyü aynı akışta karşılaştır (tek çekirdek)
+
+    Args:
+        n_messages: Akıştaki mesaj sayısı
+        chunk_size: Her okuma çağrısındaki bayt sayısı (seri/UDP okuma boyutu)
+
+    Returns:
+        Yol adı -> mesaj/s
+    """
+    stream = _benchmark_stream(n_messages)
+    chunks = [stream[i:i + chunk_size] for i in range(0, len(stream), chunk_size)]
+    results = {}
+
+    # Mevcut yol: her mesaj tam çözülür, sonra tipine bakılır
+    mav = mavlink.MAVLink(None)
+    mav.robust_parsing = True
+    start = time.perf_counter()
+    parsed = 0
+    for chunk in chunks:
+        msgs = mav.parse_buffer(chunk)
+        if msgs:
+            for msg in msgs:
+                if msg.get_type() in ('ATTITUDE', 'GLOBAL_POSITION_INT'):
+                    parsed += 1
+    results['pymavlink'] = n_messages / (time.perf_counter() - start)
+
+    decoder = FastTelemetryDecoder(
+        {
+            'ATTITUDE': ['time_boot_ms', 'roll', 'pitch', 'yaw'],
+            'GLOBAL_POSITION_INT': ['time_boot_ms', 'lat', 'lon', 'alt', 'relative_alt']
+        },
+        passthrough=['HEARTBEAT']
+    )
+    start = time.perf_counter()
+    for chunk in chunks:
+        decoder.feed(chunk)
+    results['fast'] = n_messages / (time.perf_counter() - start)
+
+    fast_parsed = decoder.updates['ATTITUDE'] + decoder.updates['GLOBAL_POSITION_INT']
+    if fast_parsed != parsed:
+        logger.warning(f"Çözülen mesaj sayısı farklı: pymavlink {parsed}, hızlı {fast_parsed}")
+
+    return results
+
+
+def main():
+    """Çözücü karşılaştırma ölçümü"""
+    parser = argparse.ArgumentParser(description='MAVLink çözücü karşılaştırma ölçümü')
+    parser.add_argument('--messages', type=int, default=200000, help='Akıştaki mesaj sayısı')
+    parser.add_argument('--chunk', type=int, default=1024, help='Okuma boyutu (bayt)')
+
+    args = parser.parse_args()
+    results = benchmark(args.messages, args.chunk)
+
+    for name, rate in results.items():
+        logger.info(f"{name}: {rate:,.0f} mesaj/s/çekirdek")
+    logger.info(f"Hızlanma: {results['fast'] / results['pymavlink']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+MAVLink Çerçeveleme Modülü
+Ham bayt akışından MAVLink v1/v2 çerçevelerini yükü çözmeden ayırır ve CRC doğrular
+"""
+
+import struct
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from pymavlink import mavutil
+
+try:
+    from fastcrc.crc16 import mcrf4xx as _mcrf4xx
+except ImportError:
+    _mcrf4xx = None
+
+
+mavlink = mavutil.mavlink
+
+STX_V1 = 0xFE
+STX_V2 = 0xFD
+HEADER_V1 = 6   # STX dahil
+HEADER_V2 = 10
+SIGNATURE_LEN = 13
+INCOMPAT_SIGNED = 0x01
+
+# Mesaj ID -> pymavlink mesaj sınıfı (CRC_EXTRA, alan düzeni)
+MESSAGE_CLASSES = mavlink.mavlink_map
+CRC_EXTRA: Dict[int, int] = {msg_id: cls.crc_extra for msg_id, cls in MESSAGE_CLASSES.items()}
+
+
+def crc_x25(data: bytes, crc: int = 0xFFFF) -> int:
+    """
+    MAVLink X.25 (CRC-16/MCRF4XX) sağlama toplamı
+
+    Args:
+        data: Bayt dizisi
+        crc: Başlangıç/devam değeri
+
+    Returns:
+        16 bit CRC
+    """
+    if _mcrf4xx is not None:
+        return _mcrf4xx(data, crc)
+
+    for byte in data:
+        tmp = byte ^ (crc & 0xFF)
+        tmp = (tmp ^ (tmp << 4)) & 0xFF
+        crc = ((crc >> 8) ^ (tmp << 8) ^ (tmp << 3) ^ (tmp >> 4)) & 0xFFFF
+    return crc
+
+
+def field_offsets(msg_class) -> Dict[str, Tuple[int, str, int]]:
+    """
+    Mesaj yükündeki alanların kablo düzenindeki konumlarını hesapla
+
+    Args:
+        msg_class: pymavlink mesaj sınıfı
+
+    Returns:
+        alan adı -> (bayt ofseti, struct kodu, dizi uzunluğu)
+    """
+    offsets = {}
+    offset = 0
+    for name, code, array_length in zip(
+        msg_class.ordered_fieldnames,
+        msg_class.native_format.decode().lstrip('<'),
+        msg_class.array_lengths
+    ):
+        offsets[name] = (offset, code, array_length)
+        offset += struct.calcsize('<' + code) * max(array_length, 1)
+    return offsets
+
+
+def _target_offsets() -> Dict[int, Tuple[int, int]]:
+    """Hedef sistem/bileşen alanı olan mesajlar için (sistem ofseti, bileşen ofseti)"""
+    targets = {}
+    for msg_id, cls in MESSAGE_CLASSES.items():
+        offsets = field_offsets(cls)
+        if 'target_system' in offsets:
+            component = offsets.get('target_component', (-1,))[0]
+            targets[msg_id] = (offsets['target_system'][0], component)
+    return targets
+
+
+TARGET_OFFSETS = _target_offsets()
+
+
+class Frame(NamedTuple):
+    """Yükü çözülmemiş MAVLink çerçevesi"""
+    msg_id: int
+    sys_id: int
+    comp_id: int
+    seq: int
+    payload: bytes
+    raw: bytes
+
+    @property
+    def name(self) -> str:
+        cls = MESSAGE_CLASSES.get(self.msg_id)
+        return cls.msgname if cls else f'UNKNOWN_{self.msg_id}'
+
+    def target(self) -> Tuple[int, int]:
+        """
+        Mesajın hedef sistem/bileşeni (yayın mesajlarında (0, 0))
+
+        MAVLink 2 yükün sonundaki sıfırları kırptığı için eksik baytlar 0 sayılır.
+        """
+        offsets = TARGET_OFFSETS.get(self.msg_id)
+        if offsets is None:
+            return 0, 0
+
+        system_ofs, component_ofs = offsets
+        payload = self.payload
+        system = payload[system_ofs] if system_ofs < len(payload) else 0
+        component = payload[component_ofs] if 0 <= component_ofs < len(payload) else 0
+        return system, component
+
+
+class FrameParser:
+    """Parça parça gelen baytlardan tam MAVLink çerçevelerini çıkaran ayrıştırıcı"""
+
+    def __init__(self, check_crc: bool = True):
+        self.check_crc = check_crc
+        self._buffer = bytearray()
+
+        # İstatistikler
+        self.counts: Dict[int, int] = {}
+        self.frames = 0
+        self.crc_errors = 0
+        self.unknown = 0
+        self.skipped_bytes = 0
+
+    def feed(self, data: bytes, wanted: Optional[set] = None) -> List[Frame]:
+        """
+        Yeni baytları ekle ve tamamlanan çerçeveleri döndür
+
+        Args:
+            data: Alınan baytlar
+            wanted: Verilirse sadece bu mesaj ID'leri için CRC doğrulanır ve Frame
+                nesnesi oluşturulur; diğerleri başlıktan sayılıp atlanır
+
+        Returns:
+            Çerçeve listesi
+        """
+        buf = self._buffer
+        buf += data
+        counts = self.counts
+        frames = []
+        pos = 0
+        n = len(buf)
+
+        while pos < n:
+            stx = buf[pos]
+            if stx != STX_V2 and stx != STX_V1:
+                # Sonraki başlangıç baytına atla
+                next_v2 = buf.find(STX_V2, pos + 1)
+                next_v1 = buf.find(STX_V1, pos + 1)
+                candidates = [i for i in (next_v2, next_v1) if i >= 0]
+                next_pos = min(candidates) if candidates else n
+                self.skipped_bytes += next_pos - pos
+                pos = next_pos
+                continue
+
+            if pos + 1 >= n:
+                break
+            length = buf[pos + 1]
+
+            if stx == STX_V2:
+                if pos + HEADER_V2 > n:
+                    break
+                signed = buf[pos + 2] & INCOMPAT_SIGNED
+                total = HEADER_V2 + length + 2 + (SIGNATURE_LEN if signed else 0)
+                if pos + total > n:
+                    break
+                seq = buf[pos + 4]
+                sys_id = buf[pos + 5]
+                comp_id = buf[pos + 6]
+                msg_id = buf[pos + 7] | (buf[pos + 8] << 8) | (buf[pos + 9] << 16)
+                header = HEADER_V2
+            else:
+                total = HEADER_V1 + length + 2
+                if pos + total > n:
+                    break
+                seq = buf[pos + 2]
+                sys_id = buf[pos + 3]
+                comp_id = buf[pos + 4]
+                msg_id = buf[pos + 5]
+                header = HEADER_V1
+
+            if wanted is not None and msg_id not in wanted:
+                # İstenmeyen mesaj: CRC ve kopyalama maliyeti olmadan atla
+                self.frames += 1
+                counts[msg_id] = counts.get(msg_id, 0) + 1
+                pos += total
+                continue
+
+            crc_extra = CRC_EXTRA.get(msg_id)
+            end = pos + header + length
+
+            if crc_extra is None:
+                self.unknown += 1
+            elif self.check_crc:
+                crc = crc_x25(bytes([crc_extra]), crc_x25(buf[pos + 1:end]))
+                if crc != buf[end] | (buf[end + 1] << 8):
+                    # Hatalı çerçeve: bir bayt ilerleyip yeniden senkronize ol
+                    self.crc_errors += 1
+                    self.skipped_bytes += 1
+                    pos += 1
+                    continue
+
+            self.frames += 1
+            counts[msg_id] = counts.get(msg_id, 0) + 1
+            frames.append(Frame(
+                msg_id,
+                sys_id,
+                comp_id,
+                seq,
+                bytes(buf[pos + header:end]),
+                bytes(buf[pos:pos + total])
+            ))
+            pos += total
+
+        del buf[:pos]
+        return frames
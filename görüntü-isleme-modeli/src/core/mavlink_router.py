@@ -0,0 +1,388 @@
+"""
+MAVLink Yönlendirici Modülü
+Tek otopilot bağlantısını filtre ve hız sınırlarıyla birden çok yerel uç noktaya dağıtır,
+tüketicilerin akış hızı isteklerini birleştirir
+"""
+
+import time
+import select
+import argparse
+import yaml
+from collections import deque
+from typing import Dict, Any, List, Optional, Set, Tuple
+from loguru import logger
+from pymavlink import mavutil
+
+from src.core.mavlink_frame import Frame, FrameParser
+from src.core.stream_profile import MESSAGE_STREAMS
+
+
+mavlink = mavutil.mavlink
+
+# Yönlendiricinin yakalayıp birleştirdiği akış hızı komutları
+STREAM_COMMANDS = {mavlink.MAVLINK_MSG_ID_COMMAND_LONG, mavlink.MAVLINK_MSG_ID_REQUEST_DATA_STREAM}
+
+# Otopilota iletilen SET_MESSAGE_INTERVAL için ACK bekleme süresi (s)
+PENDING_TIMEOUT = 5.0
+
+
+def _message_ids(names: List[str]) -> Set[int]:
+    """Mesaj adlarını MAVLink mesaj ID'lerine çevir"""
+    ids = set()
+    for name in names or []:
+        msg_id = getattr(mavlink, f'MAVLINK_MSG_ID_{name}', None)
+        if msg_id is None:
+            logger.warning(f"Bilinmeyen MAVLink mesajı: {name}")
+            continue
+        ids.add(msg_id)
+    return ids
+
+
+class Endpoint:
+    """Yönlendiriciye bağlı yerel tüketici (ör. görüntü işleme, uçuş bilgisayarı)"""
+
+    def __init__(self, name: str, config: Dict[str, Any]):
+        self.name = name
+        self.address = config['address']
+        self.allow = _message_ids(config.get('allow'))
+        self.deny = _message_ids(config.get('deny'))
+
+        # Mesaj ID -> minimum gönderim aralığı (s)
+        self.min_interval = {}
+        for msg_name, rate in (config.get('rate_limits') or {}).items():
+            for msg_id in _message_ids([msg_name]):
+                if rate > 0:
+                    self.min_interval[msg_id] = 1.0 / rate
+
+        # Mesaj ID -> bu tüketicinin ihtiyaç duyduğu en düşük yayın hızı (Hz)
+        self.min_rates = {}
+        for msg_name, rate in (config.get('min_rates') or {}).items():
+            for msg_id in _message_ids([msg_name]):
+                self.min_rates[msg_id] = float(rate)
+
+        # Tüketicinin son akış hızı istekleri: mesaj ID -> Hz (-1 kapat), akış ID -> Hz (0 durdur)
+        self.intervals: Dict[int, float] = {}
+        self.streams: Dict[int, float] = {}
+
+        self.connection = mavutil.mavlink_connection(self.address)
+        self.parser = FrameParser()
+
+        # Bu uç noktadan görülen (sistem, bileşen) çiftleri
+        self.systems: Set[Tuple[int, int]] = set()
+        self._next_due: Dict[Tuple[int, int, int], float] = {}
+
+        self.sent = 0
+        self.filtered = 0
+        self.rate_limited = 0
+
+    @property
+    def fd(self) -> int:
+        return self.connection.fd
+
+    def wants(self, msg_id: int) -> bool:
+        """Mesaj bu uç noktanın allow/deny filtresinden geçiyor mu"""
+        return not ((self.allow and msg_id not in self.allow) or msg_id in self.deny)
+
+    def accepts(self, frame: Frame, now: float) -> bool:
+        """Çerçeve bu uç noktanın filtre ve hız sınırından geçiyor mu"""
+        msg_id = frame.msg_id
+        if not self.wants(msg_id):
+            self.filtered += 1
+            return False
+
+        interval = self.min_interval.get(msg_id)
+        if interval is not None:
+            key = (msg_id, frame.sys_id, frame.comp_id)
+            due = self._next_due.get(key, 0.0)
+            if now < due:
+                self.rate_limited += 1
+                return False
+            # Sabit ızgarada ilerle; uzun sessizlikten sonra birikme yapma
+            self._next_due[key] = max(due + interval, now)
+
+        return True
+
+    def owns(self, system: int, component: int) -> bool:
+        """Hedef (sistem, bileşen) bu uç noktada görüldü mü"""
+        if component == 0:
+            return any(s == system for s, _ in self.systems)
+        return (system, component) in self.systems
+
+    def write(self, raw: bytes):
+        self.connection.write(raw)
+        self.sent += 1
+
+
+class MavlinkRouter:
+    """
+    Otopilot bağlantısını paylaştıran, çerçeveleri yükü çözmeden ileten yönlendirici
+
+    Tüketicilerin SET_MESSAGE_INTERVAL ve REQUEST_DATA_STREAM istekleri olduğu gibi
+    iletilmez: her uç noktanın son isteği saklanır, tüm uç noktaların istekleri ve
+    min_rates değerleriyle birleştirilen hız otopilota yönlendiricinin kimliğiyle
+    gönderilir. Böylece bir tüketici diğerinin kullandığı mesajı yavaşlatamaz veya
+    kapatamaz; kapatma ancak mesajı alan tüm uç noktalar kapatmak istediyse uygulanır.
+    Otopilotun ACK'i isteği gönderen tüketiciye iletilir.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        router_config = config['mavlink_router']
+        self.upstream_address = router_config['upstream']
+        self.baud_rate = router_config['baud_rate']
+        self.stats_interval = router_config['stats_interval']
+        self.source_system = router_config['source_system']
+        self.source_component = router_config['source_component']
+        self.arbitrate_streams = router_config['arbitrate_streams']
+
+        self.upstream = None
+        self.upstream_parser = FrameParser()
+        self.endpoints = [
+            Endpoint(name, endpoint_config)
+            for name, endpoint_config in router_config['endpoints'].items()
+        ]
+        self.running = False
+
+        # Akış isteği birleştirme
+        self.mav = mavlink.MAVLink(None)  # seyrek komutları çözmek için
+        self._pending: deque = deque()  # (uç nokta, sistem, bileşen, gönderim zamanı)
+        self.intercepted = 0
+
+    def open(self):
+        """Otopilot bağlantısını aç"""
+        self.upstream = mavutil.mavlink_connection(
+            self.upstream_address,
+            baud=self.baud_rate,
+            source_system=self.source_system,
+            source_component=self.source_component
+        )
+        logger.info(
+            f"MAVLink yönlendirici: {self.upstream_address} -> "
+            + ", ".join(f"{e.name} ({e.address})" for e in self.endpoints)
+        )
+
+    def route_upstream(self, frames: List[Frame], now: float):
+        """Otopilottan gelen çerçeveleri uç noktalara dağıt"""
+        for frame in frames:
+            target_system, target_component = frame.target()
+
+            # Yönlendiricinin gönderdiği SET_MESSAGE_INTERVAL yanıtı isteyen tüketiciye gider
+            if (frame.msg_id == mavlink.MAVLINK_MSG_ID_COMMAND_ACK and self._pending
+                    and target_system in (0, self.source_system)
+                    and target_component in (0, self.source_component)
+                    and self._relay_ack(frame, now)):
+                continue
+
+            for endpoint in self.endpoints:
+                # Hedefli mesajlar (ör. COMMAND_ACK) sadece hedefin bulunduğu uç noktaya gider
+                if target_system and endpoint.systems and not endpoint.owns(target_system, target_component):
+                    continue
+                if endpoint.accepts(frame, now):
+                    endpoint.write(frame.raw)
+
+    def route_endpoint(self, source: Endpoint, frames: List[Frame], now: Optional[float] = None):
+        """Uç noktadan gelen çerçeveleri otopilota (ve hedefse diğer uç noktalara) ilet"""
+        now = time.monotonic() if now is None else now
+        for frame in frames:
+            identity = (frame.sys_id, frame.comp_id)
+            if identity not in source.systems:
+                source.systems.add(identity)
+                for endpoint in self.endpoints:
+                    if endpoint is not source and identity in endpoint.systems:
+                        logger.warning(
+                            f"{source.name} ve {endpoint.name} aynı MAVLink kimliğini kullanıyor "
+                            f"(sistem {identity[0]}, bileşen {identity[1]}); hedefli yanıtlar ikisine de gider"
+                        )
+            target_system, target_component = frame.target()
+
+            if self.arbitrate_streams and frame.msg_id in STREAM_COMMANDS and self._arbitrate(source, frame, now):
+                continue
+
+            # Kimlikler yeniden yazılmaz; çerçeve olduğu gibi iletilir
+            self.upstream.write(frame.raw)
+
+            if target_system:
+                for endpoint in self.endpoints:
+                    if endpoint is not source and endpoint.owns(target_system, target_component):
+                        endpoint.write(frame.raw)
+
+    def _decode(self, frame: Frame):
+        try:
+            return self.mav.decode(bytearray(frame.raw))
+        except Exception as e:
+            logger.debug(f"MAVLink çözme hatası ({frame.name}): {e}")
+            return None
+
+    def _arbitrate(self, source: Endpoint, frame: Frame, now: float) -> bool:
+        """
+        Akış hızı isteğini kaydet ve birleştirilmiş hızı otopilota gönder
+
+        Returns:
+            Çerçeve yakalandıysa True (otopilota olduğu gibi iletilmez)
+        """
+        msg = self._decode(frame)
+        if msg is None:
+            return False
+
+        if frame.msg_id == mavlink.MAVLINK_MSG_ID_COMMAND_LONG:
+            if msg.command != mavlink.MAV_CMD_SET_MESSAGE_INTERVAL:
+                return False
+            msg_id, interval = int(msg.param1), msg.param2
+            if interval > 0:
+                source.intervals[msg_id] = 1e6 / interval
+            elif interval < 0:
+                source.intervals[msg_id] = -1.0
+            else:
+                # Varsayılan hıza dönüş: bu tüketicinin isteği yok sayılır
+                source.intervals.pop(msg_id, None)
+
+            self._pending.append((source, frame.sys_id, frame.comp_id, now))
+            self.upstream.mav.command_long_send(
+                msg.target_system, msg.target_component,
+                mavlink.MAV_CMD_SET_MESSAGE_INTERVAL, 0,
+                msg_id, self._merged_interval(msg_id), 0, 0, 0, 0, 0
+            )
+        else:
+            stream_id = msg.req_stream_id
+            source.streams[stream_id] = float(msg.req_message_rate) if msg.start_stop else 0.0
+            rate = self._merged_stream_rate(stream_id)
+            if rate is not None:
+                self.upstream.mav.request_data_stream_send(
+                    msg.target_system, msg.target_component, stream_id, rate, 1 if rate > 0 else 0
+                )
+
+        self.intercepted += 1
+        return True
+
+    def _merged_interval(self, msg_id: int) -> int:
+        """Tüm uç noktaların isteklerinden SET_MESSAGE_INTERVAL aralığı (µs; 0 varsayılan, -1 kapalı)"""
+        requested = [e.intervals[msg_id] for e in self.endpoints if msg_id in e.intervals]
+        standing = [e.min_rates[msg_id] for e in self.endpoints if msg_id in e.min_rates]
+        fastest = max(requested + standing, default=0.0)
+        if fastest > 0:
+            return int(1e6 / fastest)
+
+        receivers = [e for e in self.endpoints if e.wants(msg_id)]
+        if requested and all(e.intervals.get(msg_id) == -1.0 for e in receivers):
+            return -1
+        return 0
+
+    def _merged_stream_rate(self, stream_id: int) -> Optional[int]:
+        """
+        Tüm uç noktaların isteklerinden REQUEST_DATA_STREAM hızı
+
+        Returns:
+            Hz (0 durdur) veya gönderilecek istek yoksa None
+        """
+        if stream_id == mavlink.MAV_DATA_STREAM_ALL:
+            names = list(MESSAGE_STREAMS)
+        else:
+            names = [name for name, group in MESSAGE_STREAMS.items() if group == stream_id]
+        msg_ids = _message_ids(names)
+
+        requested = [e.streams[stream_id] for e in self.endpoints if stream_id in e.streams]
+        # Tüm akışlara tek hız vermek diğer grupları yavaşlatabilir; min_rates sadece grup isteklerine uygulanır
+        standing = [] if stream_id == mavlink.MAV_DATA_STREAM_ALL else [
+            e.min_rates[m] for e in self.endpoints for m in msg_ids if m in e.min_rates
+        ]
+        fastest = max(requested + standing, default=0.0)
+        if fastest > 0:
+            return max(int(round(fastest)), 1)
+
+        # Akıştaki mesajlardan birini alan her uç nokta durdurmak istemedikçe akışa dokunulmaz
+        receivers = [e for e in self.endpoints if any(e.wants(m) for m in msg_ids)]
+        if all(e.streams.get(stream_id) == 0.0 for e in receivers):
+            return 0
+        return None
+
+    def _relay_ack(self, frame: Frame, now: float) -> bool:
+        """SET_MESSAGE_INTERVAL ACK'ini bekleyen tüketiciye ilet"""
+        msg = self._decode(frame)
+        if msg is None or msg.command != mavlink.MAV_CMD_SET_MESSAGE_INTERVAL:
+            return False
+
+        while self._pending and now - self._pending[0][3] > PENDING_TIMEOUT:
+            self._pending.popleft()
+        if not self._pending:
+            return False
+
+        endpoint, _, _, _ = self._pending.popleft()
+        # Tüketici yanıtı otopilottan gelmiş gibi görür
+        relay = mavlink.MAVLink(None, srcSystem=frame.sys_id, srcComponent=frame.comp_id)
+        endpoint.write(relay.command_ack_encode(msg.command, msg.result).pack(relay))
+        return True
+
+    def run(self):
+        """Ana yönlendirme döngüsü"""
+        if self.upstream is None:
+            self.open()
+
+        self.running = True
+        by_fd = {endpoint.fd: endpoint for endpoint in self.endpoints}
+        fds = [self.upstream.fd] + list(by_fd)
+        last_stats = time.monotonic()
+
+        while self.running:
+            readable, _, _ = select.select(fds, [], [], 0.5)
+            now = time.monotonic()
+
+            for fd in readable:
+                if fd == self.upstream.fd:
+                    data = self.upstream.recv(4096)
+                    if data:
+                        self.route_upstream(self.upstream_parser.feed(data), now)
+                else:
+                    endpoint = by_fd[fd]
+                    data = endpoint.connection.recv(4096)
+                    if data:
+                        self.route_endpoint(endpoint, endpoint.parser.feed(data), now)
+
+            if now - last_stats >= self.stats_interval:
+                self.log_stats()
+                last_stats = now
+
+    def stop(self):
+        """Döngüyü durdur ve bağlantıları kapat"""
+        self.running = False
+        if self.upstream is not None:
+            self.upstream.close()
+        for endpoint in self.endpoints:
+            endpoint.connection.close()
+
+    def log_stats(self):
+        """Çerçeve ve uç nokta istatistiklerini logla"""
+        parser = self.upstream_parser
+        logger.info(
+            f"Otopilot: {parser.frames} çerçeve, {parser.crc_errors} CRC hatası, {parser.unknown} bilinmeyen, "
+            f"{self.intercepted} akış isteği birleştirildi | "
+            + " | ".join(
+                f"{e.name}: {e.sent} gönderildi, {e.filtered} filtrelendi, {e.rate_limited} hız sınırı"
+                for e in self.endpoints
+            )
+        )
+
+
+def main():
+    """Yönlendiriciyi komut satırından çalıştır"""
+    parser = argparse.ArgumentParser(description='MAVLink yönlendirici')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Konfigürasyon dosyası')
+    parser.add_argument('--upstream', type=str, default=None, help='Otopilot bağlantısı (config değerini ezer)')
+
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    if args.upstream:
+        config['mavlink_router']['upstream'] = args.upstream
+
+    router = MavlinkRouter(config)
+    try:
+        router.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        router.stop()
+
+
+if __name__ == '__main__':
+    main()
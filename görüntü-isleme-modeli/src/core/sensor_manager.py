@@ -4,14 +4,43 @@ Kamera ve Pixhawk/Hava Hızı sensörlerini yönetir
 """
 
 import cv2
+import threading
 import numpy as np
 from typing import Optional, Dict, Any
 from loguru import logger
 from pymavlink import mavutil
 
+from src.core.stream_profile import StreamProfileManager
+from src.core.mavlink_fast import FastTelemetryDecoder
+
+
+# Hızlı çözücünün doğrudan dizilere yazdığı telemetri alanları
+FAST_SUBSCRIPTIONS = {
+    'GLOBAL_POSITION_INT': ['time_boot_ms', 'lat', 'lon', 'alt', 'relative_alt'],
+    'ATTITUDE': ['time_boot_ms', 'roll', 'pitch', 'yaw', 'rollspeed', 'pitchspeed', 'yawspeed']
+}
+# pymavlink ile tam çözülen seyrek mesajlar
+FAST_PASSTHROUGH = ('HEARTBEAT', 'COMMAND_ACK', 'STATUSTEXT')
+
+# camera.capture.decode_scale -> libjpeg DCT ölçekli çözüm bayrağı
+DECODE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8
+}
+
 
 class CameraManager:
-    """Kamera yönetimi ve görüntü yakalama"""
+    """
+    Kamera yönetimi ve görüntü yakalama
+
+    İşleme çözünürlüğü camera.resolution / capture.decode_scale'dir. 'mjpeg'
+    modunda kameranın sıkıştırılmış MJPEG verisi alınır ve libjpeg DCT
+    ölçeklemesiyle doğrudan küçük ölçekte çözülür; tam çözünürlük sadece
+    istendiğinde (full_frame) çözülür. 'decoded' modunda OpenCV'nin çözdüğü
+    BGR frame gerekiyorsa küçültülür.
+    """
 
     def __init__(self, config: Dict[str, Any]):
         self.config = config
@@ -22,29 +51,77 @@ class CameraManager:
         )
         self.fps = config['camera']['fps']
 
+        capture_config = config['camera']['capture']
+        self.mode = capture_config['mode']
+        self.decode_scale = capture_config['decode_scale']
+        self.decode_flag = DECODE_FLAGS[self.decode_scale]
+
+        # libjpeg ölçekli çözümde boyutlar yukarı yuvarlanır
+        self.frame_size = tuple(-(-v // self.decode_scale) for v in self.resolution)
+
+        # Son okunan frame'in sıkıştırılmış verisi ('mjpeg') veya tam çözünürlüklü hali
+        self._encoded: Optional[np.ndarray] = None
+        self._full: Optional[np.ndarray] = None
+
     def initialize(self) -> bool:
         """Kamerayı başlat"""
         try:
-            source = self.config['camera']['source']
-            self.camera = cv2.VideoCapture(source)
-
-            if not self.camera.isOpened():
+            if not self._open(raw=self.mode == 'mjpeg'):
                 logger.error("Kamera açılamadı")
                 return False
 
-            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.resolution[0])
-            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.resolution[1])
-            self.camera.set(cv2.CAP_PROP_FPS, self.fps)
+            if self.mode == 'mjpeg' and not self._probe_raw_mjpeg():
+                # CONVERT_RGB açık akışta geri açılamaz (FFMPEG arka ucu); kamera yeniden açılır
+                logger.warning("Kamera sıkıştırılmış MJPEG vermiyor - tam çözüm ve küçültme ile devam ediliyor")
+                self.camera.release()
+                self.mode = 'decoded'
+                if not self._open(raw=False):
+                    logger.error("Kamera açılamadı")
+                    return False
 
-            logger.info(f"Kamera başlatıldı: {self.resolution[0]}x{self.resolution[1]}@{self.fps}fps")
+            logger.info(
+                f"Kamera başlatıldı: {self.resolution[0]}x{self.resolution[1]}@{self.fps}fps "
+                f"({self.mode}, işleme {self.frame_size[0]}x{self.frame_size[1]})"
+            )
             return True
 
         except Exception as e:
             logger.error(f"Kamera başlatma hatası: {e}")
             return False
 
+    def _open(self, raw: bool) -> bool:
+        """Kaynağı aç; raw ise MJPEG formatı seçilip OpenCV'nin çözmesi kapatılır"""
+        self.camera = cv2.VideoCapture(self.config['camera']['source'])
+        if not self.camera.isOpened():
+            return False
+
+        if raw:
+            # V4L2'de format çözünürlükten önce seçilmeli
+            self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+
+        self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.resolution[0])
+        self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.resolution[1])
+        self.camera.set(cv2.CAP_PROP_FPS, self.fps)
+
+        if raw:
+            self.camera.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+        return True
+
+    def _probe_raw_mjpeg(self) -> bool:
+        """Arka ucun sıkıştırılmış JPEG verisi verdiğini ilk frame ile doğrula"""
+        ret, frame = self.camera.read()
+        return bool(ret) and self._is_encoded(frame)
+
+    @staticmethod
+    def _is_encoded(frame: np.ndarray) -> bool:
+        """Ham MJPEG verisi tek satırlık bayt dizisi olarak gelir (JPEG SOI işaretiyle başlar)"""
+        if frame.dtype != np.uint8 or not (frame.ndim == 1 or frame.shape[0] == 1) or frame.size < 2:
+            return False
+        data = frame.reshape(-1)
+        return data[0] == 0xFF and data[1] == 0xD8
+
     def read_frame(self) -> Optional[np.ndarray]:
-        """Kameradan frame oku"""
+        """Kameradan işleme çözünürlüğünde frame oku"""
         if self.camera is None or not self.camera.isOpened():
             return None
 
@@ -53,8 +130,39 @@ class CameraManager:
             logger.warning("Frame okunamadı")
             return None
 
+        if self.mode == 'mjpeg':
+            self._encoded = frame.reshape(-1)
+            self._full = None
+            frame = cv2.imdecode(self._encoded, self.decode_flag)
+            if frame is None:
+                logger.warning("MJPEG frame çözülemedi")
+            elif self.decode_scale == 1:
+                self._full = frame
+            return frame
+
+        self._full = frame
+        if self.decode_scale != 1:
+            frame = cv2.resize(frame, self.frame_size, interpolation=cv2.INTER_AREA)
         return frame
 
+    def encoded_frame(self) -> Optional[bytes]:
+        """Son frame'in kameradan gelen sıkıştırılmış JPEG verisi ('mjpeg' modu dışında None)"""
+        if self.mode != 'mjpeg' or self._encoded is None:
+            return None
+        return self._encoded.tobytes()
+
+    def full_frame(self) -> Optional[np.ndarray]:
+        """
+        Son frame'in tam çözünürlüklü hali (kayıt ve ROI iyileştirme için)
+
+        'mjpeg' modunda ilk çağrıda çözülür ve aynı frame için önbellekte tutulur.
+        decode_scale 1 iken okunan frame'in kendisidir; üzerine çizim yapılmadan
+        önce alınmalıdır.
+        """
+        if self._full is None and self._encoded is not None:
+            self._full = cv2.imdecode(self._encoded, cv2.IMREAD_COLOR)
+        return self._full
+
     def release(self):
         """Kamera kaynaklarını serbest bırak"""
         if self.camera is not None:
@@ -68,24 +176,57 @@ class PixhawkManager:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.connection = None
+        self.streams = None
+        self.decoder = None
         self.gps_data = {}
         self.attitude_data = {}
         self.altitude = 0.0
 
+        # Bağlantı arka planda kurulurken istenen akış profili
+        self.stream_profile = 'idle'
+        self._lock = threading.Lock()
+
     def initialize(self) -> bool:
-        """Pixhawk bağlantısını başlat"""
+        """
+        Pixhawk bağlantısını başlat
+
+        Ana döngüyle eş zamanlı çağrılabilir: bağlantı sadece heartbeat alınıp
+        akış profili uygulandıktan sonra ana döngüye görünür olur.
+        """
+        pixhawk_config = self.config['sensors']['pixhawk']
+        connection = None
         try:
-            connection_string = self.config['sensors']['pixhawk']['connection_string']
-            self.connection = mavutil.mavlink_connection(connection_string)
+            connection = mavutil.mavlink_connection(
+                pixhawk_config['connection_string'],
+                source_system=pixhawk_config['source_system'],
+                source_component=pixhawk_config['source_component']
+            )
+
+            # İlk heartbeat'i süre sınırıyla bekle
+            if connection.wait_heartbeat(timeout=pixhawk_config['heartbeat_timeout']) is None:
+                logger.error(f"Pixhawk heartbeat'i {pixhawk_config['heartbeat_timeout']:.1f} s içinde alınamadı")
+                connection.close()
+                return False
+            logger.info(f"Pixhawk'a bağlanıldı (System {connection.target_system}, Component {connection.target_component})")
 
-            # İlk heartbeat'i bekle
-            self.connection.wait_heartbeat()
-            logger.info(f"Pixhawk'a bağlanıldı (System {self.connection.target_system}, Component {self.connection.target_component})")
+            # Abone olunmayan mesajlar çözülmeden atlanır
+            if pixhawk_config['fast_decode']:
+                self.decoder = FastTelemetryDecoder(FAST_SUBSCRIPTIONS, FAST_PASSTHROUGH)
+
+            # Sadece kullanılan mesajları gereken hızda iste
+            streams_config = pixhawk_config['streams']
+            with self._lock:
+                if streams_config['enabled']:
+                    self.streams = StreamProfileManager(connection, streams_config)
+                    self.streams.apply(self.stream_profile)
+                self.connection = connection
 
             return True
 
         except Exception as e:
             logger.error(f"Pixhawk bağlantı hatası: {e}")
+            if connection is not None and self.connection is None:
+                connection.close()
             return False
 
     def update_telemetry(self):
@@ -94,28 +235,97 @@ class PixhawkManager:
             return
 
         try:
-            # GPS verisi
-            msg = self.connection.recv_match(type='GLOBAL_POSITION_INT', blocking=False)
-            if msg:
-                self.gps_data = {
-                    'lat': msg.lat / 1e7,
-                    'lon': msg.lon / 1e7,
-                    'alt': msg.alt / 1000.0,
-                    'relative_alt': msg.relative_alt / 1000.0
-                }
-
-            # Attitude verisi
-            msg = self.connection.recv_match(type='ATTITUDE', blocking=False)
-            if msg:
-                self.attitude_data = {
-                    'roll': msg.roll,
-                    'pitch': msg.pitch,
-                    'yaw': msg.yaw
-                }
+            if self.decoder is not None:
+                self._update_fast()
+                return
+
+            # Bekleyen tüm mesajları oku; tip filtreli okuma aradaki mesajları atardı
+            while True:
+                msg = self.connection.recv_match(blocking=False)
+                if msg is None:
+                    break
+                self._handle_message(msg)
+
+            if self.streams:
+                self.streams.tick()
 
         except Exception as e:
             logger.error(f"Telemetri güncelleme hatası: {e}")
 
+    def _update_fast(self):
+        """Ham baytları hızlı çözücüden geçir, telemetri dizilerinden durumu güncelle"""
+        decoder = self.decoder
+        while True:
+            data = self.connection.recv(4096)
+            if not data:
+                break
+            for msg in decoder.feed(data):
+                self._handle_message(msg)
+
+        if decoder.updates['GLOBAL_POSITION_INT']:
+            _, lat, lon, alt, relative_alt = decoder.values['GLOBAL_POSITION_INT'].tolist()
+            self.gps_data = {
+                'lat': lat / 1e7,
+                'lon': lon / 1e7,
+                'alt': alt / 1000.0,
+                'relative_alt': relative_alt / 1000.0
+            }
+
+        if decoder.updates['ATTITUDE']:
+            _, roll, pitch, yaw, rollspeed, pitchspeed, yawspeed = decoder.values['ATTITUDE'].tolist()
+            self.attitude_data = {
+                'roll': roll,
+                'pitch': pitch,
+                'yaw': yaw,
+                'rollspeed': rollspeed,
+                'pitchspeed': pitchspeed,
+                'yawspeed': yawspeed
+            }
+
+        if self.streams:
+            for msg_type, count in decoder.pop_counts().items():
+                if msg_type not in FAST_PASSTHROUGH:
+                    # Abone mesajlarda ilk alan time_boot_ms
+                    boot_ms = int(decoder.values[msg_type][0]) if msg_type in decoder.values else None
+                    self.streams.record(msg_type, count, boot_ms)
+            self.streams.tick()
+
+    def _handle_message(self, msg):
+        """Tek MAVLink mesajını işle"""
+        msg_type = msg.get_type()
+
+        if msg_type == 'GLOBAL_POSITION_INT':
+            self.gps_data = {
+                'lat': msg.lat / 1e7,
+                'lon': msg.lon / 1e7,
+                'alt': msg.alt / 1000.0,
+                'relative_alt': msg.relative_alt / 1000.0
+            }
+        elif msg_type == 'ATTITUDE':
+            self.attitude_data = {
+                'roll': msg.roll,
+                'pitch': msg.pitch,
+                'yaw': msg.yaw,
+                'rollspeed': msg.rollspeed,
+                'pitchspeed': msg.pitchspeed,
+                'yawspeed': msg.yawspeed
+            }
+
+        if self.streams:
+            self.streams.observe(msg)
+
+    def set_stream_profile(self, profile_name: str):
+        """
+        Telemetri akış profilini değiştir
+
+        Args:
+            profile_name: config'deki profil adı ('idle', 'mission')
+        """
+        with self._lock:
+            self.stream_profile = profile_name
+            if self.streams:
+                self.streams.apply(profile_name)
+
     def get_gps_coordinates(self) -> Optional[Dict[str, float]]:
         """GPS koordinatlarını al"""
         return self.gps_data if self.gps_data else None
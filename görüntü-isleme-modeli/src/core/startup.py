@@ -0,0 +1,139 @@
+"""
+Başlatma Orkestrasyon Modülü
+Bağımsız bileşenleri paralel ve süre sınırlı başlatır, başlatma zaman çizelgesini raporlar
+"""
+
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Callable, Optional
+from loguru import logger
+
+
+@dataclass
+class StartupStep:
+    """Tek bileşenin başlatma adımı ve zaman bilgisi"""
+    name: str
+    func: Callable[[], bool]
+    timeout: float
+    required: bool
+    status: str = 'pending'  # pending, running, ok, failed
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    error: Optional[str] = None
+    late: bool = False  # ana döngü başladıktan sonra hazır oldu
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class StartupOrchestrator:
+    """
+    Bileşenleri ayrı iş parçacıklarında eş zamanlı başlatan orkestratör
+
+    Her adımın süresi orkestratörün başlangıcından itibaren sayılır. wait()
+    zorunlu adımlar ve süresi dolmamış opsiyonel adımlar için bekler; süresi
+    dolan opsiyonel adımlar arka planda açılmaya devam eder ve hazır
+    olduklarında loglanır. Adım fonksiyonları bileşeni ancak tamamen hazır
+    olduğunda ana döngüye görünür kılmalıdır.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.timeouts = config['startup']['timeouts']
+        self.steps: Dict[str, StartupStep] = {}
+        self._origin: Optional[float] = None
+        self._waited = False
+        self._lock = threading.Lock()
+
+    def add(self, name: str, func: Callable[[], bool], required: bool = False):
+        """
+        Başlatma adımı ekle
+
+        Args:
+            name: Adım adı (startup.timeouts anahtarı)
+            func: Başarıda True döndüren başlatma fonksiyonu
+            required: Başarısız olursa veya süresi dolarsa sistem başlatılmaz
+        """
+        self.steps[name] = StartupStep(name, func, self.timeouts[name], required)
+
+    def start(self):
+        """Tüm adımları eş zamanlı başlat"""
+        self._origin = time.monotonic()
+        for step in self.steps.values():
+            thread = threading.Thread(target=self._run, args=(step,), name=f'startup-{step.name}', daemon=True)
+            thread.start()
+
+    def _run(self, step: StartupStep):
+        step.status = 'running'
+        step.started = time.monotonic() - self._origin
+        try:
+            ok = bool(step.func())
+        except Exception as e:
+            ok = False
+            step.error = str(e)
+            logger.error(f"Başlatma hatası ({step.name}): {e}")
+
+        with self._lock:
+            step.finished = time.monotonic() - self._origin
+            step.status = 'ok' if ok else 'failed'
+            step.late = self._waited
+        step.done.set()
+
+        if step.late:
+            result = "hazır" if ok else "başarısız"
+            logger.info(f"Arka planda başlatılan bileşen {result}: {step.name} (+{step.finished:.2f} s)")
+
+    def wait(self) -> bool:
+        """
+        Adımları süreleri dolana kadar bekle
+
+        Returns:
+            Tüm zorunlu adımlar süresinde başarılı olduysa True
+        """
+        ok = True
+        for step in self.steps.values():
+            remaining = self._origin + step.timeout - time.monotonic()
+            finished = step.done.wait(max(remaining, 0.0))
+
+            if not finished:
+                if step.required:
+                    logger.error(f"{step.name} {step.timeout:.1f} s içinde başlatılamadı")
+                    ok = False
+                else:
+                    logger.warning(f"{step.name} {step.timeout:.1f} s içinde hazır değil - arka planda devam ediyor")
+            elif step.status == 'failed' and step.required:
+                ok = False
+
+        with self._lock:
+            self._waited = True
+
+        self.log_timeline()
+        return ok
+
+    def timeline(self) -> List[Dict[str, Any]]:
+        """Adım başına durum ve başlangıç/bitiş zamanları (saniye, orkestratör başlangıcına göre)"""
+        with self._lock:
+            return [
+                {
+                    'name': step.name,
+                    'status': step.status,
+                    'required': step.required,
+                    'started': step.started,
+                    'finished': step.finished,
+                    'duration': step.finished - step.started if step.finished is not None else None,
+                    'late': step.late,
+                    'error': step.error
+                }
+                for step in self.steps.values()
+            ]
+
+    def log_timeline(self):
+        """Başlatma zaman çizelgesini logla"""
+        elapsed = time.monotonic() - self._origin
+        lines = [f"Başlatma zaman çizelgesi ({elapsed:.2f} s):"]
+        for entry in sorted(self.timeline(), key=lambda e: e['finished'] if e['finished'] is not None else float('inf')):
+            if entry['finished'] is None:
+                span = f"{entry['started'] or 0.0:6.2f} s -> ..."
+            else:
+                span = f"{entry['started']:6.2f} s -> {entry['finished']:6.2f} s ({entry['duration']:.2f} s)"
+            kind = 'zorunlu' if entry['required'] else 'opsiyonel'
+            lines.append(f"  {entry['name']:<10} {entry['status']:<8} {span} [{kind}]")
+        logger.info('\n'.join(lines))
@@ -0,0 +1,290 @@
+"""
+MAVLink Akış Profili Modülü
+Mod başına gereken mesajların hızlarını otopilotla müzakere eder, kullanılmayan akışları kapatır
+"""
+
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+from loguru import logger
+from pymavlink import mavutil
+
+
+mavlink = mavutil.mavlink
+
+# Hızı ayarlanmayan veya kapatılmaması gereken mesajlar
+KEEP_ALWAYS = {
+    'HEARTBEAT', 'COMMAND_ACK', 'STATUSTEXT', 'PARAM_VALUE', 'TIMESYNC',
+    'MISSION_ACK', 'MISSION_REQUEST', 'MISSION_REQUEST_INT', 'MISSION_COUNT',
+    'MISSION_ITEM_INT', 'MISSION_ITEM_REACHED', 'AUTOPILOT_VERSION', 'BAD_DATA'
+}
+
+# REQUEST_DATA_STREAM yedeğinde mesajların ArduPilot akış grupları
+MESSAGE_STREAMS = {
+    'SYS_STATUS': mavlink.MAV_DATA_STREAM_EXTENDED_STATUS,
+    'GPS_RAW_INT': mavlink.MAV_DATA_STREAM_EXTENDED_STATUS,
+    'MISSION_CURRENT': mavlink.MAV_DATA_STREAM_EXTENDED_STATUS,
+    'RC_CHANNELS': mavlink.MAV_DATA_STREAM_RC_CHANNELS,
+    'SERVO_OUTPUT_RAW': mavlink.MAV_DATA_STREAM_RC_CHANNELS,
+    'GLOBAL_POSITION_INT': mavlink.MAV_DATA_STREAM_POSITION,
+    'LOCAL_POSITION_NED': mavlink.MAV_DATA_STREAM_POSITION,
+    'ATTITUDE': mavlink.MAV_DATA_STREAM_EXTRA1,
+    'VFR_HUD': mavlink.MAV_DATA_STREAM_EXTRA2,
+    'RAW_IMU': mavlink.MAV_DATA_STREAM_RAW_SENSORS,
+    'SCALED_PRESSURE': mavlink.MAV_DATA_STREAM_RAW_SENSORS
+}
+
+ALL_STREAMS = sorted(set(MESSAGE_STREAMS.values()))
+
+
+class StreamProfileManager:
+    """Mesaj yayın hızlarını profile göre ayarlayan, doğrulayan ve yeniden başlatmada tekrar uygulayan yönetici"""
+
+    def __init__(self, connection, config: Dict[str, Any]):
+        self.connection = connection
+        self.config = config
+        self.profiles: Dict[str, Dict[str, float]] = config['profiles']
+        self.ack_timeout = config['ack_timeout']
+        self.ack_retries = config['ack_retries']
+        self.fallback_after = config['fallback_after']
+        self.verify_window = config['verify_window']
+        self.min_rate_ratio = config['min_rate_ratio']
+        self.reboot_timeout = config['reboot_timeout']
+        self.suppress_unused = config['suppress_unused']
+        # Otopilot geneli kapatılabilecek mesajlar: sadece hiçbir tüketicinin kullanmadıkları
+        self.suppressible = set(config['suppressible'])
+
+        self.profile_name: Optional[str] = None
+        self.use_fallback = False
+
+        # Sırayla gönderilen SET_MESSAGE_INTERVAL istekleri (mesaj adı, aralık µs)
+        self._requests: deque = deque()
+        self._inflight = None  # (mesaj adı, aralık, gönderim zamanı, deneme sayısı)
+        # Tüm denemelere rağmen ACK gelmeyen ardışık mesaj sayısı
+        self._silent = 0
+
+        # Ölçüm penceresi
+        self._counts: Dict[str, int] = {}
+        self._window_start = time.monotonic()
+        self._verified = False
+        self._suppressed = set()
+
+        # Yeniden başlatma algılama
+        self._last_boot_ms = 0
+        self._last_heartbeat = time.monotonic()
+
+    @property
+    def settled(self) -> bool:
+        """Bekleyen veya yanıt beklenen istek yok mu"""
+        return not self._requests and self._inflight is None
+
+    @property
+    def requested_rates(self) -> Dict[str, float]:
+        """Aktif profildeki istenen hızlar (Hz)"""
+        return self.profiles.get(self.profile_name, {}) if self.profile_name else {}
+
+    def apply(self, profile_name: str):
+        """
+        Profili uygula; istekler update döngüsünde sırayla gönderilir
+
+        Args:
+            profile_name: config'deki profil adı
+        """
+        if profile_name not in self.profiles:
+            logger.error(f"Bilinmeyen akış profili: {profile_name}")
+            return
+
+        self.profile_name = profile_name
+        self._requests.clear()
+        self._inflight = None
+        self._verified = False
+
+        rates = self.profiles[profile_name]
+        if self.use_fallback:
+            self._request_data_streams(rates)
+        else:
+            for name, rate in rates.items():
+                self._requests.append((name, int(1e6 / rate) if rate > 0 else -1))
+
+            # Daha önce kapatılan ama bu profilde gereken mesajlar zaten listede; diğerleri kapalı kalır
+            for name in self._suppressed - set(rates):
+                self._requests.append((name, -1))
+
+        self._reset_window()
+        logger.info(f"Akış profili uygulanıyor: {profile_name} {rates}")
+
+    def _reset_window(self):
+        self._counts = {}
+        self._window_start = time.monotonic()
+
+    def _send_interval(self, name: str, interval_us: int, attempt: int = 1):
+        """SET_MESSAGE_INTERVAL komutunu gönder"""
+        msg_id = getattr(mavlink, f'MAVLINK_MSG_ID_{name}', None)
+        if msg_id is None:
+            logger.warning(f"Bilinmeyen MAVLink mesajı: {name}")
+            return False
+
+        self.connection.mav.command_long_send(
+            self.connection.target_system,
+            self.connection.target_component,
+            mavlink.MAV_CMD_SET_MESSAGE_INTERVAL,
+            0,
+            msg_id, interval_us, 0, 0, 0, 0, 0
+        )
+        self._inflight = (name, interval_us, time.monotonic(), attempt)
+        return True
+
+    def _request_data_streams(self, rates: Dict[str, float]):
+        """
+        SET_MESSAGE_INTERVAL desteklenmiyorsa eski REQUEST_DATA_STREAM ile akış bazında ayarla
+
+        Bir akıştaki tüm mesajlar aynı hızda gelir. Profilde olmayan akışlar sadece
+        suppress_unused açıksa ve akıştaki tüm mesajlar kapatılabilir listedeyse kapatılır;
+        diğer akışlara dokunulmaz (başka tüketiciler kullanıyor olabilir).
+        """
+        stream_rates = {}
+        if self.suppress_unused:
+            for stream in ALL_STREAMS:
+                names = [name for name, group in MESSAGE_STREAMS.items() if group == stream]
+                if all(name in self.suppressible for name in names):
+                    stream_rates[stream] = 0
+
+        for name, rate in rates.items():
+            stream = MESSAGE_STREAMS.get(name)
+            if stream is not None:
+                stream_rates[stream] = max(stream_rates.get(stream, 0), int(round(rate)))
+
+        for stream, rate in stream_rates.items():
+            self.connection.mav.request_data_stream_send(
+                self.connection.target_system,
+                self.connection.target_component,
+                stream,
+                rate,
+                1 if rate > 0 else 0
+            )
+
+    def _switch_to_fallback(self):
+        logger.warning("SET_MESSAGE_INTERVAL desteklenmiyor - REQUEST_DATA_STREAM kullanılacak")
+        self.use_fallback = True
+        self._requests.clear()
+        self._inflight = None
+        self._request_data_streams(self.requested_rates)
+        self._reset_window()
+
+    def record(self, msg_type: str, count: int = 1, boot_ms: Optional[int] = None):
+        """
+        Mesaj sayımı ve önyükleme zamanı kontrolü (hızlı çözücü mesaj nesnesi oluşturmadan çağırır)
+
+        Args:
+            msg_type: Mesaj tipi
+            count: Alınan mesaj sayısı
+            boot_ms: Mesajdaki time_boot_ms değeri
+        """
+        self._counts[msg_type] = self._counts.get(msg_type, 0) + count
+
+        if boot_ms is not None:
+            # Otopilot yeniden başladıysa önyükleme zamanı geri gider
+            if boot_ms + 1000 < self._last_boot_ms and self.profile_name:
+                logger.warning("Otopilot yeniden başlatıldı - akış profili yeniden uygulanıyor")
+                self._last_boot_ms = boot_ms
+                self.apply(self.profile_name)
+                return
+            self._last_boot_ms = boot_ms
+
+    def observe(self, msg):
+        """
+        Gelen her mesajla çağrılır: hız sayımı, ACK takibi ve yeniden başlatma algılama
+
+        Args:
+            msg: pymavlink mesajı
+        """
+        msg_type = msg.get_type()
+        self.record(msg_type, boot_ms=getattr(msg, 'time_boot_ms', None))
+
+        if msg_type == 'HEARTBEAT':
+            now = time.monotonic()
+            if now - self._last_heartbeat > self.reboot_timeout and self.profile_name:
+                logger.warning("Heartbeat kesintisi - akış profili yeniden uygulanıyor")
+                self.apply(self.profile_name)
+            self._last_heartbeat = now
+
+        elif msg_type == 'COMMAND_ACK' and msg.command == mavlink.MAV_CMD_SET_MESSAGE_INTERVAL:
+            if self._inflight is None:
+                return
+            name = self._inflight[0]
+            self._inflight = None
+            self._silent = 0
+
+            if msg.result == mavlink.MAV_RESULT_UNSUPPORTED:
+                self._switch_to_fallback()
+            elif msg.result != mavlink.MAV_RESULT_ACCEPTED:
+                logger.warning(f"{name} hız ayarı reddedildi (sonuç {msg.result})")
+
+    def tick(self):
+        """Bekleyen isteği gönder, zaman aşımlarını ve doğrulamayı işle (her döngüde çağrılır)"""
+        now = time.monotonic()
+
+        if self._inflight is not None:
+            name, interval_us, sent_at, attempt = self._inflight
+            if now - sent_at < self.ack_timeout:
+                return
+
+            # Kayıplı telsiz bağlantısında tek paket kaybı yedeğe geçirmemeli: önce tekrar dene
+            if attempt <= self.ack_retries:
+                logger.debug(f"{name} hız ayarı için ACK gelmedi - tekrar deneniyor ({attempt}/{self.ack_retries})")
+                self._send_interval(name, interval_us, attempt + 1)
+                return
+
+            self._inflight = None
+            self._silent += 1
+            logger.warning(f"{name} hız ayarı için {attempt} denemede ACK gelmedi")
+
+            # Ardışık birden çok mesajda sessizlik: komut desteklenmiyor kabul edilir
+            if self._silent >= self.fallback_after:
+                self._switch_to_fallback()
+            return
+
+        if self._requests:
+            name, interval_us = self._requests.popleft()
+            self._send_interval(name, interval_us)
+            if not self._requests:
+                self._reset_window()
+            return
+
+        if not self._verified and self.profile_name and now - self._window_start >= self.verify_window:
+            self._verify(now - self._window_start)
+
+    def measured_rates(self) -> Dict[str, float]:
+        """Mevcut ölçüm penceresindeki mesaj hızları (Hz)"""
+        elapsed = max(time.monotonic() - self._window_start, 1e-6)
+        return {name: count / elapsed for name, count in self._counts.items()}
+
+    def _verify(self, elapsed: float):
+        """Ölçülen hızları istenenlerle karşılaştır, profilde olmayan akışları kapat"""
+        self._verified = True
+        measured = {name: count / elapsed for name, count in self._counts.items()}
+
+        for name, rate in self.requested_rates.items():
+            actual = measured.get(name, 0.0)
+            if rate > 0 and actual < rate * self.min_rate_ratio:
+                logger.warning(f"{name} istenen {rate:.1f} Hz, ölçülen {actual:.1f} Hz")
+            else:
+                logger.debug(f"{name}: {actual:.1f} Hz (istenen {rate:.1f})")
+
+        if not self.suppress_unused or self.use_fallback:
+            self._reset_window()
+            return
+
+        unused = [
+            name for name in measured
+            if name in self.suppressible and name not in self.requested_rates
+            and name not in KEEP_ALWAYS and name not in self._suppressed
+        ]
+        if unused:
+            logger.info(f"Kullanılmayan akışlar kapatılıyor: {', '.join(sorted(unused))}")
+            for name in unused:
+                self._suppressed.add(name)
+                self._requests.append((name, -1))
+            self._verified = False
+
+        self._reset_window()
@@ -0,0 +1,303 @@
+"""
+Video Kayıt Modülü
+Ham ve işaretlenmiş görüntü akışlarını arka planda segmentli video dosyalarına yazar
+"""
+
+import json
+import time
+import queue
+import threading
+import cv2
+import numpy as np
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any
+from loguru import logger
+
+
+class SegmentedVideoWriter:
+    """
+    Tek akışı sınırlı kuyruk üzerinden iş parçacığında kodlayan, segment döndüren kaydedici
+
+    'mjpeg' formatında frame'ler JPEG olarak art arda yazılır ve yan indeks her
+    frame'in bayt ofsetini tutar (ffplay -f mjpeg ile oynatılır, ofsetten doğrudan
+    okunabilir). Diğer formatlar OpenCV VideoWriter fourcc kodu olarak kullanılır;
+    bu durumda indeks segment içindeki frame sırasını tutar. Kameradan gelen
+    sıkıştırılmış JPEG verisi 'mjpeg' formatında yeniden kodlanmadan yazılır,
+    diğer formatlarda iş parçacığında çözülür.
+    """
+
+    def __init__(self, name: str, session: str, recording_config: Dict[str, Any]):
+        self.name = name
+        self.session = session
+        self.directory = Path(recording_config['directory'])
+        self.fps = recording_config['fps']
+        self.format = recording_config['format']
+        self.jpeg_params = [cv2.IMWRITE_JPEG_QUALITY, recording_config['jpeg_quality']]
+        self.drop_oldest = recording_config['drop_policy'] == 'oldest'
+        self.segment_seconds = recording_config['segment_seconds']
+        self.segment_max_bytes = recording_config['segment_max_bytes']
+
+        self.segment_index = -1
+        self.file = None
+        self.writer = None
+        self.video_path = None
+        self.index_file = None
+        self.frame_size = None
+        self.segment_frames = 0
+        self.segment_bytes = 0
+        self.segment_started = 0.0
+
+        self.written = 0
+        self.dropped = 0
+
+        self._queue = queue.Queue(maxsize=recording_config['queue_size'])
+        self._thread = None
+
+    def start(self):
+        """Kodlayıcı iş parçacığını başlat"""
+        if self._thread is not None:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._worker, name=f'recorder-{self.name}', daemon=True)
+        self._thread.start()
+
+    def write(self, frame: np.ndarray, seq: int, copy: bool = True) -> bool:
+        """
+        Frame'i kayıt kuyruğuna koy (ana döngüyü hiç bekletmez)
+
+        Args:
+            frame: BGR görüntü
+            seq: Frame sıra numarası
+            copy: Frame sonradan değiştirilecekse kopyala
+
+        Returns:
+            Frame kuyruğa alındıysa True
+        """
+        if self._thread is None:
+            return False
+
+        h, w = frame.shape[:2]
+        return self._put((seq, time.time(), frame.copy() if copy else frame, (w, h)))
+
+    def write_encoded(self, data: bytes, seq: int, size: tuple) -> bool:
+        """
+        Kameradan gelen sıkıştırılmış JPEG frame'i kayıt kuyruğuna koy
+
+        Args:
+            data: JPEG verisi
+            seq: Frame sıra numarası
+            size: (genişlik, yükseklik)
+
+        Returns:
+            Frame kuyruğa alındıysa True
+        """
+        if self._thread is None:
+            return False
+
+        return self._put((seq, time.time(), data, tuple(size)))
+
+    def _put(self, item: tuple) -> bool:
+        """Kuyruğa koy; kuyruk doluysa düşürme politikasını uygula"""
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            pass
+
+        self.dropped += 1
+        if self.dropped % 100 == 1:
+            logger.warning(f"Video kayıt kuyruğu dolu ({self.name}) - düşen frame: {self.dropped}")
+
+        if not self.drop_oldest:
+            return False
+
+        # En eski bekleyen frame'i at, yenisini koy
+        try:
+            self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def _segment_stem(self) -> Path:
+        return self.directory / f"{self.session}_{self.name}_{self.segment_index:04d}"
+
+    def _open_segment(self, size: tuple):
+        """Yeni video segmenti ve yan indeks dosyası aç"""
+        self._close_segment()
+        self.segment_index += 1
+        stem = self._segment_stem()
+
+        self.frame_size = size
+
+        if self.format == 'mjpeg':
+            self.file = open(stem.with_suffix('.mjpeg'), 'wb')
+        else:
+            fourcc = cv2.VideoWriter_fourcc(*self.format)
+            self.video_path = stem.with_suffix('.avi')
+            self.writer = cv2.VideoWriter(str(self.video_path), fourcc, self.fps, self.frame_size)
+            if not self.writer.isOpened():
+                logger.error(f"Video yazıcı açılamadı ({self.name}, {self.format})")
+                self.writer = None
+
+        self.index_file = open(stem.with_suffix('.idx.ndjson'), 'w', encoding='utf-8')
+        self.segment_frames = 0
+        self.segment_bytes = 0
+        self.segment_started = time.monotonic()
+        logger.debug(f"Video segmenti açıldı: {stem}")
+
+    def _close_segment(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+        if self.writer:
+            self.writer.release()
+            self.writer = None
+        if self.index_file:
+            self.index_file.close()
+            self.index_file = None
+
+    def _needs_rotation(self, size: tuple) -> bool:
+        if self.index_file is None:
+            return True
+        return (
+            size != self.frame_size
+            or time.monotonic() - self.segment_started >= self.segment_seconds
+            or self.segment_bytes >= self.segment_max_bytes
+        )
+
+    def _encode(self, seq: int, timestamp: float, frame, size: tuple):
+        """Frame'i (BGR veya JPEG verisi) geçerli segmente yaz ve indeks satırı ekle"""
+        encoded = isinstance(frame, bytes)
+        if encoded and self.format != 'mjpeg':
+            frame = cv2.imdecode(np.frombuffer(frame, np.uint8), cv2.IMREAD_COLOR)
+            if frame is None:
+                logger.warning(f"JPEG çözme hatası ({self.name})")
+                return
+            encoded = False
+            size = (frame.shape[1], frame.shape[0])
+
+        if self._needs_rotation(size):
+            self._open_segment(size)
+
+        entry = {'seq': seq, 't': round(timestamp, 4), 'frame': self.segment_frames}
+
+        if self.file:
+            if encoded:
+                jpeg = frame
+            else:
+                ok, jpeg = cv2.imencode('.jpg', frame, self.jpeg_params)
+                if not ok:
+                    logger.warning(f"JPEG kodlama hatası ({self.name})")
+                    return
+                jpeg = jpeg.tobytes()
+            entry['offset'] = self.segment_bytes
+            entry['size'] = len(jpeg)
+            self.file.write(jpeg)
+            self.segment_bytes += len(jpeg)
+        elif self.writer:
+            self.writer.write(frame)
+            # VideoWriter yazılan boyutu bildirmez; dosya boyutu saniyede bir okunur
+            if self.segment_frames % max(int(self.fps), 1) == 0:
+                self.segment_bytes = self.video_path.stat().st_size
+        else:
+            return
+
+        self.index_file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self.segment_frames += 1
+        self.written += 1
+
+    def _worker(self):
+        """Kuyruktaki frame'leri kodla"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            try:
+                self._encode(*item)
+            except Exception as e:
+                logger.error(f"Video kayıt hatası ({self.name}): {e}")
+
+        self._close_segment()
+
+    def close(self):
+        """Kuyruktaki frame'leri yazıp segmenti kapat"""
+        if self._thread is None:
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        logger.info(f"Video kaydı kapatıldı ({self.name}): {self.written} frame, {self.dropped} düşen")
+
+
+class VideoRecorder:
+    """Ham ('raw') ve işaretlenmiş ('annotated') akışlar için segmentli video kaydı"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        recording_config = config['logging']['recording']
+        self.enabled = recording_config['enabled']
+
+        session = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.writers: Dict[str, SegmentedVideoWriter] = {}
+        if self.enabled:
+            for name in recording_config['streams']:
+                self.writers[name] = SegmentedVideoWriter(name, session, recording_config)
+
+    def start(self):
+        """Etkin akışların kodlayıcılarını başlat"""
+        for writer in self.writers.values():
+            writer.start()
+        if self.writers:
+            directory = self.config['logging']['recording']['directory']
+            logger.info(f"Video kaydı başlatıldı: {', '.join(self.writers)} -> {directory}")
+
+    def record(self, stream: str, frame: np.ndarray, seq: int, copy: bool = True) -> bool:
+        """
+        Frame'i ilgili akışa kaydet (akış kapalıysa hiçbir şey yapmaz)
+
+        Args:
+            stream: 'raw' veya 'annotated'
+            frame: BGR görüntü
+            seq: Frame sıra numarası
+            copy: Frame sonradan değiştirilecekse kopyala
+
+        Returns:
+            Frame kuyruğa alındıysa True
+        """
+        writer = self.writers.get(stream)
+        return writer.write(frame, seq, copy) if writer else False
+
+    def record_encoded(self, stream: str, data: bytes, seq: int, size: tuple) -> bool:
+        """
+        Sıkıştırılmış JPEG frame'i ilgili akışa kaydet (akış kapalıysa hiçbir şey yapmaz)
+
+        Args:
+            stream: 'raw' veya 'annotated'
+            data: JPEG verisi
+            seq: Frame sıra numarası
+            size: (genişlik, yükseklik)
+
+        Returns:
+            Frame kuyruğa alındıysa True
+        """
+        writer = self.writers.get(stream)
+        return writer.write_encoded(data, seq, size) if writer else False
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Akış başına yazılan/düşen frame sayıları"""
+        return {
+            name: {'written': w.written, 'dropped': w.dropped, 'segments': w.segment_index + 1}
+            for name, w in self.writers.items()
+        }
+
+    def close(self):
+        """Tüm akışları kapat"""
+        for writer in self.writers.values():
+            writer.close()
@@ -4,16 +4,20 @@ Sensör verileri ve görüntü işleme sonuçlarını birleştirerek karar verir
 """
 
 import numpy as np
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from loguru import logger
 from dataclasses import dataclass
 from enum import Enum
 
+from src.vision.target_tracker import Track
+from src.localization.camera_model import CameraModel
+
 
 class TourType(Enum):
     """Tur tipi"""
     TUR_1 = 1  # Renk filtresi tabanlı
     TUR_2 = 2  # Sensör tabanlı
+    HIBRIT = 3  # Renk filtresi + YOLO paralel
 
 
 class TargetStatus(Enum):
@@ -33,6 +37,7 @@ class TargetInfo:
     distance: Optional[float] = None
     angle: Optional[float] = None
     status: TargetStatus = TargetStatus.DETECTED
+    track_id: Optional[int] = None
 
 
 class BallisticCalculator:
@@ -94,11 +99,9 @@ class BallisticCalculator:
 class DecisionEngine:
     """Ana karar motoru"""
 
-    def __init__(self, config: Dict[str, Any]):
-        self.config = config
-        self.ballistics = BallisticCalculator(config)
-        self.stability_frames = config['decision']['detection_stability_frames']
-        self.lock_timeout = config['decision']['target_lock_timeout']
+    def __init__(self, config: Dict[str, Any], camera_model: Optional[CameraModel] = None):
+        self.focal_length = camera_model.focal_length if camera_model else 1000
+        self.reload(config)
 
         # Durum takibi
         self.current_tour = None
@@ -106,12 +109,62 @@ class DecisionEngine:
         self.detection_counter = 0
         self.last_detection_frame = 0
         self.locked_target = None
+        self.candidate_track_id = None
+        self.locked_track_id = None
+
+    def reload(self, config: Dict[str, Any]):
+        """Karar ve balistik parametrelerini güncelle (takip durumu korunur)"""
+        self.config = config
+        self.ballistics = BallisticCalculator(config)
+        self.stability_frames = config['decision']['detection_stability_frames']
+        self.lock_timeout = config['decision']['target_lock_timeout']
+
+        # Kamera parametreleri (kalibrasyondan)
+        self.camera_params = {
+            'focal_length': self.focal_length,
+            'target_real_size': config['decision']['target_real_size']
+        }
 
     def set_tour_type(self, tour_type: TourType):
         """Tur tipini ayarla"""
         self.current_tour = tour_type
+        self.candidate_track_id = None
+        self.locked_track_id = None
         logger.info(f"Tur tipi ayarlandı: {tour_type.name}")
 
+    def select_track(self, tracks: List[Track]) -> Optional[Track]:
+        """
+        Karar için takip edilecek izi seç
+
+        Kilitli iz yaşadığı sürece başka bir ize geçilmez; kilitli iz bu
+        frame'de görülmediyse None döner ve kilit korunur.
+
+        Args:
+            tracks: TargetTracker'dan gelen onaylı izler
+
+        Returns:
+            Seçilen iz veya None
+        """
+        if self.locked_track_id is not None:
+            for track in tracks:
+                if track.track_id == self.locked_track_id:
+                    return track if track.time_since_update == 0 else None
+
+            # Kilitli iz öldü
+            logger.warning(f"Kilitli iz kayboldu: #{self.locked_track_id}")
+            self.locked_track_id = None
+
+        visible = [t for t in tracks if t.time_since_update == 0]
+        if not visible:
+            return None
+
+        # Mevcut adayı koru, yoksa en oturmuş izi seç
+        for track in visible:
+            if track.track_id == self.candidate_track_id:
+                return track
+
+        return max(visible, key=lambda t: (t.hits, t.confidence, t.area))
+
     def update_target_tracking(self, target: Optional[TargetInfo]) -> TargetStatus:
         """
         Hedef takibini güncelle
@@ -128,18 +181,27 @@ class DecisionEngine:
 
             if self.detection_counter == 0:
                 self.target_status = TargetStatus.LOST
+                self.candidate_track_id = None
+                self.locked_track_id = None
                 logger.warning("Hedef kaybedildi")
 
             return self.target_status
 
+        # Farklı bir ize geçildiyse kararlılık sayacı baştan başlar
+        if target.track_id is not None and target.track_id != self.candidate_track_id:
+            self.candidate_track_id = target.track_id
+            self.detection_counter = 0
+
         # Hedef tespit edildi
         self.detection_counter = min(self.stability_frames, self.detection_counter + 1)
 
         if self.detection_counter >= self.stability_frames:
             # Hedef kararlı - kilitle
+            if self.target_status != TargetStatus.LOCKED:
+                logger.info(f"Hedef kilitlendi (iz #{target.track_id})")
             self.target_status = TargetStatus.LOCKED
             self.locked_target = target
-            logger.info("Hedef kilitlendi")
+            self.locked_track_id = target.track_id
         else:
             self.target_status = TargetStatus.DETECTED
 
@@ -209,17 +271,28 @@ class DecisionEngine:
             Hesaplanan mesafe (m)
         """
         # Basitleştirilmiş mesafe tahmini
-        # Gerçek uygulamada kamera kalibrasyonu ve hedef boyutu gerekir
-
-        # Örnek hesaplama (kamera FOV ve hedef boyutu varsayımları ile)
-        focal_length = camera_params.get('focal_length', 1000)  # piksel cinsinden
-        target_real_size = 0.5  # metre (hedefin gerçek boyutu)
+        focal_length = camera_params['focal_length']  # piksel cinsinden
+        target_real_size = camera_params['target_real_size']  # metre
 
         # Basit benzerlik oranı
         distance = (focal_length * target_real_size * altitude) / np.sqrt(target_pixel_area)
 
         return distance
 
+    def hold_decision(self) -> Dict[str, Any]:
+        """
+        Durumu değiştirmeden mevcut kararı döndür (kalite kontrolünde atlanan frame'ler için)
+
+        Returns:
+            Karar sonucu (ateş izni yok)
+        """
+        return {
+            'target_status': self.target_status.value,
+            'can_fire': False,
+            'fire_solution': None,
+            'target_info': None
+        }
+
     def process_decision(
         self,
         vision_result: Optional[Dict[str, Any]],
@@ -250,17 +323,17 @@ class DecisionEngine:
         target = TargetInfo(
             center=vision_result['center'],
             area=vision_result['area'],
-            confidence=vision_result.get('confidence', 1.0)
+            confidence=vision_result.get('confidence', 1.0),
+            track_id=vision_result.get('track_id')
         )
 
         # Mesafe hesapla
         altitude = sensor_data.get('altitude', 0.0)
         if altitude > 0:
-            camera_params = {'focal_length': 1000}  # Örnek değer
             target.distance = self.calculate_target_distance(
                 target.area,
                 altitude,
-                camera_params
+                self.camera_params
             )
 
         # Hedef takibini güncelle
@@ -0,0 +1,3 @@
+"""
+Çevrimdışı değerlendirme modülleri
+"""
@@ -0,0 +1,485 @@
+"""
+Toplu Değerlendirme Modülü
+Kayıtlı video ve görüntü dizilerini süreç havuzunda işleyip frame başına tespitleri,
+işleme hızını ve parametre taraması sonuçlarını CSV/Parquet olarak yazar
+"""
+
+import os
+import csv
+import copy
+import json
+import time
+import argparse
+import itertools
+import yaml
+import cv2
+import numpy as np
+from pathlib import Path
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple, Iterator
+from loguru import logger
+
+from src.core.config_manager import ConfigError, load_config, validate_config, set_path
+from src.vision.color_filter import ColorFilter
+from src.vision.target_tracker import detection_to_xyxy
+
+
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mkv', '.mov', '.mjpeg', '.mjpg'}
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp'}
+
+DETECTION_COLUMNS = [
+    'source', 'frame', 'variant', 'detector', 'index',
+    'cx', 'cy', 'x1', 'y1', 'x2', 'y2', 'area', 'confidence', 'class_name'
+]
+SUMMARY_COLUMNS = [
+    'variant', 'params', 'frames', 'frames_with_detection', 'detection_rate',
+    'detections_per_frame', 'mean_area', 'mean_confidence', 'center_jitter_px', 'ms_per_frame'
+]
+
+
+@dataclass
+class WorkItem:
+    """Tek işçiye verilen parça: videonun frame aralığı veya görüntü dizisinin bir dilimi"""
+    source: str
+    kind: str  # 'video' veya 'images'
+    start: int
+    end: Optional[int]  # None: kaynağın sonuna kadar
+    files: List[str] = field(default_factory=list)
+
+
+@dataclass
+class VariantStats:
+    """Varyant başına birleştirilebilir toplamlar"""
+    frames: int = 0
+    frames_with_detection: int = 0
+    detections: int = 0
+    area_sum: float = 0.0
+    confidence_sum: float = 0.0
+    confidence_count: int = 0
+    jitter_sum: float = 0.0
+    jitter_count: int = 0
+    seconds: float = 0.0
+
+    def merge(self, other: 'VariantStats'):
+        for name in self.__dataclass_fields__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def summary(self) -> Dict[str, Any]:
+        frames = max(self.frames, 1)
+        return {
+            'frames': self.frames,
+            'frames_with_detection': self.frames_with_detection,
+            'detection_rate': self.frames_with_detection / frames,
+            'detections_per_frame': self.detections / frames,
+            'mean_area': self.area_sum / self.detections if self.detections else None,
+            'mean_confidence': self.confidence_sum / self.confidence_count if self.confidence_count else None,
+            'center_jitter_px': self.jitter_sum / self.jitter_count if self.jitter_count else None,
+            'ms_per_frame': self.seconds / frames * 1000
+        }
+
+
+def discover_sources(input_dir: str) -> List[Tuple[str, str, List[str]]]:
+    """
+    Klasördeki video dosyalarını ve görüntü dizisi klasörlerini bul
+
+    Args:
+        input_dir: Kök klasör (alt klasörler dahil taranır)
+
+    Returns:
+        (yol, 'video'/'images', sıralı görüntü dosyaları) listesi
+    """
+    sources = []
+    for root, dirs, files in os.walk(input_dir):
+        dirs.sort()
+        images = sorted(f for f in files if Path(f).suffix.lower() in IMAGE_EXTENSIONS)
+        if images:
+            sources.append((root, 'images', [os.path.join(root, f) for f in images]))
+        for name in sorted(files):
+            if Path(name).suffix.lower() in VIDEO_EXTENSIONS:
+                sources.append((os.path.join(root, name), 'video', []))
+    return sources
+
+
+def make_work_items(sources: List[Tuple[str, str, List[str]]], chunk_frames: int) -> List[WorkItem]:
+    """
+    Kaynakları çekirdeklere dağıtılabilecek frame aralıklarına böl
+
+    Uzun videolar tek çekirdeğe kalmasın diye frame sayısı biliniyorsa parçalanır.
+    """
+    items = []
+    for path, kind, files in sources:
+        if kind == 'images':
+            for start in range(0, len(files), chunk_frames):
+                chunk = files[start:start + chunk_frames]
+                items.append(WorkItem(path, kind, start, start + len(chunk), chunk))
+            continue
+
+        capture = cv2.VideoCapture(path)
+        n_frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT)) if capture.isOpened() else 0
+        capture.release()
+
+        if n_frames <= 0:
+            # Frame sayısı bilinmeyen akışlar (ör. ham MJPEG) tek parça işlenir
+            items.append(WorkItem(path, kind, 0, None))
+            continue
+
+        for start in range(0, n_frames, chunk_frames):
+            items.append(WorkItem(path, kind, start, min(start + chunk_frames, n_frames)))
+
+    # Büyük parçalar önce: havuzun sonunda tek uzun iş kalmasın
+    items.sort(key=lambda item: -((item.end or 10 ** 9) - item.start))
+    return items
+
+
+def build_variants(config: Dict[str, Any], sweep: Dict[str, List[Any]]) -> List[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+    """
+    Tarama tanımındaki değerlerin kartezyen çarpımından konfigürasyon varyantları üret
+
+    Args:
+        config: Temel konfigürasyon
+        sweep: Noktalı yol -> denenecek değerler listesi
+
+    Returns:
+        (varyant kimliği, değiştirilen parametreler, konfigürasyon) listesi
+    """
+    if not sweep:
+        return [('v000', {}, config)]
+
+    paths = list(sweep)
+    variants = []
+    for values in itertools.product(*(sweep[path] for path in paths)):
+        params = dict(zip(paths, values))
+        variant_config = copy.deepcopy(config)
+        for path, value in params.items():
+            set_path(variant_config, path, value)
+
+        try:
+            validate_config(variant_config)
+        except (ConfigError, KeyError, TypeError) as e:
+            logger.warning(f"Geçersiz varyant atlandı {params}: {e}")
+            continue
+
+        variants.append((f'v{len(variants):03d}', params, variant_config))
+
+    return variants
+
+
+# İşçi süreç durumu (_init_worker ile bir kez kurulur)
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(variants, mode: str, color: str, frame_step: int):
+    """İşçi süreçte filtreleri ve modelleri bir kez oluştur"""
+    # Paralellik süreç düzeyinde; OpenCV iç iş parçacıkları çekirdekleri paylaşmasın
+    cv2.setNumThreads(1)
+
+    detectors = []
+    models = {}
+    for variant_id, _, config in variants:
+        config = copy.deepcopy(config)
+        config['image_processing']['strip_parallel']['enabled'] = False
+
+        color_filter = ColorFilter(config) if mode in ('color', 'hybrid') else None
+        detector = None
+        if mode in ('yolo', 'hybrid'):
+            from src.vision.target_detector import TargetDetector
+            detector = TargetDetector(config)
+            # Aynı model yolu varyantlar arasında tek kez yüklenir
+            if detector.model_path not in models:
+                models[detector.model_path] = detector.model if detector.initialize() else None
+            detector.model = models[detector.model_path]
+
+        detectors.append((variant_id, config, color_filter, detector))
+
+    _worker.update(detectors=detectors, mode=mode, color=color, frame_step=frame_step)
+
+
+def _read_frames(item: WorkItem, frame_step: int) -> Iterator[Tuple[int, np.ndarray]]:
+    """Parçadaki frame'leri (indeks, frame) olarak oku"""
+    if item.kind == 'images':
+        for offset in range(0, len(item.files), frame_step):
+            frame = cv2.imread(item.files[offset], cv2.IMREAD_COLOR)
+            if frame is not None:
+                yield item.start + offset, frame
+        return
+
+    capture = cv2.VideoCapture(item.source)
+    if not capture.isOpened():
+        logger.error(f"Video açılamadı: {item.source}")
+        return
+
+    if item.start:
+        capture.set(cv2.CAP_PROP_POS_FRAMES, item.start)
+
+    index = item.start
+    try:
+        while item.end is None or index < item.end:
+            if (index - item.start) % frame_step:
+                # Atlanan frame'ler renk dönüşümü yapılmadan geçilir
+                if not capture.grab():
+                    break
+            else:
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                yield index, frame
+            index += 1
+    finally:
+        capture.release()
+
+
+def _detection_row(item: WorkItem, index: int, variant_id: str, detector: str, n: int, det: Dict[str, Any]) -> list:
+    x1, y1, x2, y2 = detection_to_xyxy(det)
+    cx, cy = det['center']
+    return [
+        item.source, index, variant_id, detector, n,
+        cx, cy, x1, y1, x2, y2, float(det['area']), det.get('confidence'), det.get('class_name', det.get('color'))
+    ]
+
+
+def _process(item: WorkItem) -> Tuple[List[list], Dict[str, VariantStats], int, float]:
+    """
+    Parçayı tüm varyantlarla işle; her frame bir kez çözülür
+
+    Returns:
+        (tespit satırları, varyant istatistikleri, işlenen frame sayısı, süre)
+    """
+    mode, color = _worker['mode'], _worker['color']
+    detectors = _worker['detectors']
+
+    if mode == 'hybrid':
+        from src.vision.hybrid_detector import fuse_detections
+
+    rows = []
+    stats = {variant_id: VariantStats() for variant_id, *_ in detectors}
+    previous_center: Dict[str, Tuple[int, int]] = {}
+    n_frames = 0
+    start = time.perf_counter()
+
+    for index, frame in _read_frames(item, _worker['frame_step']):
+        n_frames += 1
+        # HSV dönüşümü tüm renk filtresi varyantlarında ortak
+        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV) if mode in ('color', 'hybrid') else None
+
+        for variant_id, config, color_filter, detector in detectors:
+            t0 = time.perf_counter()
+
+            color_dets = []
+            if color_filter is not None:
+                mask = color_filter.apply_morphology(color_filter.mask_from_hsv(hsv, color))
+                color_dets = color_filter.detections_from_mask(mask, color)
+
+            yolo_dets = detector.detect(frame) if detector is not None and detector.model is not None else []
+
+            if mode == 'color':
+                detections = color_dets
+            elif mode == 'yolo':
+                detections = yolo_dets
+            else:
+                hybrid = config['image_processing']['hybrid']
+                detections = fuse_detections(
+                    color_dets,
+                    [d for d in yolo_dets if d['class_name'] == 'target'],
+                    hybrid['iou_threshold'],
+                    hybrid['color_confidence'],
+                    hybrid['min_confidence']
+                )
+
+            s = stats[variant_id]
+            s.seconds += time.perf_counter() - t0
+            s.frames += 1
+            s.detections += len(detections)
+
+            if detections:
+                s.frames_with_detection += 1
+                center = detections[0]['center']
+                if variant_id in previous_center:
+                    s.jitter_sum += float(np.hypot(
+                        center[0] - previous_center[variant_id][0],
+                        center[1] - previous_center[variant_id][1]
+                    ))
+                    s.jitter_count += 1
+                previous_center[variant_id] = center
+            else:
+                previous_center.pop(variant_id, None)
+
+            for n, det in enumerate(detections):
+                s.area_sum += float(det['area'])
+                if det.get('confidence') is not None:
+                    s.confidence_sum += det['confidence']
+                    s.confidence_count += 1
+                rows.append(_detection_row(item, index, variant_id, mode, n, det))
+
+    return rows, stats, n_frames, time.perf_counter() - start
+
+
+class TableWriter:
+    """Satırları CSV dosyasına veya Parquet parça dosyalarına akıtan yazıcı"""
+
+    def __init__(self, path: Path, columns: List[str], fmt: str):
+        self.columns = columns
+        self.fmt = fmt
+        self.parts = 0
+
+        if fmt == 'parquet':
+            try:
+                import pyarrow
+                import pyarrow.parquet
+                self._pa = pyarrow
+                self._pq = pyarrow.parquet
+            except ImportError:
+                logger.warning("pyarrow kurulu değil - CSV yazılacak")
+                self.fmt = 'csv'
+
+        if self.fmt == 'parquet':
+            self.path = path
+            self.path.mkdir(parents=True, exist_ok=True)
+        else:
+            self.path = path.with_suffix('.csv')
+            self._file = open(self.path, 'w', newline='', encoding='utf-8')
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(columns)
+
+    def write(self, rows: List[list]):
+        if not rows:
+            return
+        if self.fmt == 'parquet':
+            table = self._pa.table({name: [row[i] for row in rows] for i, name in enumerate(self.columns)})
+            self._pq.write_table(table, self.path / f'part-{self.parts:05d}.parquet')
+            self.parts += 1
+        else:
+            self._csv.writerows(rows)
+
+    def close(self):
+        if self.fmt != 'parquet':
+            self._file.close()
+
+
+def run_batch(
+    config: Dict[str, Any],
+    input_dir: str,
+    output_dir: str,
+    mode: str,
+    color: str,
+    sweep: Dict[str, List[Any]],
+    workers: int,
+    chunk_frames: int,
+    frame_step: int,
+    fmt: str
+) -> List[Dict[str, Any]]:
+    """
+    Toplu değerlendirmeyi çalıştır
+
+    Returns:
+        Varyant başına özet satırları
+    """
+    variants = build_variants(config, sweep)
+    if not variants:
+        logger.error("Değerlendirilecek geçerli varyant yok")
+        return []
+
+    sources = discover_sources(input_dir)
+    if not sources:
+        logger.error(f"Video veya görüntü bulunamadı: {input_dir}")
+        return []
+
+    items = make_work_items(sources, chunk_frames)
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+
+    with open(output / 'variants.json', 'w', encoding='utf-8') as f:
+        json.dump({variant_id: params for variant_id, params, _ in variants}, f, indent=2)
+
+    logger.info(
+        f"{len(sources)} kaynak, {len(items)} parça, {len(variants)} varyant, {workers} süreç ({mode}, {color})"
+    )
+
+    writer = TableWriter(output / 'detections', DETECTION_COLUMNS, fmt)
+    totals = {variant_id: VariantStats() for variant_id, *_ in variants}
+    total_frames = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(variants, mode, color, frame_step)
+    ) as pool:
+        futures = {pool.submit(_process, item): item for item in items}
+        for done, future in enumerate(as_completed(futures), 1):
+            item = futures[future]
+            try:
+                rows, stats, n_frames, _ = future.result()
+            except Exception as e:
+                logger.error(f"Parça işlenemedi ({item.source} @{item.start}): {e}")
+                continue
+
+            writer.write(rows)
+            for variant_id, variant_stats in stats.items():
+                totals[variant_id].merge(variant_stats)
+            total_frames += n_frames
+
+            elapsed = time.perf_counter() - start
+            logger.info(
+                f"[{done}/{len(items)}] {Path(item.source).name} @{item.start}: {n_frames} frame "
+                f"(toplam {total_frames}, {total_frames / elapsed:.1f} frame/s)"
+            )
+
+    writer.close()
+
+    summary = []
+    for variant_id, params, _ in variants:
+        row = {'variant': variant_id, 'params': json.dumps(params)}
+        row.update(totals[variant_id].summary())
+        summary.append(row)
+
+    summary_writer = TableWriter(output / 'summary', SUMMARY_COLUMNS, fmt)
+    summary_writer.write([[row[name] for name in SUMMARY_COLUMNS] for row in summary])
+    summary_writer.close()
+
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"Değerlendirme tamamlandı: {total_frames} frame, {elapsed:.1f} s "
+        f"({total_frames / max(elapsed, 1e-9):.1f} frame/s) -> {output}"
+    )
+    return summary
+
+
+def main():
+    """Kayıtlı görüntüler üzerinde toplu değerlendirme"""
+    parser = argparse.ArgumentParser(description='Kayıtlı görüntüler üzerinde toplu tespit değerlendirmesi')
+    parser.add_argument('input', type=str, help='Video dosyaları veya görüntü dizileri içeren klasör')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Konfigürasyon dosyası')
+    parser.add_argument('--output', type=str, default='logs/evaluation', help='Çıktı klasörü')
+    parser.add_argument('--mode', type=str, choices=['color', 'yolo', 'hybrid'], default='color',
+                       help='Değerlendirilecek tespit yöntemi')
+    parser.add_argument('--color', type=str, choices=['red', 'green', 'blue'], default='red',
+                       help='Hedef rengi (color/hybrid)')
+    parser.add_argument('--sweep', type=str, default=None,
+                       help='Parametre taraması YAML dosyası (noktalı yol -> değer listesi)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Süreç sayısı')
+    parser.add_argument('--chunk-frames', type=int, default=1500, help='Parça başına frame sayısı')
+    parser.add_argument('--frame-step', type=int, default=1, help='Her N. frame işlenir')
+    parser.add_argument('--format', type=str, choices=['csv', 'parquet'], default='csv', help='Çıktı formatı')
+
+    args = parser.parse_args()
+
+    try:
+        config = load_config(args.config)
+    except ConfigError as e:
+        logger.error(str(e))
+        return
+
+    sweep = {}
+    if args.sweep:
+        with open(args.sweep, 'r', encoding='utf-8') as f:
+            sweep = yaml.safe_load(f) or {}
+
+    run_batch(
+        config, args.input, args.output, args.mode, args.color, sweep,
+        max(args.workers, 1), max(args.chunk_frames, 1), max(args.frame_step, 1), args.format
+    )
+
+
+if __name__ == '__main__':
+    main()
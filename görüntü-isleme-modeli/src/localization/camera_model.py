@@ -0,0 +1,227 @@
+"""
+Kamera Modeli Modülü
+Kalibre edilmiş kamera parametreleriyle piksel koordinatlarını yer koordinatlarına izdüşürür
+"""
+
+import cv2
+import numpy as np
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from loguru import logger
+
+
+EARTH_RADIUS = 6378137.0  # metre (WGS84 ekvator yarıçapı)
+
+# Kamera ekseni -> gövde ekseni (kamera aşağı bakıyor, görüntü üstü = burun)
+# Kamera: x sağ, y aşağı (görüntüde), z optik eksen
+# Gövde: x ileri, y sağ, z aşağı
+_CAMERA_TO_BODY_NADIR = np.array([
+    [0.0, -1.0, 0.0],
+    [1.0, 0.0, 0.0],
+    [0.0, 0.0, 1.0]
+])
+
+
+def rotation_body_to_ned(roll: float, pitch: float, yaw: float) -> np.ndarray:
+    """
+    Gövde ekseninden NED eksenine dönüşüm matrisi (ZYX Euler)
+
+    Args:
+        roll: Yatış açısı (radyan)
+        pitch: Yunuslama açısı (radyan)
+        yaw: Sapma açısı (radyan)
+
+    Returns:
+        3x3 dönüşüm matrisi
+    """
+    cr, sr = np.cos(roll), np.sin(roll)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    cy, sy = np.cos(yaw), np.sin(yaw)
+
+    return np.array([
+        [cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+        [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+        [-sp, cp * sr, cp * cr]
+    ])
+
+
+class CameraModel:
+    """Kalibre kamera modeli ve piksel-yer izdüşümü"""
+
+    def __init__(self, config: Dict[str, Any], resolution: Optional[Tuple[int, int]] = None):
+        """
+        Args:
+            config: Sistem konfigürasyonu
+            resolution: İşlenen frame boyutu (w, h); verilmezse camera.resolution
+        """
+        self.config = config
+        self.resolution = resolution or (
+            config['camera']['resolution']['width'],
+            config['camera']['resolution']['height']
+        )
+
+        calibration = config['camera']['calibration']
+        self.camera_matrix, self.dist_coeffs = self._load_intrinsics(calibration)
+
+        # Kamera montaj açısı (nadirden ileri doğru eğim)
+        tilt = np.radians(calibration.get('mount_tilt', 0.0))
+        mount = np.array([
+            [np.cos(tilt), 0.0, np.sin(tilt)],
+            [0.0, 1.0, 0.0],
+            [-np.sin(tilt), 0.0, np.cos(tilt)]
+        ])
+        self.camera_to_body = mount @ _CAMERA_TO_BODY_NADIR
+
+        # Distorsiyon giderme haritaları ilk undistort() çağrısında hesaplanır;
+        # izdüşüm noktaları doğrudan düzelttiği için ana döngü haritalara ihtiyaç duymaz
+        self._undistort_maps: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    @property
+    def focal_length(self) -> float:
+        """Ortalama odak uzaklığı (piksel)"""
+        return float((self.camera_matrix[0, 0] + self.camera_matrix[1, 1]) / 2)
+
+    def _load_intrinsics(self, calibration: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Kalibrasyon dosyasından iç parametreleri yükle
+
+        Dosya yoksa yatay görüş açısından ideal bir iğne deliği modeli kurulur.
+
+        Args:
+            calibration: camera.calibration konfigürasyonu
+
+        Returns:
+            (kamera_matrisi, distorsiyon_katsayıları)
+        """
+        width, height = self.resolution
+        calib_file = calibration.get('file')
+
+        if calib_file and Path(calib_file).exists():
+            fs = cv2.FileStorage(str(calib_file), cv2.FILE_STORAGE_READ)
+            camera_matrix = fs.getNode('camera_matrix').mat()
+            dist_coeffs = fs.getNode('distortion_coefficients').mat()
+            calib_width = fs.getNode('image_width').real()
+            fs.release()
+
+            if camera_matrix is not None:
+                # Kalibrasyon farklı çözünürlükte yapıldıysa ölçekle
+                if calib_width and calib_width != width:
+                    scale = width / calib_width
+                    camera_matrix = camera_matrix.copy()
+                    camera_matrix[:2] *= scale
+
+                if dist_coeffs is None:
+                    dist_coeffs = np.zeros(5)
+
+                logger.info(f"Kamera kalibrasyonu yüklendi: {calib_file}")
+                return camera_matrix.astype(np.float64), dist_coeffs.astype(np.float64).ravel()
+
+            logger.warning(f"Kalibrasyon dosyası okunamadı: {calib_file}")
+
+        hfov = np.radians(calibration['horizontal_fov'])
+        fx = (width / 2) / np.tan(hfov / 2)
+        camera_matrix = np.array([
+            [fx, 0.0, width / 2],
+            [0.0, fx, height / 2],
+            [0.0, 0.0, 1.0]
+        ])
+
+        logger.warning(f"Kalibrasyon dosyası yok - FOV modeli kullanılıyor (fx={fx:.1f})")
+        return camera_matrix, np.zeros(5)
+
+    def undistort(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Görüntü distorsiyonunu gider (haritalar ilk çağrıda hesaplanıp saklanır)
+
+        Args:
+            frame: BGR formatında giriş görüntüsü
+
+        Returns:
+            Distorsiyonu giderilmiş görüntü
+        """
+        if self._undistort_maps is None:
+            self._undistort_maps = cv2.initUndistortRectifyMap(
+                self.camera_matrix,
+                self.dist_coeffs,
+                None,
+                self.camera_matrix,
+                self.resolution,
+                cv2.CV_16SC2
+            )
+        map1, map2 = self._undistort_maps
+        return cv2.remap(frame, map1, map2, cv2.INTER_LINEAR)
+
+    def pixels_to_rays(self, pixels: np.ndarray) -> np.ndarray:
+        """
+        Piksel koordinatlarını kamera ekseninde birim olmayan ışınlara çevir
+
+        Args:
+            pixels: (N, 2) piksel koordinatları
+
+        Returns:
+            (N, 3) kamera ekseninde ışın vektörleri (z = 1)
+        """
+        pts = np.asarray(pixels, dtype=np.float64).reshape(-1, 1, 2)
+        normalized = cv2.undistortPoints(pts, self.camera_matrix, self.dist_coeffs).reshape(-1, 2)
+
+        return np.hstack([normalized, np.ones((len(normalized), 1))])
+
+    def pixels_to_ground_offsets(
+        self,
+        pixels: np.ndarray,
+        altitude: float,
+        attitude: Optional[Dict[str, float]]
+    ) -> np.ndarray:
+        """
+        Pikselleri düz zemin varsayımıyla İHA'ya göre kuzey/doğu ofsetlerine izdüşür
+
+        Args:
+            pixels: (N, 2) piksel koordinatları
+            altitude: Zemine göre irtifa (m)
+            attitude: {'roll', 'pitch', 'yaw'} (radyan) veya None (düz uçuş, kuzey)
+
+        Returns:
+            (N, 2) kuzey/doğu ofsetleri (m); ufuk üstü ışınlar NaN
+        """
+        attitude = attitude or {}
+        rotation = rotation_body_to_ned(
+            attitude.get('roll', 0.0),
+            attitude.get('pitch', 0.0),
+            attitude.get('yaw', 0.0)
+        ) @ self.camera_to_body
+
+        rays = self.pixels_to_rays(pixels) @ rotation.T
+
+        down = rays[:, 2]
+        valid = down > 1e-6
+        scale = np.full(len(rays), np.nan)
+        scale[valid] = altitude / down[valid]
+
+        return rays[:, :2] * scale[:, None]
+
+    def pixels_to_ground(
+        self,
+        pixels: np.ndarray,
+        gps: Dict[str, float],
+        altitude: float,
+        attitude: Optional[Dict[str, float]]
+    ) -> np.ndarray:
+        """
+        Pikselleri yer üzerindeki enlem/boylam koordinatlarına izdüşür
+
+        Args:
+            pixels: (N, 2) piksel koordinatları
+            gps: İHA GPS verisi ({'lat', 'lon'})
+            altitude: Zemine göre irtifa (m)
+            attitude: Görüntü anındaki açısal konum (radyan)
+
+        Returns:
+            (N, 2) enlem/boylam dizisi; izdüşürülemeyen noktalar NaN
+        """
+        offsets = self.pixels_to_ground_offsets(pixels, altitude, attitude)
+
+        lat0 = np.radians(gps['lat'])
+        dlat = np.degrees(offsets[:, 0] / EARTH_RADIUS)
+        dlon = np.degrees(offsets[:, 1] / (EARTH_RADIUS * np.cos(lat0)))
+
+        return np.column_stack([gps['lat'] + dlat, gps['lon'] + dlon])
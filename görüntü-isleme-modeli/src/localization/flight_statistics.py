@@ -0,0 +1,178 @@
+"""
+Uçuş İstatistikleri Modülü
+Mesafe, süre, irtifa ve hız istatistiklerini artımlı olarak tutar
+"""
+
+import math
+import numpy as np
+from typing import Dict, Any, Optional
+
+from src.localization.trajectory_store import ColumnStore
+
+
+EARTH_MEAN_RADIUS = 6371008.8  # metre (ortalama yer yarıçapı)
+
+SPEED_BIN_WIDTH = 0.25  # m/s, hız histogramı çözünürlüğü
+SPEED_MAX = 100.0  # m/s, üstündeki hızlar son kutuya düşer
+
+
+def haversine_distances(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """
+    Ardışık noktalar arasındaki mesafeleri vektörel haversine ile hesapla
+
+    Args:
+        lat: (N,) enlem dizisi (derece)
+        lon: (N,) boylam dizisi (derece)
+
+    Returns:
+        (N-1,) segment mesafeleri (m)
+    """
+    lat = np.radians(lat)
+    lon = np.radians(lon)
+
+    dlat = np.diff(lat)
+    dlon = np.diff(lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlon / 2) ** 2
+
+    return 2 * EARTH_MEAN_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """İki nokta arasındaki haversine mesafesi (m), skaler sürüm"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+
+    return 2 * EARTH_MEAN_RADIUS * math.asin(math.sqrt(min(a, 1.0)))
+
+
+class FlightStatistics:
+    """Artımlı uçuş istatistikleri"""
+
+    def __init__(self):
+        self.speed_bins = np.zeros(int(SPEED_MAX / SPEED_BIN_WIDTH) + 1, dtype=np.int64)
+        self.targets_by_type: Dict[str, int] = {}
+        self.reset()
+
+    def reset(self):
+        """Sayaçları sıfırla"""
+        self.total_points = 0
+        self.total_distance = 0.0
+        self.max_altitude = None
+        self.max_speed = 0.0
+        self.start_ns = None
+        self.last_ns = None
+        self.last_lat = None
+        self.last_lon = None
+        self.speed_bins[:] = 0
+        self.targets_by_type = {}
+
+    def add_point(self, lat: float, lon: float, alt: float, timestamp_ns: int):
+        """
+        Yeni trajectory noktasıyla sayaçları güncelle (O(1))
+
+        Args:
+            lat: Enlem (derece)
+            lon: Boylam (derece)
+            alt: İrtifa (m)
+            timestamp_ns: Monotonik zaman damgası (ns)
+        """
+        if self.total_points:
+            dist = haversine(self.last_lat, self.last_lon, lat, lon)
+            self.total_distance += dist
+
+            dt = (timestamp_ns - self.last_ns) / 1e9
+            if dt > 0:
+                self._add_speed(dist / dt)
+        else:
+            self.start_ns = timestamp_ns
+
+        alt = float(alt)
+        self.max_altitude = alt if self.max_altitude is None else max(self.max_altitude, alt)
+        self.last_lat, self.last_lon, self.last_ns = lat, lon, timestamp_ns
+        self.total_points += 1
+
+    def add_target(self, target_type: str):
+        """Sınıf başına hedef sayacını artır"""
+        self.targets_by_type[target_type] = self.targets_by_type.get(target_type, 0) + 1
+
+    def _add_speed(self, speed: float):
+        """Hız örneğini histograma ekle"""
+        self.max_speed = max(self.max_speed, speed)
+        index = min(int(speed / SPEED_BIN_WIDTH), len(self.speed_bins) - 1)
+        self.speed_bins[index] += 1
+
+    def speed_percentile(self, q: float) -> Optional[float]:
+        """
+        Hız yüzdeliğini histogramdan hesapla
+
+        Args:
+            q: Yüzdelik (0-100)
+
+        Returns:
+            Hız (m/s, kutu ortası) veya örnek yoksa None
+        """
+        count = int(self.speed_bins.sum())
+        if count == 0:
+            return None
+
+        cumulative = np.cumsum(self.speed_bins)
+        index = int(np.searchsorted(cumulative, q / 100.0 * count, side='left'))
+        return (index + 0.5) * SPEED_BIN_WIDTH
+
+    def recompute(self, trajectory: ColumnStore):
+        """
+        Sayaçları tüm trajectory dizileri üzerinden vektörel olarak yeniden hesapla
+
+        Args:
+            trajectory: lat/lon/alt sütunlu kayıt deposu
+        """
+        targets_by_type = self.targets_by_type
+        self.reset()
+        self.targets_by_type = targets_by_type
+
+        n = len(trajectory)
+        if n == 0:
+            return
+
+        lat = trajectory.column('lat')
+        lon = trajectory.column('lon')
+        timestamps = trajectory.column('timestamp')
+
+        self.total_points = n
+        self.max_altitude = float(trajectory.column('alt').max())
+        self.start_ns = int(timestamps[0])
+        self.last_ns = int(timestamps[-1])
+        self.last_lat, self.last_lon = float(lat[-1]), float(lon[-1])
+
+        if n > 1:
+            distances = haversine_distances(lat, lon)
+            self.total_distance = float(distances.sum())
+
+            dt = np.diff(timestamps) / 1e9
+            speeds = distances[dt > 0] / dt[dt > 0]
+            if len(speeds):
+                self.max_speed = float(speeds.max())
+                index = np.minimum((speeds / SPEED_BIN_WIDTH).astype(np.int64), len(self.speed_bins) - 1)
+                self.speed_bins[:] = np.bincount(index, minlength=len(self.speed_bins))
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        İstatistik özetini döndür
+
+        Returns:
+            İstatistik sözlüğü
+        """
+        duration = (self.last_ns - self.start_ns) / 1e9 if self.total_points else 0.0
+
+        return {
+            'total_distance_m': self.total_distance,
+            'duration_s': duration,
+            'max_altitude_m': self.max_altitude,
+            'avg_speed_ms': self.total_distance / duration if duration > 0 else None,
+            'max_speed_ms': self.max_speed,
+            'speed_p50_ms': self.speed_percentile(50),
+            'speed_p95_ms': self.speed_percentile(95),
+            'targets_by_type': dict(self.targets_by_type)
+        }
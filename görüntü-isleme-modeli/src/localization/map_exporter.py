@@ -0,0 +1,327 @@
+"""
+Harita Dışa Aktarma Modülü
+Trajectory'yi sadeleştirip hedef kümeleriyle birlikte GeoJSON/HTML haritayı arka planda üretir
+"""
+
+import os
+import json
+import queue
+import threading
+import folium
+import numpy as np
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from loguru import logger
+
+
+EARTH_RADIUS = 6378137.0  # metre
+TILE_ATTRIBUTION = '&copy; OpenStreetMap katkıcıları'
+
+
+def to_local_meters(lat: np.ndarray, lon: np.ndarray, lat0: float, lon0: float) -> np.ndarray:
+    """
+    Enlem/boylamı referans noktaya göre yerel düzlem (kuzey, doğu) metrelerine çevir
+
+    Args:
+        lat: Enlem dizisi (derece)
+        lon: Boylam dizisi (derece)
+        lat0: Referans enlem
+        lon0: Referans boylam
+
+    Returns:
+        (N, 2) kuzey/doğu koordinatları (m)
+    """
+    north = np.radians(np.asarray(lat) - lat0) * EARTH_RADIUS
+    east = np.radians(np.asarray(lon) - lon0) * EARTH_RADIUS * np.cos(np.radians(lat0))
+    return np.column_stack([north, east])
+
+
+def douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Douglas-Peucker ile çoklu çizgiyi sadeleştir
+
+    Args:
+        points: (N, 2) düzlem koordinatları (m)
+        tolerance: İzin verilen maksimum sapma (m)
+
+    Returns:
+        Korunan noktaların sıralı indeksleri (ilk ve son nokta dahil)
+    """
+    n = len(points)
+    if n < 3:
+        return np.arange(n)
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        segment = points[end] - points[start]
+        inner = points[start + 1:end] - points[start]
+        length = np.hypot(segment[0], segment[1])
+
+        # Ara noktaların segmente dik uzaklıkları (vektörel)
+        if length > 0:
+            dist = np.abs(segment[0] * inner[:, 1] - segment[1] * inner[:, 0]) / length
+        else:
+            dist = np.hypot(inner[:, 0], inner[:, 1])
+
+        index = int(np.argmax(dist))
+        if dist[index] > tolerance:
+            split = start + 1 + index
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return np.flatnonzero(keep)
+
+
+class MapExporter:
+    """Sadeleştirilmiş trajectory ve hedef kümeleriyle artımlı harita üretimi"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        export_config = config['localization']['export']
+        self.enabled = export_config['enabled']
+        self.tolerance = export_config['simplify_tolerance']
+        self.geojson_file = Path(export_config['geojson_file'])
+        self.html_file = Path(export_config['html_file'])
+        self.html_every = export_config['html_every']
+
+        # Artımlı sadeleştirme durumu
+        self._origin = None
+        self._frozen: List[List[float]] = []
+        self._anchor = 0
+
+        self._queue = queue.Queue(maxsize=1)
+        self._thread = None
+        self._export_count = 0
+
+    def reset(self):
+        """Sadeleştirme durumunu sıfırla"""
+        self._origin = None
+        self._frozen = []
+        self._anchor = 0
+
+    def simplify(
+        self,
+        lat: np.ndarray,
+        lon: np.ndarray,
+        alt: np.ndarray,
+        offset: int = 0
+    ) -> List[List[float]]:
+        """
+        Trajectory'yi artımlı olarak sadeleştir
+
+        Kesinleşmiş köşeler bir sonraki çağrıda yeniden işlenmez; sadece son
+        kesin köşeden itibaren eklenen kuyruk sadeleştirilir.
+
+        Args:
+            lat: Tüm trajectory enlemleri
+            lon: Tüm trajectory boylamları
+            alt: Tüm trajectory irtifaları
+            offset: Dizilerin ilk elemanının mutlak kayıt indeksi
+
+        Returns:
+            [lon, lat, alt] koordinat listesi (GeoJSON sırası)
+        """
+        n = len(lat)
+        if n == 0:
+            return []
+
+        if self._origin is None:
+            self._origin = (float(lat[0]), float(lon[0]))
+
+        # Çapa bellek penceresinden düştüyse pencere başından devam et
+        start = min(max(self._anchor - offset, 0), n - 1)
+        xy = to_local_meters(lat[start:], lon[start:], *self._origin)
+        kept = douglas_peucker(xy, self.tolerance) + start
+
+        # Son iç köşeye kadar olan kısmı kesinleştir
+        if len(kept) > 2:
+            for i in kept[:-2]:
+                self._frozen.append([float(lon[i]), float(lat[i]), float(alt[i])])
+            self._anchor = int(kept[-2]) + offset
+            provisional = kept[-2:]
+        else:
+            provisional = kept
+
+        return self._frozen + [
+            [float(lon[i]), float(lat[i]), float(alt[i])] for i in provisional
+        ]
+
+    def build_geojson(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Anlık görüntüden GeoJSON FeatureCollection oluştur
+
+        Args:
+            snapshot: MapManager.snapshot() çıktısı
+
+        Returns:
+            GeoJSON sözlüğü
+        """
+        trajectory = snapshot['trajectory']
+        features = []
+
+        track = self.simplify(
+            trajectory['lat'],
+            trajectory['lon'],
+            trajectory['alt'],
+            snapshot.get('offset', 0)
+        )
+        if len(track) > 1:
+            features.append({
+                'type': 'Feature',
+                'geometry': {'type': 'LineString', 'coordinates': track},
+                'properties': {'kind': 'trajectory', 'points': len(trajectory['lat'])}
+            })
+
+        if track:
+            features.append({
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': track[-1]},
+                'properties': {'kind': 'uav', 'altitude': track[-1][2]}
+            })
+
+        # Hedef kümeleri (TargetRegistry ile tekilleştirilmiş)
+        for target in snapshot['targets']:
+            lat, lon = target['coords']
+            features.append({
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+                'properties': {
+                    'kind': 'target',
+                    'type': target['type'],
+                    'count': target['observations'],
+                    'confidence': target['confidence']
+                }
+            })
+
+        return {'type': 'FeatureCollection', 'features': features}
+
+    def write_geojson(self, geojson: Dict[str, Any], filepath: Path):
+        """
+        GeoJSON'u atomik olarak yaz (okuyucular yarım dosya görmez)
+
+        Args:
+            geojson: GeoJSON sözlüğü
+            filepath: Kayıt yolu
+        """
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = filepath.with_suffix(filepath.suffix + '.tmp')
+
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(geojson, f, separators=(',', ':'))
+        os.replace(tmp_path, filepath)
+
+    def build_map(self, geojson: Dict[str, Any], tiles: Any = 'OpenStreetMap', zoom: int = 15) -> Optional[folium.Map]:
+        """
+        GeoJSON'dan yeni bir folium haritası oluştur
+
+        Args:
+            geojson: GeoJSON sözlüğü
+            tiles: folium karo katmanı
+            zoom: Zoom seviyesi
+
+        Returns:
+            folium.Map veya veri yoksa None
+        """
+        features = geojson['features']
+        if not features:
+            return None
+
+        first = features[0]['geometry']
+        lon, lat = (first['coordinates'][0] if first['type'] == 'LineString' else first['coordinates'])[:2]
+
+        # Yerel karo sunucusu URL'si verildiyse atıf metni gerekir
+        attr = TILE_ATTRIBUTION if str(tiles).startswith('http') else None
+        fmap = folium.Map(location=(lat, lon), zoom_start=zoom, tiles=tiles, attr=attr)
+
+        for feature in features:
+            props = feature['properties']
+            coords = feature['geometry']['coordinates']
+
+            if props['kind'] == 'trajectory':
+                folium.PolyLine(
+                    [(c[1], c[0]) for c in coords],
+                    color='blue',
+                    weight=2,
+                    opacity=0.7,
+                    popup='İHA Yolu'
+                ).add_to(fmap)
+            elif props['kind'] == 'uav':
+                folium.Marker(
+                    (coords[1], coords[0]),
+                    popup=f"İHA - Alt: {props['altitude']:.1f}m",
+                    icon=folium.Icon(color='blue', icon='plane')
+                ).add_to(fmap)
+            else:
+                color = 'red' if props['type'] == 'target' else 'green'
+                folium.Marker(
+                    (coords[1], coords[0]),
+                    popup=f"{props['type']} x{props['count']} ({props['confidence']:.2f})",
+                    icon=folium.Icon(color=color, icon='crosshairs')
+                ).add_to(fmap)
+
+        return fmap
+
+    def start(self):
+        """Arka plan dışa aktarma iş parçacığını başlat"""
+        if not self.enabled or self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._worker, name='map-exporter', daemon=True)
+        self._thread.start()
+        logger.info(f"Canlı harita dışa aktarımı başlatıldı: {self.geojson_file}")
+
+    def submit(self, snapshot: Dict[str, Any]):
+        """
+        Yeni anlık görüntüyü kuyruğa koy; bekleyen eski istek varsa yerine geçer
+
+        Args:
+            snapshot: MapManager.snapshot() çıktısı
+        """
+        if self._thread is None:
+            return
+
+        try:
+            self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._queue.put_nowait(snapshot)
+
+    def _worker(self):
+        """Kuyruktaki anlık görüntülerden GeoJSON ve periyodik HTML üret"""
+        while True:
+            snapshot = self._queue.get()
+            if snapshot is None:
+                break
+
+            try:
+                geojson = self.build_geojson(snapshot)
+                self.write_geojson(geojson, self.geojson_file)
+
+                self._export_count += 1
+                if self._export_count % self.html_every == 0:
+                    fmap = self.build_map(geojson, snapshot.get('tiles', 'OpenStreetMap'))
+                    if fmap is not None:
+                        fmap.save(str(self.html_file))
+            except Exception as e:
+                logger.error(f"Harita dışa aktarma hatası: {e}")
+
+    def stop(self):
+        """İş parçacığını durdur"""
+        if self._thread is None:
+            return
+
+        try:
+            self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._thread = None
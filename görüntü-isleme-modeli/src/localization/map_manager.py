@@ -3,12 +3,20 @@ Harita Yönetimi Modülü
 GPS koordinatları ve hedef lokasyonlarını harita üzerinde gösterir
 """
 
+import time
 import folium
+import numpy as np
 from typing import List, Tuple, Dict, Any
 from loguru import logger
-from datetime import datetime
 import json
 
+from src.localization.trajectory_store import ColumnStore
+from src.localization.flight_statistics import FlightStatistics
+from src.localization.map_exporter import MapExporter, TILE_ATTRIBUTION
+from src.localization.trajectory_writer import TrajectoryWriter
+from src.localization.target_registry import TargetRegistry
+from src.localization.tile_cache import create_tile_layer
+
 
 class MapManager:
     """Harita yönetimi ve görselleştirme"""
@@ -18,9 +26,26 @@ class MapManager:
         self.coordinate_system = config['localization']['coordinate_system']
         self.save_trajectory = config['localization']['save_trajectory']
 
-        self.trajectory = []
-        self.target_locations = []
+        # Kalıcı kayıt açıksa RAM'de sadece son pencere tutulur
+        persistence_config = config['localization']['persistence']
+        self.persistence_enabled = persistence_config['enabled']
+        window = persistence_config['memory_window'] if self.persistence_enabled else None
+
+        # Sütunsal kayıt depoları (float64 konum, int64 monotonik zaman)
+        self.trajectory = ColumnStore({
+            'lat': np.float64,
+            'lon': np.float64,
+            'alt': np.float64
+        }, max_size=window)
+
+        # Hedef gözlemleri fiziksel hedef kümelerine birleştirilir
+        self.target_locations = TargetRegistry(config)
+        self.writer = TrajectoryWriter(config, self.trajectory.isoformat) if self.persistence_enabled else None
+        self.statistics = FlightStatistics()
+        self.exporter = MapExporter(config)
+        self.tiles, self.tile_server = create_tile_layer(config)
         self.map = None
+        self.zoom = 15
 
     def initialize_map(self, center_coords: Tuple[float, float], zoom: int = 15):
         """
@@ -30,10 +55,12 @@ class MapManager:
             center_coords: (lat, lon) merkez koordinatları
             zoom: Zoom seviyesi
         """
+        self.zoom = zoom
         self.map = folium.Map(
             location=center_coords,
             zoom_start=zoom,
-            tiles='OpenStreetMap'
+            tiles=self.tiles,
+            attr=TILE_ATTRIBUTION if self.tile_server else None
         )
         logger.info(f"Harita başlatıldı: {center_coords}")
 
@@ -45,12 +72,12 @@ class MapManager:
             coords: (lat, lon) koordinatları
             altitude: İrtifa
         """
-        point = {
-            'coords': coords,
-            'altitude': altitude,
-            'timestamp': datetime.now().isoformat()
-        }
-        self.trajectory.append(point)
+        timestamp_ns = time.monotonic_ns()
+        self.trajectory.append(timestamp_ns, lat=coords[0], lon=coords[1], alt=altitude)
+        self.statistics.add_point(coords[0], coords[1], altitude, timestamp_ns)
+
+        if self.writer:
+            self.writer.write_point(coords[0], coords[1], altitude, timestamp_ns)
 
     def add_target_location(
         self,
@@ -66,49 +93,68 @@ class MapManager:
             target_type: Hedef tipi
             confidence: Güvenilirlik skoru
         """
-        target = {
-            'coords': coords,
-            'type': target_type,
-            'confidence': confidence,
-            'timestamp': datetime.now().isoformat()
+        timestamp_ns = time.monotonic_ns()
+        cluster = self.target_locations.add_observation(coords, target_type, confidence, timestamp_ns)
+        self.statistics.add_target(target_type)
+
+        if self.writer:
+            self.writer.write_target(coords[0], coords[1], target_type, confidence, timestamp_ns)
+        logger.debug(f"Hedef gözlemi eklendi: {target_type} @ {coords} -> #{cluster.cluster_id} ({cluster.count} gözlem)")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Dışa aktarma için kayıtların kopyasız anlık görüntüsünü al
+
+        Returns:
+            Trajectory sütun görünümleri ve hedef kümesi özetleri
+        """
+        n_points = len(self.trajectory)
+
+        return {
+            'trajectory': self.trajectory.columns(slice(0, n_points)),
+            'targets': self.target_locations.summaries(),
+            'offset': self.trajectory.offset,
+            'tiles': self.tiles
         }
-        self.target_locations.append(target)
-        logger.info(f"Hedef lokasyonu eklendi: {target_type} @ {coords}")
+
+    def start_persistence(self):
+        """Segment dosyalarına arka plan kaydını başlat"""
+        if self.writer:
+            self.writer.start()
+
+    def stop_persistence(self):
+        """Bekleyen kayıtları yazıp segment dosyasını kapat"""
+        if self.writer:
+            self.writer.close()
+
+    def start_export(self):
+        """Canlı GeoJSON dışa aktarımını ve yerel karo sunucusunu arka planda başlat"""
+        if self.tile_server:
+            self.tile_server.start()
+        self.exporter.start()
+
+    def request_export(self):
+        """Ana döngüyü bekletmeden canlı harita güncellemesi iste"""
+        self.exporter.submit(self.snapshot())
+
+    def stop_export(self):
+        """Canlı dışa aktarımı ve karo sunucusunu durdur"""
+        self.exporter.stop()
+        if self.tile_server:
+            self.tile_server.stop()
 
     def update_map(self):
-        """Haritayı güncelle"""
-        if self.map is None:
-            logger.warning("Harita başlatılmamış")
+        """Haritayı sadeleştirilmiş GeoJSON'dan yeniden oluştur"""
+        geojson = self.exporter.build_geojson(self.snapshot())
+        fmap = self.exporter.build_map(geojson, self.tiles, self.zoom)
+
+        if fmap is None:
+            if self.map is None:
+                logger.warning("Harita başlatılmamış")
             return
 
-        # Trajectory çiz
-        if len(self.trajectory) > 1:
-            coords_list = [point['coords'] for point in self.trajectory]
-            folium.PolyLine(
-                coords_list,
-                color='blue',
-                weight=2,
-                opacity=0.7,
-                popup='İHA Yolu'
-            ).add_to(self.map)
-
-        # İHA pozisyonunu göster (son nokta)
-        if self.trajectory:
-            last_point = self.trajectory[-1]
-            folium.Marker(
-                last_point['coords'],
-                popup=f"İHA - Alt: {last_point['altitude']:.1f}m",
-                icon=folium.Icon(color='blue', icon='plane')
-            ).add_to(self.map)
-
-        # Hedef lokasyonlarını göster
-        for target in self.target_locations:
-            color = 'red' if target['type'] == 'target' else 'green'
-            folium.Marker(
-                target['coords'],
-                popup=f"{target['type']} ({target['confidence']:.2f})",
-                icon=folium.Icon(color=color, icon='crosshairs')
-            ).add_to(self.map)
+        # Her çağrıda yeni harita kurulur, katmanlar çoğalmaz
+        self.map = fmap
 
     def save_map(self, filepath: str):
         """
@@ -137,9 +183,14 @@ class MapManager:
         if not self.save_trajectory:
             return
 
+        # Kalıcı kayıt açıkken tüm uçuş zaten segment dosyalarında
+        if self.persistence_enabled:
+            logger.info(f"Trajectory segment dosyalarında: {self.writer.directory}")
+            return
+
         data = {
-            'trajectory': self.trajectory,
-            'targets': self.target_locations,
+            'trajectory': self.trajectory_records(),
+            'targets': self.target_records(),
             'coordinate_system': self.coordinate_system
         }
 
@@ -150,6 +201,37 @@ class MapManager:
         except Exception as e:
             logger.error(f"Trajectory kaydetme hatası: {e}")
 
+    def trajectory_records(self) -> List[Dict[str, Any]]:
+        """Trajectory kayıtlarını serileştirme için sözlük listesine çevir"""
+        points = self.trajectory.columns()
+        return [
+            {
+                'coords': [lat, lon],
+                'altitude': alt,
+                'timestamp': self.trajectory.isoformat(ts)
+            }
+            for lat, lon, alt, ts in zip(
+                points['lat'].tolist(),
+                points['lon'].tolist(),
+                points['alt'].tolist(),
+                points['timestamp'].tolist()
+            )
+        ]
+
+    def target_records(self) -> List[Dict[str, Any]]:
+        """Hedef kümelerini serileştirme için sözlük listesine çevir"""
+        records = []
+        for summary in self.target_locations.summaries():
+            records.append({
+                'coords': summary['coords'],
+                'type': summary['type'],
+                'confidence': summary['confidence'],
+                'observations': summary['observations'],
+                'covariance': summary['covariance'],
+                'timestamp': self.trajectory.isoformat(summary['last_seen_ns'])
+            })
+        return records
+
     def get_statistics(self) -> Dict[str, Any]:
         """
         İstatistik bilgileri al
@@ -157,22 +239,15 @@ class MapManager:
         Returns:
             İstatistik sözlüğü
         """
-        total_distance = 0.0
-        if len(self.trajectory) > 1:
-            from geopy.distance import geodesic
-            for i in range(1, len(self.trajectory)):
-                dist = geodesic(
-                    self.trajectory[i-1]['coords'],
-                    self.trajectory[i]['coords']
-                ).meters
-                total_distance += dist
-
+        # Sayaçlar eklemede artımlı güncellenir; burada sadece özet okunur
+        has_points = self.statistics.total_points > 0
         stats = {
-            'total_waypoints': len(self.trajectory),
-            'total_distance_m': total_distance,
+            'total_waypoints': self.statistics.total_points,
             'targets_detected': len(self.target_locations),
-            'start_time': self.trajectory[0]['timestamp'] if self.trajectory else None,
-            'end_time': self.trajectory[-1]['timestamp'] if self.trajectory else None
+            'target_observations': sum(self.statistics.targets_by_type.values()),
+            'start_time': self.trajectory.isoformat(self.statistics.start_ns) if has_points else None,
+            'end_time': self.trajectory.isoformat(self.statistics.last_ns) if has_points else None
         }
+        stats.update(self.statistics.summary())
 
         return stats
@@ -0,0 +1,210 @@
+"""
+Hedef Kayıt Modülü
+Hedef gözlemlerini ızgara tabanlı uzamsal indeksle kümeleyip tekilleştirir
+"""
+
+import math
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Tuple
+from loguru import logger
+
+
+EARTH_RADIUS = 6378137.0  # metre
+
+
+@dataclass
+class TargetCluster:
+    """Aynı fiziksel hedefe ait gözlemlerin birleşimi"""
+    cluster_id: int
+    target_type: str
+    mean: np.ndarray  # Yerel düzlemde güvenilirlik ağırlıklı merkez (kuzey, doğu) m
+    weight_sum: float
+    scatter: np.ndarray = field(default_factory=lambda: np.zeros((2, 2)))
+    count: int = 1
+    max_confidence: float = 0.0
+    first_seen_ns: int = 0
+    last_seen_ns: int = 0
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """Konum kovaryansı (m²)"""
+        return self.scatter / self.weight_sum
+
+    def merge(self, xy: np.ndarray, weight: float, confidence: float, timestamp_ns: int):
+        """
+        Yeni gözlemi ağırlıklı Welford güncellemesiyle birleştir
+
+        Args:
+            xy: Gözlemin yerel düzlem konumu (m)
+            weight: Gözlem ağırlığı
+            confidence: Güvenilirlik skoru
+            timestamp_ns: Monotonik zaman damgası (ns)
+        """
+        new_weight = self.weight_sum + weight
+        delta = xy - self.mean
+        self.mean = self.mean + delta * (weight / new_weight)
+        self.scatter = self.scatter + weight * np.outer(delta, xy - self.mean)
+        self.weight_sum = new_weight
+
+        self.count += 1
+        self.max_confidence = max(self.max_confidence, confidence)
+        self.last_seen_ns = timestamp_ns
+
+
+class TargetRegistry:
+    """Birleştirme yarıçapına eşit hücreli ızgara indeksli hedef kaydı"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.merge_radius = config['localization']['targets']['merge_radius']
+
+        self.clusters: Dict[int, TargetCluster] = {}
+        self.grid: Dict[Tuple[int, int], List[int]] = {}
+        self.origin = None
+        self.next_id = 1
+
+    def __len__(self) -> int:
+        return len(self.clusters)
+
+    def to_local(self, lat: float, lon: float) -> np.ndarray:
+        """Enlem/boylamı kayıt orijinine göre yerel (kuzey, doğu) metreye çevir"""
+        lat0, lon0 = self.origin
+        return np.array([
+            math.radians(lat - lat0) * EARTH_RADIUS,
+            math.radians(lon - lon0) * EARTH_RADIUS * math.cos(math.radians(lat0))
+        ])
+
+    def to_geographic(self, xy: np.ndarray) -> Tuple[float, float]:
+        """Yerel metre koordinatını enlem/boylama çevir"""
+        lat0, lon0 = self.origin
+        lat = lat0 + math.degrees(xy[0] / EARTH_RADIUS)
+        lon = lon0 + math.degrees(xy[1] / (EARTH_RADIUS * math.cos(math.radians(lat0))))
+        return lat, lon
+
+    def _cell(self, xy: np.ndarray) -> Tuple[int, int]:
+        """Konumun ızgara hücresi"""
+        return (int(math.floor(xy[0] / self.merge_radius)), int(math.floor(xy[1] / self.merge_radius)))
+
+    def _index(self, cluster: TargetCluster):
+        self.grid.setdefault(self._cell(cluster.mean), []).append(cluster.cluster_id)
+
+    def _unindex(self, cluster: TargetCluster):
+        cell = self._cell(cluster.mean)
+        ids = self.grid[cell]
+        ids.remove(cluster.cluster_id)
+        if not ids:
+            del self.grid[cell]
+
+    def _nearby(self, xy: np.ndarray, radius: float) -> List[Tuple[float, TargetCluster]]:
+        """
+        Yarıçap içindeki kümeleri sadece komşu hücreleri tarayarak bul
+
+        Returns:
+            (mesafe, küme) listesi
+        """
+        ci, cj = self._cell(xy)
+        reach = int(math.ceil(radius / self.merge_radius))
+        found = []
+
+        for i in range(ci - reach, ci + reach + 1):
+            for j in range(cj - reach, cj + reach + 1):
+                for cluster_id in self.grid.get((i, j), ()):
+                    cluster = self.clusters[cluster_id]
+                    dist = float(np.hypot(*(cluster.mean - xy)))
+                    if dist <= radius:
+                        found.append((dist, cluster))
+
+        return found
+
+    def add_observation(
+        self,
+        coords: Tuple[float, float],
+        target_type: str,
+        confidence: float,
+        timestamp_ns: int
+    ) -> TargetCluster:
+        """
+        Gözlemi yarıçap içindeki en yakın aynı tip kümeye birleştir veya yeni küme aç
+
+        Args:
+            coords: (lat, lon) koordinatları
+            target_type: Hedef tipi
+            confidence: Güvenilirlik skoru
+            timestamp_ns: Monotonik zaman damgası (ns)
+
+        Returns:
+            Gözlemin eklendiği küme
+        """
+        if self.origin is None:
+            self.origin = (coords[0], coords[1])
+
+        xy = self.to_local(coords[0], coords[1])
+        weight = max(confidence, 1e-3)
+
+        candidates = [
+            (dist, cluster) for dist, cluster in self._nearby(xy, self.merge_radius)
+            if cluster.target_type == target_type
+        ]
+
+        if candidates:
+            _, cluster = min(candidates, key=lambda c: c[0])
+            self._unindex(cluster)
+            cluster.merge(xy, weight, confidence, timestamp_ns)
+            self._index(cluster)
+            return cluster
+
+        cluster = TargetCluster(
+            cluster_id=self.next_id,
+            target_type=target_type,
+            mean=xy,
+            weight_sum=weight,
+            max_confidence=confidence,
+            first_seen_ns=timestamp_ns,
+            last_seen_ns=timestamp_ns
+        )
+        self.clusters[cluster.cluster_id] = cluster
+        self._index(cluster)
+        self.next_id += 1
+
+        logger.info(f"Yeni hedef kaydı #{cluster.cluster_id}: {target_type} @ {coords}")
+        return cluster
+
+    def query_radius(self, coords: Tuple[float, float], radius: float) -> List[TargetCluster]:
+        """
+        Noktaya R metre içindeki hedefleri mesafeye göre sıralı döndür
+
+        Args:
+            coords: (lat, lon) sorgu noktası
+            radius: Yarıçap (m)
+
+        Returns:
+            Küme listesi
+        """
+        if self.origin is None:
+            return []
+
+        found = self._nearby(self.to_local(coords[0], coords[1]), radius)
+        return [cluster for _, cluster in sorted(found, key=lambda c: c[0])]
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """
+        Kümeleri serileştirme/dışa aktarma için düz sözlüklere çevir
+
+        Returns:
+            Küme özetleri listesi
+        """
+        result = []
+        for cluster in self.clusters.values():
+            lat, lon = self.to_geographic(cluster.mean)
+            result.append({
+                'id': cluster.cluster_id,
+                'coords': [lat, lon],
+                'type': cluster.target_type,
+                'confidence': cluster.max_confidence,
+                'observations': cluster.count,
+                'covariance': cluster.covariance.tolist(),
+                'first_seen_ns': cluster.first_seen_ns,
+                'last_seen_ns': cluster.last_seen_ns
+            })
+        return result
@@ -0,0 +1,402 @@
+"""
+Çevrimdışı Harita Karo Önbelleği
+MBTiles (SQLite) karo önbelleği, önbellek doldurma aracı ve yerel karo sunucusu
+"""
+
+import math
+import time
+import sqlite3
+import argparse
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Iterator, Optional, Tuple
+from loguru import logger
+
+
+DEFAULT_TILE_URL = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+USER_AGENT = "sarkan-iha-tile-seeder/1.0"
+
+
+def deg2tile(lat: float, lon: float, zoom: int) -> Tuple[int, int]:
+    """
+    Enlem/boylamı XYZ (slippy map) karo indeksine çevir
+
+    Args:
+        lat: Enlem (derece)
+        lon: Boylam (derece)
+        zoom: Zoom seviyesi
+
+    Returns:
+        (x, y) karo indeksi
+    """
+    n = 2 ** zoom
+    lat_rad = math.radians(lat)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tiles_in_bbox(
+    bbox: Tuple[float, float, float, float],
+    min_zoom: int,
+    max_zoom: int
+) -> Iterator[Tuple[int, int, int]]:
+    """
+    Sınır kutusunu kaplayan tüm karoları üret
+
+    Args:
+        bbox: (güney, batı, kuzey, doğu) derece
+        min_zoom: En düşük zoom
+        max_zoom: En yüksek zoom
+
+    Yields:
+        (z, x, y) karo indeksleri
+    """
+    south, west, north, east = bbox
+    for z in range(min_zoom, max_zoom + 1):
+        x_min, y_min = deg2tile(north, west, z)
+        x_max, y_max = deg2tile(south, east, z)
+        for x in range(x_min, x_max + 1):
+            for y in range(y_min, y_max + 1):
+                yield z, x, y
+
+
+class MBTilesCache:
+    """MBTiles formatında SQLite karo deposu"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute("CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS tiles ("
+            "zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB, "
+            "PRIMARY KEY (zoom_level, tile_column, tile_row))"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        """İş parçacığına özel SQLite bağlantısı"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path))
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _tms_row(z: int, y: int) -> int:
+        """XYZ satırını MBTiles (TMS) satırına çevir"""
+        return (2 ** z - 1) - y
+
+    def get_tile(self, z: int, x: int, y: int) -> Optional[bytes]:
+        """Karoyu oku (XYZ indeksleri)"""
+        row = self._conn().execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+            (z, x, self._tms_row(z, y))
+        ).fetchone()
+        return row[0] if row else None
+
+    def has_tile(self, z: int, x: int, y: int) -> bool:
+        """Karo önbellekte var mı"""
+        row = self._conn().execute(
+            "SELECT 1 FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+            (z, x, self._tms_row(z, y))
+        ).fetchone()
+        return row is not None
+
+    def put_tile(self, z: int, x: int, y: int, data: bytes, commit: bool = True):
+        """Karoyu yaz (XYZ indeksleri)"""
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?)",
+            (z, x, self._tms_row(z, y), sqlite3.Binary(data))
+        )
+        if commit:
+            conn.commit()
+
+    def set_metadata(self, **values):
+        """MBTiles metadata tablosunu güncelle"""
+        conn = self._conn()
+        conn.executemany(
+            "INSERT OR REPLACE INTO metadata (name, value) VALUES (?, ?)",
+            [(k, str(v)) for k, v in values.items()]
+        )
+        conn.commit()
+
+    def commit(self):
+        self._conn().commit()
+
+
+def seed(
+    cache: MBTilesCache,
+    bbox: Tuple[float, float, float, float],
+    min_zoom: int,
+    max_zoom: int,
+    url_template: str = DEFAULT_TILE_URL,
+    delay: float = 0.1
+) -> int:
+    """
+    Sınır kutusu ve zoom aralığı için önbelleği internetten doldur
+
+    Önbellekte olan karolar atlanır; yarıda kalan doldurma kaldığı yerden devam eder.
+
+    Args:
+        cache: Hedef MBTiles önbelleği
+        bbox: (güney, batı, kuzey, doğu) derece
+        min_zoom: En düşük zoom
+        max_zoom: En yüksek zoom
+        url_template: {z}/{x}/{y} içeren karo URL şablonu
+        delay: İstekler arası bekleme (s), karo sunucusu kullanım kurallarına uyum için
+
+    Returns:
+        İndirilen karo sayısı
+    """
+    downloaded = 0
+
+    for z, x, y in tiles_in_bbox(bbox, min_zoom, max_zoom):
+        if cache.has_tile(z, x, y):
+            continue
+
+        url = url_template.format(z=z, x=x, y=y)
+        try:
+            request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+            with urllib.request.urlopen(request, timeout=10) as response:
+                cache.put_tile(z, x, y, response.read(), commit=False)
+            downloaded += 1
+        except Exception as e:
+            logger.warning(f"Karo indirilemedi {z}/{x}/{y}: {e}")
+            continue
+
+        if downloaded % 100 == 0:
+            cache.commit()
+            logger.info(f"{downloaded} karo indirildi")
+
+        time.sleep(delay)
+
+    cache.commit()
+    south, west, north, east = bbox
+    cache.set_metadata(
+        name=cache.path.stem,
+        format='png',
+        bounds=f"{west},{south},{east},{north}",
+        minzoom=min_zoom,
+        maxzoom=max_zoom
+    )
+    logger.info(f"Önbellek doldurma tamamlandı: {downloaded} yeni karo -> {cache.path}")
+    return downloaded
+
+
+class TileServer:
+    """MBTiles önbelleğinden bellek içi LRU ile karo sunan yerel HTTP sunucusu"""
+
+    def __init__(self, cache: MBTilesCache, host: str = '127.0.0.1', port: int = 8765, lru_size: int = 512):
+        self.cache = cache
+        self.host = host
+        self.port = port
+        self.lru_size = lru_size
+
+        self._lru: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url_template(self) -> str:
+        """folium/Leaflet için karo URL şablonu"""
+        return f"http://{self.host}:{self.port}/{{z}}/{{x}}/{{y}}.png"
+
+    def get(self, z: int, x: int, y: int) -> Optional[bytes]:
+        """Karoyu LRU'dan, yoksa SQLite'tan getir"""
+        key = (z, x, y)
+        with self._lock:
+            data = self._lru.get(key)
+            if data is not None:
+                self._lru.move_to_end(key)
+                return data
+
+        data = self.cache.get_tile(z, x, y)
+        if data is None:
+            return None
+
+        with self._lock:
+            self._lru[key] = data
+            if len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+        return data
+
+    def _handler(self):
+        server = self
+
+        class TileHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                try:
+                    z, x, y = self.path.strip('/').split('/')
+                    data = server.get(int(z), int(x), int(y.split('.')[0]))
+                except ValueError:
+                    data = None
+
+                if data is None:
+                    self.send_error(404)
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/png')
+                self.send_header('Content-Length', str(len(data)))
+                self.send_header('Cache-Control', 'max-age=86400')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return TileHandler
+
+    def start(self):
+        """Sunucuyu arka planda başlat"""
+        if self._thread is not None:
+            return
+
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        # port=0 ise işletim sisteminin verdiği port
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='tile-server', daemon=True)
+        self._thread.start()
+        logger.info(f"Karo sunucusu başlatıldı: {self.url_template} ({self.cache.path})")
+
+    def stop(self):
+        """Sunucuyu durdur"""
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+
+def create_tile_layer(config: Dict[str, Any]) -> Tuple[Any, Optional[TileServer]]:
+    """
+    Konfigürasyona göre folium karo katmanını ve gerekiyorsa sunucuyu hazırla
+
+    Args:
+        config: Sistem konfigürasyonu
+
+    Returns:
+        (folium tiles parametresi, TileServer veya None)
+    """
+    tiles_config = config['localization']['tiles']
+
+    if not tiles_config['enabled']:
+        return 'OpenStreetMap', None
+
+    if not Path(tiles_config['mbtiles_file']).exists():
+        logger.warning(f"Karo önbelleği bulunamadı: {tiles_config['mbtiles_file']} - çevrimiçi karolar kullanılacak")
+        return 'OpenStreetMap', None
+
+    server = TileServer(
+        MBTilesCache(tiles_config['mbtiles_file']),
+        tiles_config['host'],
+        tiles_config['port'],
+        tiles_config['lru_size']
+    )
+    return server.url_template, server
+
+
+def selftest():
+    """
+    Geçici önbelleğe karo yaz, sunucuyu boş bir portta başlat ve HTTP üzerinden oku
+
+    XYZ -> TMS satır çevirisi hem SQLite satırından hem de sunucu yanıtlarından doğrulanır.
+
+    Raises:
+        AssertionError: Okunan karo veya yanıt kodu beklenenden farklıysa
+    """
+    def fetch(url: str) -> Tuple[int, bytes]:
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, b''
+
+    z, x, y = 15, 19688, 12410
+    tms_row = (2 ** z - 1) - y
+    data = b'\x89PNG test karo'
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = MBTilesCache(str(Path(directory) / 'test.mbtiles'))
+        cache.put_tile(z, x, y, data)
+
+        row = cache._conn().execute(
+            "SELECT tile_row FROM tiles WHERE zoom_level=? AND tile_column=?", (z, x)
+        ).fetchone()
+        if row != (tms_row,):
+            raise AssertionError(f"MBTiles satırı {row}, beklenen TMS satırı {tms_row}")
+
+        server = TileServer(cache, port=0)
+        server.start()
+        try:
+            base = f"http://{server.host}:{server.port}"
+            status, body = fetch(f"{base}/{z}/{x}/{y}.png")
+            if (status, body) != (200, data):
+                raise AssertionError(f"Önbellekteki karo okunamadı: HTTP {status}")
+
+            # Aynı karo TMS satırıyla istenirse bulunmamalı
+            for path in (f"{z}/{x}/{tms_row}.png", f"{z}/{x + 1}/{y}.png"):
+                status, _ = fetch(f"{base}/{path}")
+                if status != 404:
+                    raise AssertionError(f"Olmayan karo /{path} için HTTP {status}")
+        finally:
+            server.stop()
+
+    logger.info(f"Karo önbelleği öz testi başarılı: {z}/{x}/{y} -> TMS satırı {tms_row}")
+
+
+def main():
+    """Önbellek doldurma ve sunma komut satırı aracı"""
+    parser = argparse.ArgumentParser(description='Çevrimdışı harita karo önbelleği')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    seed_parser = subparsers.add_parser('seed', help='Önbelleği internetten doldur')
+    seed_parser.add_argument('output', type=str, help='MBTiles dosyası')
+    seed_parser.add_argument('--bbox', type=float, nargs=4, required=True,
+                            metavar=('SOUTH', 'WEST', 'NORTH', 'EAST'), help='Sınır kutusu (derece)')
+    seed_parser.add_argument('--zoom', type=int, nargs=2, default=[12, 17],
+                            metavar=('MIN', 'MAX'), help='Zoom aralığı')
+    seed_parser.add_argument('--url', type=str, default=DEFAULT_TILE_URL, help='Karo URL şablonu')
+    seed_parser.add_argument('--delay', type=float, default=0.1, help='İstekler arası bekleme (s)')
+
+    serve_parser = subparsers.add_parser('serve', help='Önbelleği yerel HTTP ile sun')
+    serve_parser.add_argument('mbtiles', type=str, help='MBTiles dosyası')
+    serve_parser.add_argument('--host', type=str, default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+
+    subparsers.add_parser('selftest', help='Yazma, sunma ve XYZ/TMS satır çevirisi kontrolü')
+
+    args = parser.parse_args()
+
+    if args.command == 'selftest':
+        selftest()
+    elif args.command == 'seed':
+        seed(MBTilesCache(args.output), tuple(args.bbox), args.zoom[0], args.zoom[1], args.url, args.delay)
+    else:
+        server = TileServer(MBTilesCache(args.mbtiles), args.host, args.port)
+        server.start()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Sütunsal Kayıt Deposu
+Trajectory ve hedef kayıtlarını büyüyebilen numpy dizilerinde saklar
+"""
+
+import time
+import numpy as np
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+
+class ColumnStore:
+    """
+    Sabit tipli sütunlardan oluşan, sonuna ekleme yapılabilen kayıt deposu
+
+    Her kayıt monotonik bir int64 nanosaniye zaman damgası taşır. Kapasite
+    dolduğunda diziler ikiye katlanır (amortize O(1) ekleme); okuma yapan
+    taraflar kopyasız görünümler (view) alır. max_size verilirse depo sabit
+    boyutlu bir pencere olur ve en eski kayıtlar düşürülür.
+    """
+
+    def __init__(self, columns: Dict[str, Any], capacity: int = 1024, max_size: Optional[int] = None):
+        """
+        Args:
+            columns: Sütun adı -> numpy dtype
+            capacity: Başlangıç kapasitesi (kayıt sayısı)
+            max_size: RAM'de tutulacak maksimum kayıt sayısı (None: sınırsız)
+        """
+        self.max_size = max_size
+        self.offset = 0  # Pencereden düşürülen kayıt sayısı
+        if max_size:
+            capacity = min(capacity, max_size)
+
+        self._dtypes = dict(columns)
+        self._dtypes['timestamp'] = np.int64
+        self._columns = {
+            name: np.empty(capacity, dtype=dtype) for name, dtype in self._dtypes.items()
+        }
+        self._size = 0
+
+        # Monotonik saat -> duvar saati dönüşümü için çapa
+        self._wall_anchor_ns = time.time_ns()
+        self._mono_anchor_ns = time.monotonic_ns()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Ayrılmış kayıt kapasitesi"""
+        return len(self._columns['timestamp'])
+
+    @property
+    def nbytes(self) -> int:
+        """Ayrılmış toplam bellek (bayt)"""
+        return sum(col.nbytes for col in self._columns.values())
+
+    def _grow(self):
+        """Kapasiteyi ikiye katla"""
+        new_capacity = max(1, self.capacity * 2)
+        if self.max_size:
+            new_capacity = min(new_capacity, self.max_size)
+
+        for name, col in self._columns.items():
+            grown = np.empty(new_capacity, dtype=col.dtype)
+            grown[:self._size] = col[:self._size]
+            self._columns[name] = grown
+
+    def _evict(self):
+        """
+        Pencerenin eski yarısını düşür
+
+        Yeni diziler ayrılır; daha önce verilmiş görünümler bozulmaz.
+        """
+        keep = self.max_size // 2
+        drop = self._size - keep
+
+        for name, col in self._columns.items():
+            kept = np.empty(self.capacity, dtype=col.dtype)
+            kept[:keep] = col[drop:self._size]
+            self._columns[name] = kept
+
+        self._size = keep
+        self.offset += drop
+
+    def append(self, timestamp_ns: Optional[int] = None, **values):
+        """
+        Yeni kayıt ekle
+
+        Args:
+            timestamp_ns: Monotonik zaman damgası (ns); verilmezse şimdiki an
+            **values: Sütun değerleri
+        """
+        if self._size == self.capacity:
+            if self.max_size and self._size >= self.max_size:
+                self._evict()
+            else:
+                self._grow()
+
+        i = self._size
+        for name, value in values.items():
+            self._columns[name][i] = value
+        self._columns['timestamp'][i] = time.monotonic_ns() if timestamp_ns is None else timestamp_ns
+        self._size += 1
+
+    def column(self, name: str) -> np.ndarray:
+        """Sütunun dolu kısmını kopyasız görünüm olarak döndür"""
+        return self._columns[name][:self._size]
+
+    def columns(self, index: Any = slice(None)) -> Dict[str, np.ndarray]:
+        """
+        Tüm sütunları verilen indeks/dilim ile döndür
+
+        Args:
+            index: Dilim (kopyasız görünüm) veya indeks dizisi
+
+        Returns:
+            Sütun adı -> dizi
+        """
+        return {name: col[:self._size][index] for name, col in self._columns.items()}
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """Tek bir kaydı Python skalerleri olarak döndür"""
+        return {name: col[:self._size][index].item() for name, col in self._columns.items()}
+
+    def time_range(self, start_ns: Optional[int] = None, end_ns: Optional[int] = None) -> slice:
+        """
+        Zaman aralığına düşen kayıtların dilimini bul (ikili arama)
+
+        Args:
+            start_ns: Başlangıç (dahil), monotonik ns
+            end_ns: Bitiş (hariç), monotonik ns
+
+        Returns:
+            columns() ile kullanılabilecek dilim
+        """
+        timestamps = self.column('timestamp')
+        start = 0 if start_ns is None else int(np.searchsorted(timestamps, start_ns, side='left'))
+        end = self._size if end_ns is None else int(np.searchsorted(timestamps, end_ns, side='left'))
+        return slice(start, end)
+
+    def to_wall_time(self, timestamp_ns: int) -> datetime:
+        """Monotonik zaman damgasını duvar saatine çevir"""
+        wall_ns = self._wall_anchor_ns + (int(timestamp_ns) - self._mono_anchor_ns)
+        return datetime.fromtimestamp(wall_ns / 1e9)
+
+    def isoformat(self, timestamp_ns: int) -> str:
+        """Monotonik zaman damgasını ISO 8601 metnine çevir (sadece serileştirmede)"""
+        return self.to_wall_time(timestamp_ns).isoformat()
+
+    def clear(self):
+        """Kayıtları sil (kapasite korunur)"""
+        self._size = 0
@@ -0,0 +1,210 @@
+"""
+Trajectory Kalıcı Kayıt Modülü
+Trajectory ve hedef kayıtlarını arka planda NDJSON segment dosyalarına ekler
+"""
+
+import os
+import json
+import time
+import queue
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List, Callable, Optional
+from loguru import logger
+
+
+class TrajectoryWriter:
+    """Toplu yazan, periyodik fsync yapan ve segment döndüren arka plan kaydedici"""
+
+    def __init__(self, config: Dict[str, Any], to_isoformat: Callable[[int], str]):
+        """
+        Args:
+            config: Sistem konfigürasyonu
+            to_isoformat: Monotonik ns zaman damgasını ISO metnine çeviren fonksiyon
+        """
+        self.config = config
+        persistence_config = config['localization']['persistence']
+        self.directory = Path(persistence_config['directory'])
+        self.batch_size = persistence_config['batch_size']
+        self.fsync_interval = persistence_config['fsync_interval']
+        self.segment_max_bytes = persistence_config['segment_max_bytes']
+        self.to_isoformat = to_isoformat
+
+        self.session = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.segment_index = 0
+        self.file = None
+        self.last_fsync = 0.0
+        self.dropped = 0
+
+        self._queue = queue.Queue(maxsize=persistence_config['queue_size'])
+        self._thread = None
+
+    def start(self):
+        """Yazıcı iş parçacığını başlat"""
+        if self._thread is not None:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._open_segment()
+
+        self._thread = threading.Thread(target=self._worker, name='trajectory-writer', daemon=True)
+        self._thread.start()
+        logger.info(f"Trajectory kalıcı kaydı başlatıldı: {self.directory}/{self.session}_*.ndjson")
+
+    def _enqueue(self, record: tuple):
+        """Kaydı kuyruğa koy; kuyruk doluysa ana döngüyü bekletmeden düşür"""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"Trajectory kayıt kuyruğu dolu - düşen kayıt: {self.dropped}")
+
+    def write_point(self, lat: float, lon: float, alt: float, timestamp_ns: int):
+        """Trajectory noktasını kayda ekle"""
+        self._enqueue(('point', timestamp_ns, lat, lon, alt))
+
+    def write_target(self, lat: float, lon: float, target_type: str, confidence: float, timestamp_ns: int):
+        """Hedef gözlemini kayda ekle"""
+        self._enqueue(('target', timestamp_ns, lat, lon, target_type, confidence))
+
+    def _segment_path(self) -> Path:
+        """Geçerli segment dosya yolu"""
+        return self.directory / f"{self.session}_{self.segment_index:05d}.ndjson"
+
+    def _open_segment(self):
+        """Yeni segment dosyası aç"""
+        self.file = open(self._segment_path(), 'a', encoding='utf-8')
+        self.last_fsync = time.monotonic()
+
+    def _sync(self):
+        """Tamponu diske yaz ve fsync yap"""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.last_fsync = time.monotonic()
+
+    def _rotate(self):
+        """Geçerli segmenti kapat ve yenisine geç"""
+        self._sync()
+        self.file.close()
+        self.segment_index += 1
+        self._open_segment()
+        logger.debug(f"Trajectory segmenti döndürüldü: {self._segment_path()}")
+
+    def _serialize(self, record: tuple) -> str:
+        """Kuyruk kaydını NDJSON satırına çevir"""
+        kind, timestamp_ns = record[0], record[1]
+
+        if kind == 'point':
+            _, _, lat, lon, alt = record
+            data = {'kind': 'point', 'coords': [lat, lon], 'altitude': alt}
+        else:
+            _, _, lat, lon, target_type, confidence = record
+            data = {'kind': 'target', 'coords': [lat, lon], 'type': target_type, 'confidence': confidence}
+
+        data['timestamp'] = self.to_isoformat(timestamp_ns)
+        return json.dumps(data, separators=(',', ':')) + '\n'
+
+    def _worker(self):
+        """Kuyruktan toplu kayıt al, yaz, periyodik fsync ve segment döndürme yap"""
+        running = True
+
+        while running:
+            try:
+                batch = [self._queue.get(timeout=self.fsync_interval)]
+            except queue.Empty:
+                batch = []
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in batch:
+                running = False
+                batch = [r for r in batch if r is not None]
+
+            try:
+                if batch:
+                    self.file.write(''.join(self._serialize(r) for r in batch))
+
+                if not running or time.monotonic() - self.last_fsync >= self.fsync_interval:
+                    self._sync()
+
+                if self.file.tell() >= self.segment_max_bytes:
+                    self._rotate()
+            except Exception as e:
+                logger.error(f"Trajectory yazma hatası: {e}")
+
+        self.file.close()
+
+    def close(self):
+        """Kuyruktaki kayıtları yazıp dosyayı kapat"""
+        if self._thread is None:
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        logger.info(f"Trajectory kalıcı kaydı kapatıldı ({self.segment_index + 1} segment)")
+
+
+def read_segments(directory: str, session: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Segment dosyalarını sırasıyla okuyup trajectory ve hedefleri birleştir
+
+    Çökme sonrası yarım kalan son satır atlanır.
+
+    Args:
+        directory: Segment klasörü
+        session: Oturum kimliği (YYYYMMDD_HHMMSS); verilmezse en son oturum
+
+    Returns:
+        {'trajectory': [...], 'targets': [...]}
+    """
+    segments = sorted(Path(directory).glob('*.ndjson'))
+    if session is None and segments:
+        session = segments[-1].name.rsplit('_', 1)[0]
+
+    data = {'trajectory': [], 'targets': []}
+
+    for segment in segments:
+        if segment.name.rsplit('_', 1)[0] != session:
+            continue
+
+        with open(segment, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Bozuk kayıt atlandı: {segment.name}:{line_no}")
+                    continue
+
+                kind = record.pop('kind')
+                data['trajectory' if kind == 'point' else 'targets'].append(record)
+
+    return data
+
+
+def main():
+    """Segmentleri tek bir trajectory JSON dosyasına birleştir"""
+    parser = argparse.ArgumentParser(description='Trajectory segmentlerini birleştir')
+    parser.add_argument('directory', type=str, help='Segment klasörü')
+    parser.add_argument('output', type=str, help='Çıktı JSON dosyası')
+    parser.add_argument('--session', type=str, default=None,
+                       help='Oturum kimliği (varsayılan: en son oturum)')
+
+    args = parser.parse_args()
+
+    data = read_segments(args.directory, args.session)
+    with open(args.output, 'w') as f:
+        json.dump(data, f, indent=2)
+
+    logger.info(f"{len(data['trajectory'])} nokta, {len(data['targets'])} hedef yazıldı: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,22 +3,125 @@ Renk Filtresi Modülü (1. Tur İşleme)
 Kırmızı, Yeşil, Mavi hedef algılama için HSV tabanlı renk filtreleme
 """
 
+import os
 import cv2
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import List, Tuple, Optional, Dict, Any
 from loguru import logger
 
 
+@dataclass(frozen=True)
+class ColorFilterParams:
+    """Konfigürasyondan bir kez derlenen renk filtresi parametreleri"""
+    bounds: Dict[str, Tuple[Tuple[np.ndarray, np.ndarray], ...]]
+    kernel: np.ndarray
+    kernel_size: int
+    iterations: int
+    min_area: float
+    max_area: float
+    halo: int
+    workers: int
+    min_strip_rows: int
+
+
+def compile_color_filter_params(config: Dict[str, Any]) -> ColorFilterParams:
+    """
+    HSV sınırlarını ve morfoloji çekirdeğini numpy dizilerine derle
+
+    Args:
+        config: Sistem konfigürasyonu
+
+    Returns:
+        Derlenmiş parametreler
+    """
+    processing = config['image_processing']
+    bounds = {}
+
+    for color, color_range in processing['color_filters'].items():
+        (lower_h, lower_s, lower_v), (upper_h, upper_s, upper_v) = color_range['lower_hsv'], color_range['upper_hsv']
+
+        def hsv_range(h_low: int, h_high: int) -> Tuple[np.ndarray, np.ndarray]:
+            return (
+                np.array([h_low, lower_s, lower_v], dtype=np.uint8),
+                np.array([h_high, upper_s, upper_v], dtype=np.uint8)
+            )
+
+        if lower_h > upper_h:
+            # Sadece kırmızıda geçerli: 180'den 0'a sarılan ton aralığı (ör. [170, 10])
+            ranges = [hsv_range(lower_h, 180), hsv_range(0, upper_h)]
+        else:
+            ranges = [hsv_range(lower_h, upper_h)]
+            # Kırmızı renk için özel durum (HSV'de 0 ve 180'de): 0 tarafında verilen aralık
+            # 180'in diğer tarafına yansıtılır; aralık zaten 180'e değiyorsa yansıtılmaz
+            if color == 'red' and upper_h < 180:
+                ranges.append(hsv_range(180 - upper_h, 180 - lower_h))
+
+        bounds[color] = tuple(ranges)
+
+    kernel_size = processing['morphology']['kernel_size']
+    iterations = processing['morphology']['iterations']
+
+    # Opening + closing = 4 x iterations ardışık erozyon/genişleme; her biri kenardan
+    # kernel_size // 2 satır içeri etki eder
+    halo = 4 * iterations * (kernel_size // 2)
+
+    strip_config = processing['strip_parallel']
+    workers = strip_config['workers'] or os.cpu_count() or 1
+    if not strip_config['enabled']:
+        workers = 1
+
+    return ColorFilterParams(
+        bounds=bounds,
+        kernel=np.ones((kernel_size, kernel_size), np.uint8),
+        kernel_size=kernel_size,
+        iterations=iterations,
+        min_area=processing['contour']['min_area'],
+        max_area=processing['contour']['max_area'],
+        halo=halo,
+        workers=workers,
+        min_strip_rows=strip_config['min_strip_rows']
+    )
+
+
 class ColorFilter:
     """HSV renk filtresi ile hedef algılama"""
 
     def __init__(self, config: Dict[str, Any]):
+        self.executor = None
+        self.reload(config)
+
+    def reload(self, config: Dict[str, Any]):
+        """
+        Parametreleri yeniden derle ve tek atamayla değiştir
+
+        Args:
+            config: Yeni sistem konfigürasyonu
+        """
         self.config = config
-        self.color_ranges = config['image_processing']['color_filters']
-        self.kernel_size = config['image_processing']['morphology']['kernel_size']
-        self.iterations = config['image_processing']['morphology']['iterations']
-        self.min_area = config['image_processing']['contour']['min_area']
-        self.max_area = config['image_processing']['contour']['max_area']
+        params = compile_color_filter_params(config)
+
+        # Şerit havuzu kalıcıdır; sadece işçi sayısı değişince yeniden oluşturulur
+        current = self.executor._max_workers if self.executor else 1
+        if params.workers != current:
+            if self.executor:
+                self.executor.shutdown(wait=True)
+            self.executor = None
+            if params.workers > 1:
+                self.executor = ThreadPoolExecutor(max_workers=params.workers, thread_name_prefix='color-strip')
+
+        self.params = params
+        logger.debug(
+            f"Renk filtresi parametreleri derlendi: {list(params.bounds)}, "
+            f"{params.workers} şerit işçisi (halo {params.halo} satır)"
+        )
+
+    def close(self):
+        """Şerit iş parçacığı havuzunu kapat"""
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
 
     def apply_color_filter(self, frame: np.ndarray, color: str) -> np.ndarray:
         """
@@ -31,30 +134,32 @@ class ColorFilter:
         Returns:
             Binary mask
         """
-        if color not in self.color_ranges:
+        if color not in self.params.bounds:
             logger.error(f"Geçersiz renk: {color}")
             return np.zeros(frame.shape[:2], dtype=np.uint8)
 
         # BGR'den HSV'ye dönüştür
         hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
 
-        # Renk aralığını al
-        color_range = self.color_ranges[color]
-        lower = np.array(color_range['lower_hsv'])
-        upper = np.array(color_range['upper_hsv'])
-
-        # Kırmızı renk için özel durum (HSV'de 0 ve 180'de)
-        if color == 'red':
-            lower1 = np.array([0, 120, 70])
-            upper1 = np.array([10, 255, 255])
-            lower2 = np.array([170, 120, 70])
-            upper2 = np.array([180, 255, 255])
-
-            mask1 = cv2.inRange(hsv, lower1, upper1)
-            mask2 = cv2.inRange(hsv, lower2, upper2)
-            mask = cv2.bitwise_or(mask1, mask2)
-        else:
-            mask = cv2.inRange(hsv, lower, upper)
+        return self.mask_from_hsv(hsv, color)
+
+    def mask_from_hsv(self, hsv: np.ndarray, color: str) -> np.ndarray:
+        """
+        HSV görüntüye derlenmiş renk aralıklarını uygula (aynı HSV birden çok parametre setiyle kullanılabilir)
+
+        Args:
+            hsv: HSV görüntü
+            color: 'red', 'green', 'blue'
+
+        Returns:
+            Binary mask
+        """
+        ranges = self.params.bounds[color]
+
+        # Kırmızı için iki aralık
+        mask = cv2.inRange(hsv, ranges[0][0], ranges[0][1])
+        for lower, upper in ranges[1:]:
+            mask = cv2.bitwise_or(mask, cv2.inRange(hsv, lower, upper))
 
         return mask
 
@@ -68,16 +173,67 @@ class ColorFilter:
         Returns:
             İşlenmiş mask
         """
-        kernel = np.ones((self.kernel_size, self.kernel_size), np.uint8)
+        params = self.params
 
         # Opening (erosion + dilation) - küçük gürültüleri temizle
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, iterations=self.iterations)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, params.kernel, iterations=params.iterations)
 
         # Closing (dilation + erosion) - boşlukları doldur
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel, iterations=self.iterations)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, params.kernel, iterations=params.iterations)
 
         return mask
 
+    def _filter_strip(self, frame: np.ndarray, color: str, out: np.ndarray, y0: int, y1: int, halo: int):
+        """
+        [y0, y1) satırlarının maskesini halo payıyla hesapla ve out içine yaz
+
+        Halo satırları komşu şeritlerin morfolojiye etkisini taşır; kırpıldıktan
+        sonra sonuç tam görüntüdeki ile aynıdır.
+        """
+        top = max(y0 - halo, 0)
+        bottom = min(y1 + halo, frame.shape[0])
+
+        mask = self.apply_morphology(self.apply_color_filter(frame[top:bottom], color))
+        out[y0:y1] = mask[y0 - top:y1 - top]
+
+    def compute_mask(self, frame: np.ndarray, color: str) -> np.ndarray:
+        """
+        Renk filtresi + morfoloji maskesi (şerit paralel veya seri)
+
+        Frame yatay şeritlere bölünür, her şerit morfoloji çekirdeği ve iterasyon
+        sayısına göre hesaplanan halo ile kalıcı havuzda işlenir. Çıktı seri yol
+        ile piksel piksel aynıdır.
+
+        Args:
+            frame: BGR formatında giriş görüntüsü
+            color: 'red', 'green', 'blue'
+
+        Returns:
+            İşlenmiş binary mask
+        """
+        params = self.params
+        height = frame.shape[0]
+        n_strips = min(params.workers, height // max(params.min_strip_rows, 1))
+
+        # Halo şerit boyunu aşıyorsa paralellik kazanç getirmez
+        if self.executor is None or n_strips < 2 or params.halo * 2 >= height // n_strips:
+            return self.apply_morphology(self.apply_color_filter(frame, color))
+
+        if color not in params.bounds:
+            logger.error(f"Geçersiz renk: {color}")
+            return np.zeros(frame.shape[:2], dtype=np.uint8)
+
+        out = np.empty(frame.shape[:2], dtype=np.uint8)
+        edges = np.linspace(0, height, n_strips + 1).astype(int)
+        futures = [
+            self.executor.submit(self._filter_strip, frame, color, out, y0, y1, params.halo)
+            for y0, y1 in zip(edges[:-1], edges[1:])
+        ]
+        for future in futures:
+            future.result()
+
+        return out
+
     def find_contours(self, mask: np.ndarray) -> List[np.ndarray]:
         """
         Konturları bul ve filtrele
@@ -91,10 +247,11 @@ class ColorFilter:
         contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
         # Alan filtresi uygula
+        min_area, max_area = self.params.min_area, self.params.max_area
         filtered_contours = []
         for contour in contours:
             area = cv2.contourArea(contour)
-            if self.min_area <= area <= self.max_area:
+            if min_area <= area <= max_area:
                 filtered_contours.append(contour)
 
         return filtered_contours
@@ -116,61 +273,91 @@ class ColorFilter:
             return (cx, cy)
         return (0, 0)
 
-    def process_frame(self, frame: np.ndarray, target_color: str) -> Optional[Dict[str, Any]]:
+    def detect_targets(self, frame: np.ndarray, target_color: str) -> List[Dict[str, Any]]:
         """
-        Frame üzerinde renk filtresi işlemi yap ve hedef bul
+        Frame üzerindeki tüm aday hedefleri bul
 
         Args:
             frame: BGR formatında giriş görüntüsü
             target_color: Hedef renk ('red', 'green', 'blue')
 
         Returns:
-            Hedef bilgileri (merkez, alan, kontur) veya None
+            Alana göre büyükten küçüğe sıralı hedef listesi
         """
-        # Renk filtresi uygula
-        mask = self.apply_color_filter(frame, target_color)
+        # Renk filtresi ve morfolojik işlemler (şerit paralel)
+        mask = self.compute_mask(frame, target_color)
 
-        # Morfolojik işlemler
-        mask = self.apply_morphology(mask)
+        return self.detections_from_mask(mask, target_color)
 
-        # Konturları bul
+    def detections_from_mask(self, mask: np.ndarray, target_color: str) -> List[Dict[str, Any]]:
+        """
+        İşlenmiş maskeden hedef adaylarını çıkar
+
+        Args:
+            mask: Morfoloji uygulanmış binary mask
+            target_color: Hedef renk
+
+        Returns:
+            Alana göre büyükten küçüğe sıralı hedef listesi
+        """
+        # Konturları birleştirilmiş maskede bul; şerit sınırını kesen bloblar tek parça kalır
         contours = self.find_contours(mask)
 
-        if not contours:
+        detections = []
+        for contour in contours:
+            area = cv2.contourArea(contour)
+            center = self.get_target_center(contour)
+
+            # Sınırlayıcı kutu
+            x, y, w, h = cv2.boundingRect(contour)
+
+            detections.append({
+                'center': center,
+                'area': area,
+                'contour': contour,
+                'bounding_box': (x, y, w, h),
+                'mask': mask,
+                'color': target_color
+            })
+
+        detections.sort(key=lambda d: d['area'], reverse=True)
+        return detections
+
+    def process_frame(self, frame: np.ndarray, target_color: str) -> Optional[Dict[str, Any]]:
+        """
+        Frame üzerinde renk filtresi işlemi yap ve hedef bul
+
+        Args:
+            frame: BGR formatında giriş görüntüsü
+            target_color: Hedef renk ('red', 'green', 'blue')
+
+        Returns:
+            Hedef bilgileri (merkez, alan, kontur) veya None
+        """
+        detections = self.detect_targets(frame, target_color)
+
+        if not detections:
             return None
 
         # En büyük konturu seç (en büyük hedef)
-        largest_contour = max(contours, key=cv2.contourArea)
-        area = cv2.contourArea(largest_contour)
-        center = self.get_target_center(largest_contour)
+        result = detections[0]
 
-        # Sınırlayıcı kutu
-        x, y, w, h = cv2.boundingRect(largest_contour)
-
-        result = {
-            'center': center,
-            'area': area,
-            'contour': largest_contour,
-            'bounding_box': (x, y, w, h),
-            'mask': mask,
-            'color': target_color
-        }
-
-        logger.debug(f"{target_color.upper()} hedef bulundu: Merkez={center}, Alan={area:.2f}")
+        logger.debug(f"{target_color.upper()} hedef bulundu: Merkez={result['center']}, Alan={result['area']:.2f}")
         return result
 
-    def draw_detection(self, frame: np.ndarray, detection: Dict[str, Any]) -> np.ndarray:
+    def draw_detection(self, frame: np.ndarray, detection: Dict[str, Any], copy: bool = True) -> np.ndarray:
         """
         Tespit edilen hedefi görüntü üzerine çiz
 
         Args:
             frame: BGR formatında giriş görüntüsü
             detection: Tespit sonucu
+            copy: False ise doğrudan frame üzerine çizilir
 
         Returns:
             İşaretlenmiş görüntü
         """
-        frame_copy = frame.copy()
+        frame_copy = frame.copy() if copy else frame
 
         # Kontur çiz
         cv2.drawContours(frame_copy, [detection['contour']], -1, (0, 255, 0), 3)
@@ -0,0 +1,151 @@
+"""
+Frame Kalite Kontrol Modülü
+Bulanık, aşırı/az pozlanmış veya hızlı dönüş sırasında alınan frame'leri pahalı işlemeden önce eler
+"""
+
+import cv2
+import numpy as np
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+from loguru import logger
+
+
+@dataclass
+class FrameQuality:
+    """Tek frame için kalite ölçümleri"""
+    sharpness: float
+    brightness: float
+    overexposed: float
+    motion_blur: float
+    reason: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.reason is None
+
+
+class FrameQualityGate:
+    """Küçültülmüş kopya üzerinde keskinlik, pozlama ve hareket tahmini ile frame eleme"""
+
+    def __init__(self, config: Dict[str, Any], focal_length: float = 1000.0):
+        self.focal_length = focal_length
+        self.reload(config)
+
+        self.history = deque(maxlen=self.history_size)
+        self.consecutive_skips = 0
+        self.skipped: Dict[str, int] = {}
+        self.total = 0
+
+    def reload(self, config: Dict[str, Any]):
+        """Eşikleri konfigürasyondan yükle"""
+        self.config = config
+        quality_config = config['image_processing']['frame_quality']
+        self.enabled = quality_config['enabled']
+        self.analysis_width = quality_config['analysis_width']
+        self.history_size = quality_config['history']
+        self.sharpness_ratio = quality_config['sharpness_ratio']
+        self.min_sharpness = quality_config['min_sharpness']
+        self.overexposed_level = quality_config['overexposed_level']
+        self.max_overexposed = quality_config['max_overexposed']
+        self.min_brightness = quality_config['min_brightness']
+        self.max_brightness = quality_config['max_brightness']
+        self.exposure_time = quality_config['exposure_time']
+        self.max_motion_blur = quality_config['max_motion_blur']
+        self.max_consecutive_skips = quality_config['max_consecutive_skips']
+
+        if hasattr(self, 'history') and self.history.maxlen != self.history_size:
+            self.history = deque(self.history, maxlen=self.history_size)
+
+    def measure(self, frame: np.ndarray, attitude: Optional[Dict[str, float]] = None) -> FrameQuality:
+        """
+        Frame kalite ölçümlerini hesapla
+
+        Args:
+            frame: BGR görüntü
+            attitude: roll/pitch/yaw hızlarını içeren attitude verisi (rad/s)
+
+        Returns:
+            FrameQuality
+        """
+        h, w = frame.shape[:2]
+        scale = self.analysis_width / w
+        small = cv2.resize(frame, (self.analysis_width, max(int(h * scale), 1)), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+        # Keskinlik: Laplacian varyansı (küçültme ölçeğinde)
+        sharpness = float(cv2.Laplacian(gray, cv2.CV_32F).var())
+
+        # Pozlama: ortalama parlaklık ve doygun piksel oranı
+        hist = cv2.calcHist([gray], [0], None, [256], [0, 256]).ravel()
+        n_pixels = gray.size
+        brightness = float(np.dot(hist, np.arange(256)) / n_pixels)
+        overexposed = float(hist[self.overexposed_level:].sum() / n_pixels)
+
+        # Hareket bulanıklığı: açısal hız x pozlama süresi x odak uzaklığı (tam çözünürlük piksel)
+        motion_blur = 0.0
+        if attitude and 'rollspeed' in attitude:
+            rate = np.hypot(np.hypot(attitude['rollspeed'], attitude['pitchspeed']), attitude['yawspeed'])
+            motion_blur = float(rate * self.exposure_time * self.focal_length)
+
+        return FrameQuality(sharpness, brightness, overexposed, motion_blur)
+
+    def assess(self, frame: np.ndarray, attitude: Optional[Dict[str, float]] = None) -> Tuple[bool, FrameQuality]:
+        """
+        Frame işlenmeye değer mi
+
+        Keskinlik eşiği son frame'lerin medyanına göre uyarlanır; ardışık atlama
+        sayısı sınırı aşılırsa frame kalite düşük olsa da işlenir.
+
+        Args:
+            frame: BGR görüntü
+            attitude: Attitude verisi
+
+        Returns:
+            (işlenmeli mi, kalite ölçümleri)
+        """
+        if not self.enabled:
+            return True, FrameQuality(0.0, 0.0, 0.0, 0.0)
+
+        quality = self.measure(frame, attitude)
+        self.total += 1
+
+        median = float(np.median(self.history)) if len(self.history) >= 5 else 0.0
+        self.history.append(quality.sharpness)
+
+        # Pozlama önce: doygun/karanlık frame'lerde doku olmadığından keskinlik de düşük çıkar
+        if quality.overexposed > self.max_overexposed or quality.brightness > self.max_brightness:
+            quality.reason = 'overexposed'
+        elif quality.brightness < self.min_brightness:
+            quality.reason = 'underexposed'
+        elif quality.motion_blur > self.max_motion_blur:
+            quality.reason = 'motion'
+        elif quality.sharpness < max(self.min_sharpness, self.sharpness_ratio * median):
+            quality.reason = 'blur'
+
+        if quality.ok:
+            self.consecutive_skips = 0
+            return True, quality
+
+        self.consecutive_skips += 1
+        if self.consecutive_skips > self.max_consecutive_skips:
+            # Uzun süre hiç frame işlenmemesini önle
+            self.consecutive_skips = 0
+            return True, quality
+
+        self.skipped[quality.reason] = self.skipped.get(quality.reason, 0) + 1
+        logger.debug(
+            f"Frame atlandı ({quality.reason}): keskinlik {quality.sharpness:.1f}/{median:.1f}, "
+            f"parlaklık {quality.brightness:.0f}, doygun {quality.overexposed:.2f}, hareket {quality.motion_blur:.1f}px"
+        )
+        return False, quality
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Atlama istatistikleri"""
+        skipped = sum(self.skipped.values())
+        return {
+            'frames': self.total,
+            'skipped': skipped,
+            'skip_ratio': skipped / self.total if self.total else 0.0,
+            'by_reason': dict(self.skipped)
+        }
@@ -0,0 +1,140 @@
+"""
+HUD Çizim Modülü
+Statik katmanları çözünürlük başına bir kez hazırlayıp sadece değişen bölgeleri frame'e işler
+"""
+
+import cv2
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+
+
+HUD_COLOR = (0, 255, 0)
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+FONT_SCALE = 0.5
+LINE_HEIGHT = 25
+
+# Bilgi paneli (x1, y1, x2, y2) ve metin başlangıcı
+PANEL_RECT = (10, 10, 400, 150)
+TEXT_ORIGIN = (20, 30)
+
+# Merkez nişangahı
+CROSSHAIR_ARM = 20
+CROSSHAIR_RADIUS = 30
+CROSSHAIR_THICKNESS = 2
+
+
+class HudLayer:
+    """Önceden çizilmiş tek renkli katman; sadece kapladığı pikseller alfa ile karıştırılır"""
+
+    def __init__(self, x: int, y: int, alpha: np.ndarray, color: Tuple[int, int, int]):
+        """
+        Args:
+            x, y: Katmanın frame üzerindeki sol üst köşesi
+            alpha: Katman boyutunda 0-255 örtme maskesi (kenar yumuşatmalı metin dahil)
+            color: BGR renk
+        """
+        ys, xs = np.nonzero(alpha)
+        self.ys = ys + y
+        self.xs = xs + x
+        self.alpha = (alpha[ys, xs].astype(np.float32) / 255.0)[:, None]
+        self.color = np.array(color, dtype=np.float32)
+
+    def apply(self, frame: np.ndarray):
+        pixels = frame[self.ys, self.xs].astype(np.float32)
+        pixels += (self.color - pixels) * self.alpha
+        frame[self.ys, self.xs] = (pixels + 0.5).astype(np.uint8)
+
+
+class HudRenderer:
+    """Bilgi paneli ve nişangahı önbellekli katmanlarla çizen HUD"""
+
+    def __init__(self):
+        self._resolution: Optional[Tuple[int, int]] = None
+        self._crosshair: Optional[HudLayer] = None
+        self._panel_rect: Optional[Tuple[int, int, int, int]] = None
+
+        self._texts: Optional[Tuple[str, ...]] = None
+        self._text_layer: Optional[HudLayer] = None
+
+    def _prepare(self, width: int, height: int):
+        """Çözünürlüğe bağlı statik katmanları hazırla"""
+        self._resolution = (width, height)
+
+        # Nişangah: merkez çevresindeki küçük yama
+        half = CROSSHAIR_RADIUS + CROSSHAIR_THICKNESS
+        cx, cy = width // 2, height // 2
+        x0, y0 = max(cx - half, 0), max(cy - half, 0)
+        x1, y1 = min(cx + half + 1, width), min(cy + half + 1, height)
+
+        mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        c = (cx - x0, cy - y0)
+        cv2.line(mask, (c[0] - CROSSHAIR_ARM, c[1]), (c[0] + CROSSHAIR_ARM, c[1]), 255, CROSSHAIR_THICKNESS)
+        cv2.line(mask, (c[0], c[1] - CROSSHAIR_ARM), (c[0], c[1] + CROSSHAIR_ARM), 255, CROSSHAIR_THICKNESS)
+        cv2.circle(mask, c, CROSSHAIR_RADIUS, 255, CROSSHAIR_THICKNESS)
+
+        self._crosshair = HudLayer(x0, y0, mask, HUD_COLOR)
+
+        # Panel küçük çözünürlüklerde frame içine kırpılır
+        px1, py1, px2, py2 = PANEL_RECT
+        self._panel_rect = (px1, py1, min(px2 + 1, width), min(py2 + 1, height))
+
+        # Metin katmanı yeni panel boyutunda yeniden çizilmeli
+        self._texts = None
+
+    def _render_texts(self, texts: Tuple[str, ...]):
+        """Panel metinlerini panel boyutunda bir maskeye çiz (sadece değerler değişince)"""
+        self._texts = texts
+        x1, y1, x2, y2 = self._panel_rect
+
+        mask = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+        x, y = TEXT_ORIGIN[0] - x1, TEXT_ORIGIN[1] - y1
+        for text in texts:
+            cv2.putText(mask, text, (x, y), FONT, FONT_SCALE, 255, 1)
+            y += LINE_HEIGHT
+
+        self._text_layer = HudLayer(x1, y1, mask, HUD_COLOR)
+
+    @staticmethod
+    def format_texts(sensor_data: Dict[str, Any], decision: Dict[str, Any]) -> Tuple[str, ...]:
+        """Paneldeki satırlar"""
+        texts: List[str] = []
+
+        if sensor_data['gps']:
+            gps = sensor_data['gps']
+            texts.append(f"GPS: {gps['lat']:.6f}, {gps['lon']:.6f}")
+            texts.append(f"Alt: {sensor_data['altitude']:.1f}m")
+
+        texts.append(f"Status: {decision['target_status']}")
+
+        if decision['can_fire']:
+            texts.append(">>> FIRE READY <<<")
+
+        return tuple(texts)
+
+    def render(self, frame: np.ndarray, sensor_data: Dict[str, Any], decision: Dict[str, Any]):
+        """
+        HUD'u frame üzerine yerinde çiz
+
+        Panel arka planı sadece panel bölgesinde yarıya karartılır; metin ve
+        nişangah sadece önceden çizilmiş maskelerin kapladığı piksellerde karıştırılır.
+
+        Args:
+            frame: BGR görüntü (değiştirilir)
+            sensor_data: GPS/irtifa verileri
+            decision: Karar motoru çıktısı
+        """
+        h, w = frame.shape[:2]
+        if self._resolution != (w, h):
+            self._prepare(w, h)
+
+        texts = self.format_texts(sensor_data, decision)
+        if texts != self._texts:
+            self._render_texts(texts)
+
+        # Yarı saydam panel: %50 siyahla karıştırma = değeri yarıya indirme
+        x1, y1, x2, y2 = self._panel_rect
+        panel = frame[y1:y2, x1:x2]
+        np.right_shift(panel, 1, out=panel)
+
+        self._text_layer.apply(frame)
+        self._crosshair.apply(frame)
@@ -0,0 +1,191 @@
+"""
+Hibrit Tespit Modülü
+Renk filtresi ve YOLO'yu aynı frame üzerinde paralel çalıştırıp sonuçlarını birleştirir
+"""
+
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+from loguru import logger
+
+from src.vision.color_filter import ColorFilter
+from src.vision.target_detector import TargetDetector
+from src.vision.target_tracker import detection_to_xyxy, iou_matrix
+
+
+def fuse_detections(
+    color_detections: List[Dict[str, Any]],
+    yolo_detections: List[Dict[str, Any]],
+    iou_threshold: float,
+    color_confidence: float,
+    min_confidence: float
+) -> List[Dict[str, Any]]:
+    """
+    Örtüşen renk ve YOLO kutularını tek tespitte birleştir
+
+    Eşleşen çiftlerde kutu güvenilirlik ağırlıklı ortalama, güven değeri
+    bağımsız kanıt varsayımıyla 1 - (1 - c_renk)(1 - c_yolo) olur. Eşleşmeyen
+    tespitler kendi güven değeriyle kalır ve min_confidence altındakiler atılır.
+
+    Args:
+        color_detections: ColorFilter.detect_targets çıktısı
+        yolo_detections: TargetDetector.detect çıktısının hedef sınıfı
+        iou_threshold: Eşleşme için minimum IoU
+        color_confidence: Renk tespitlerine verilen güven değeri
+        min_confidence: Birleşik tespit için minimum güven
+
+    Returns:
+        Güvene göre büyükten küçüğe sıralı birleşik tespitler
+    """
+    color_boxes = np.array([detection_to_xyxy(d) for d in color_detections], dtype=np.float64).reshape(-1, 4)
+    yolo_boxes = np.array([detection_to_xyxy(d) for d in yolo_detections], dtype=np.float64).reshape(-1, 4)
+
+    # IoU'ya göre açgözlü birebir eşleştirme
+    pairs = []
+    if len(color_boxes) and len(yolo_boxes):
+        iou = iou_matrix(color_boxes, yolo_boxes)
+        for ci, yi in zip(*np.unravel_index(np.argsort(-iou, axis=None), iou.shape)):
+            if iou[ci, yi] < iou_threshold:
+                break
+            if any(ci == c or yi == y for c, y in pairs):
+                continue
+            pairs.append((ci, yi))
+
+    fused = []
+    for ci, yi in pairs:
+        yolo_conf = yolo_detections[yi]['confidence']
+        weights = np.array([color_confidence, yolo_conf])
+        box = (weights @ np.stack([color_boxes[ci], yolo_boxes[yi]])) / weights.sum()
+        fused.append(_make_detection(
+            box,
+            1.0 - (1.0 - color_confidence) * (1.0 - yolo_conf),
+            ('color', 'yolo'),
+            color_detections[ci]
+        ))
+
+    matched_color = {ci for ci, _ in pairs}
+    matched_yolo = {yi for _, yi in pairs}
+
+    for ci, detection in enumerate(color_detections):
+        if ci not in matched_color:
+            fused.append(_make_detection(color_boxes[ci], color_confidence, ('color',), detection))
+
+    for yi, detection in enumerate(yolo_detections):
+        if yi not in matched_yolo:
+            fused.append(_make_detection(yolo_boxes[yi], detection['confidence'], ('yolo',)))
+
+    fused = [d for d in fused if d['confidence'] >= min_confidence]
+    fused.sort(key=lambda d: d['confidence'], reverse=True)
+    return fused
+
+
+def _make_detection(
+    box: np.ndarray,
+    confidence: float,
+    sources: tuple,
+    color_detection: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Birleşik tespit sözlüğü (TargetDetector formatı + kaynak bilgisi)"""
+    x1, y1, x2, y2 = (int(round(v)) for v in box)
+    detection = {
+        'bbox': (x1, y1, x2, y2),
+        'center': ((x1 + x2) // 2, (y1 + y2) // 2),
+        'confidence': float(confidence),
+        'class_name': 'target',
+        'area': (x2 - x1) * (y2 - y1),
+        'sources': sources
+    }
+
+    if color_detection is not None:
+        # Renk konturu ve ağırlık merkezi kutu merkezinden daha hassas
+        detection['center'] = color_detection['center']
+        detection['contour'] = color_detection['contour']
+        detection['color'] = color_detection['color']
+
+    return detection
+
+
+class HybridDetector:
+    """Renk filtresi ve YOLO'yu iş parçacığı havuzunda eş zamanlı çalıştıran tespit sistemi"""
+
+    def __init__(self, config: Dict[str, Any], color_filter: ColorFilter, target_detector: TargetDetector):
+        self.color_filter = color_filter
+        self.target_detector = target_detector
+        self.reload(config)
+
+        # OpenCV ve çıkarım çalışma zamanları GIL'i bıraktığı için iki tespit gerçekten örtüşür
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='hybrid')
+
+        # Son frame'in süre ölçümleri (saniye)
+        self.timings: Dict[str, float] = {}
+
+    def reload(self, config: Dict[str, Any]):
+        """Birleştirme parametrelerini güncelle"""
+        self.config = config
+        hybrid_config = config['image_processing']['hybrid']
+        self.iou_threshold = hybrid_config['iou_threshold']
+        self.color_confidence = hybrid_config['color_confidence']
+        self.min_confidence = hybrid_config['min_confidence']
+
+    def _timed(self, name: str, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def detect(self, frame: np.ndarray, target_color: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        İki tespiti aynı frame üzerinde paralel çalıştır ve birleştir
+
+        Args:
+            frame: BGR formatında giriş görüntüsü
+            target_color: Renk filtresi hedef rengi (None ise sadece YOLO)
+
+        Returns:
+            Birleşik hedef tespitleri
+        """
+        start = time.perf_counter()
+
+        color_future = None
+        if target_color is not None:
+            color_future = self.executor.submit(
+                self._timed, 'color', self.color_filter.detect_targets, frame, target_color
+            )
+
+        yolo_future = None
+        if self.target_detector.model is not None:
+            yolo_future = self.executor.submit(self._timed, 'yolo', self.target_detector.detect, frame)
+
+        try:
+            color_detections = color_future.result() if color_future else []
+        except Exception as e:
+            logger.error(f"Renk filtresi hatası: {e}")
+            color_detections = []
+
+        try:
+            yolo_detections = yolo_future.result() if yolo_future else []
+        except Exception as e:
+            logger.error(f"YOLO tespit hatası: {e}")
+            yolo_detections = []
+
+        targets = [d for d in yolo_detections if d['class_name'] == 'target']
+        fused = fuse_detections(
+            color_detections,
+            targets,
+            self.iou_threshold,
+            self.color_confidence,
+            self.min_confidence
+        )
+
+        self.timings['total'] = time.perf_counter() - start
+        logger.debug(
+            f"Hibrit tespit: {len(color_detections)} renk + {len(targets)} YOLO -> {len(fused)} "
+            f"({self.timings['total'] * 1000:.1f} ms)"
+        )
+        return fused
+
+    def close(self):
+        """İş parçacığı havuzunu kapat"""
+        self.executor.shutdown(wait=True)
@@ -14,18 +14,37 @@ class TargetDetector:
     """YOLOv8 tabanlı hedef tespit sistemi"""
 
     def __init__(self, config: Dict[str, Any]):
-        self.config = config
         self.model_path = config['detection']['model_path']
+        self.model = None
+        self.reload(config)
+
+    def reload(self, config: Dict[str, Any]):
+        """Tespit eşiklerini güncelle (model yeniden yüklenmez)"""
+        self.config = config
         self.confidence_threshold = config['detection']['confidence_threshold']
         self.iou_threshold = config['detection']['iou_threshold']
+        self.input_size = config['detection']['input_size']
         self.classes = config['detection']['classes']
-        self.model = None
 
     def initialize(self) -> bool:
-        """YOLO modelini yükle"""
+        """
+        YOLO modelini yükle ve isteğe bağlı olarak ısıt
+
+        Ana döngüyle eş zamanlı çağrılabilir: model ancak ısınma çıkarımı
+        bittikten sonra self.model'e atanır, o zamana kadar tespit atlanır.
+        """
         try:
-            self.model = YOLO(self.model_path)
+            model = YOLO(self.model_path)
             logger.info(f"YOLO modeli yüklendi: {self.model_path}")
+
+            # İlk çıkarımdaki tembel başlatma ve bellek ayırma ilk frame'e yansımasın
+            if self.config['detection']['warmup']:
+                resolution = self.config['camera']['resolution']
+                frame = np.zeros((resolution['height'], resolution['width'], 3), dtype=np.uint8)
+                model(frame, conf=self.confidence_threshold, iou=self.iou_threshold, imgsz=self.input_size, verbose=False)
+                logger.info("YOLO modeli ısıtıldı")
+
+            self.model = model
             return True
         except Exception as e:
             logger.error(f"YOLO model yükleme hatası: {e}")
@@ -51,6 +70,7 @@ class TargetDetector:
                 frame,
                 conf=self.confidence_threshold,
                 iou=self.iou_threshold,
+                imgsz=self.input_size,
                 verbose=False
             )
 
@@ -88,18 +108,19 @@ class TargetDetector:
             logger.error(f"Tespit hatası: {e}")
             return []
 
-    def draw_detections(self, frame: np.ndarray, detections: List[Dict[str, Any]]) -> np.ndarray:
+    def draw_detections(self, frame: np.ndarray, detections: List[Dict[str, Any]], copy: bool = True) -> np.ndarray:
         """
         Tespitleri görüntü üzerine çiz
 
         Args:
             frame: BGR formatında giriş görüntüsü
             detections: Tespit listesi
+            copy: False ise doğrudan frame üzerine çizilir
 
         Returns:
             İşaretlenmiş görüntü
         """
-        frame_copy = frame.copy()
+        frame_copy = frame.copy() if copy else frame
 
         for det in detections:
             x1, y1, x2, y2 = det['bbox']
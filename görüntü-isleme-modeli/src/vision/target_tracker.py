@@ -0,0 +1,245 @@
+"""
+Çoklu Hedef Takip Modülü
+Frame'ler arası tespitleri kalıcı iz (track) kimlikleriyle eşleştirir
+"""
+
+import numpy as np
+from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from loguru import logger
+
+
+@dataclass
+class Track:
+    """Takip edilen tek bir hedef izi"""
+    track_id: int
+    bbox: np.ndarray  # (x1, y1, x2, y2)
+    confidence: float
+    detection: Dict[str, Any]
+    velocity: np.ndarray = field(default_factory=lambda: np.zeros(2))
+    hits: int = 1
+    age: int = 1
+    time_since_update: int = 0
+
+    @property
+    def center(self) -> tuple:
+        """İz merkezini (x, y) olarak döndür"""
+        return (
+            int((self.bbox[0] + self.bbox[2]) / 2),
+            int((self.bbox[1] + self.bbox[3]) / 2)
+        )
+
+    @property
+    def area(self) -> float:
+        """Kutu alanı (piksel²)"""
+        return float((self.bbox[2] - self.bbox[0]) * (self.bbox[3] - self.bbox[1]))
+
+    def as_detection(self) -> Dict[str, Any]:
+        """Son tespiti iz kimliği ile birlikte döndür"""
+        result = dict(self.detection)
+        result['track_id'] = self.track_id
+        return result
+
+
+def detection_to_xyxy(detection: Dict[str, Any]) -> tuple:
+    """
+    Tespit sözlüğündeki kutuyu (x1, y1, x2, y2) formatına çevir
+
+    Args:
+        detection: ColorFilter ('bounding_box': x, y, w, h) veya
+                   TargetDetector ('bbox': x1, y1, x2, y2) çıktısı
+
+    Returns:
+        (x1, y1, x2, y2) kutu
+    """
+    if 'bbox' in detection:
+        return tuple(detection['bbox'])
+
+    x, y, w, h = detection['bounding_box']
+    return (x, y, x + w, y + h)
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    İki kutu kümesi arasındaki IoU matrisini vektörel hesapla
+
+    Args:
+        boxes_a: (N, 4) xyxy kutular
+        boxes_b: (M, 4) xyxy kutular
+
+    Returns:
+        (N, M) IoU matrisi
+    """
+    x1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    y1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    x2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    y2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+
+    return inter / np.maximum(union, 1e-9)
+
+
+class TargetTracker:
+    """IoU/mesafe maliyet matrisi ve açgözlü atama ile çoklu hedef takibi"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.reload(config)
+
+        self.tracks: List[Track] = []
+        self.next_id = 1
+
+    def reload(self, config: Dict[str, Any]):
+        """Eşleştirme eşiklerini güncelle (mevcut izler korunur)"""
+        self.config = config
+        tracking_config = config['tracking']
+        self.iou_threshold = tracking_config['iou_threshold']
+        self.max_distance = tracking_config['max_distance']
+        self.min_hits = tracking_config['min_hits']
+        self.max_age = tracking_config['max_age']
+
+    def reset(self):
+        """Tüm izleri temizle"""
+        self.tracks = []
+        logger.debug("Hedef izleri sıfırlandı")
+
+    def _cost_matrix(self, track_boxes: np.ndarray, det_boxes: np.ndarray) -> np.ndarray:
+        """
+        İz-tespit maliyet matrisini oluştur
+
+        Örtüşen çiftlerde maliyet 1 - IoU, örtüşmeyen ama yakın çiftlerde
+        1 + mesafe / max_distance; kapı dışındaki çiftler sonsuz.
+        """
+        iou = iou_matrix(track_boxes, det_boxes)
+
+        track_centers = (track_boxes[:, :2] + track_boxes[:, 2:]) / 2
+        det_centers = (det_boxes[:, :2] + det_boxes[:, 2:]) / 2
+        dist = np.linalg.norm(track_centers[:, None, :] - det_centers[None, :, :], axis=2)
+
+        cost = np.where(iou >= self.iou_threshold, 1.0 - iou, 1.0 + dist / self.max_distance)
+        gate = (iou >= self.iou_threshold) | (dist <= self.max_distance)
+        cost[~gate] = np.inf
+
+        return cost
+
+    def _assign(self, cost: np.ndarray) -> List[tuple]:
+        """
+        Maliyet matrisine göre açgözlü atama yap
+
+        Args:
+            cost: (N, M) maliyet matrisi
+
+        Returns:
+            (iz_indeksi, tespit_indeksi) eşleşme listesi
+        """
+        n_valid = int(np.count_nonzero(np.isfinite(cost)))
+        if n_valid == 0:
+            return []
+
+        order = np.argsort(cost, axis=None)[:n_valid]
+        rows, cols = np.unravel_index(order, cost.shape)
+
+        used_rows = set()
+        used_cols = set()
+        matches = []
+        max_matches = min(cost.shape)
+
+        for r, c in zip(rows.tolist(), cols.tolist()):
+            if r in used_rows or c in used_cols:
+                continue
+            used_rows.add(r)
+            used_cols.add(c)
+            matches.append((r, c))
+            if len(matches) == max_matches:
+                break
+
+        return matches
+
+    def update(self, detections: List[Dict[str, Any]]) -> List[Track]:
+        """
+        Yeni frame tespitleriyle izleri güncelle
+
+        Args:
+            detections: Frame'deki tüm aday tespitler
+
+        Returns:
+            Onaylanmış (min_hits'e ulaşmış) canlı izler
+        """
+        det_boxes = np.array(
+            [detection_to_xyxy(d) for d in detections], dtype=np.float64
+        ).reshape(-1, 4)
+
+        matches = []
+        if self.tracks and len(detections):
+            # Sabit hız tahminini tüm izler için tek seferde hesapla
+            boxes = np.array([t.bbox for t in self.tracks])
+            velocities = np.array([t.velocity for t in self.tracks])
+            gaps = np.array([t.time_since_update + 1 for t in self.tracks], dtype=np.float64)
+            track_boxes = boxes + np.tile(velocities * gaps[:, None], 2)
+
+            matches = self._assign(self._cost_matrix(track_boxes, det_boxes))
+
+        matched_tracks = set()
+        matched_dets = set()
+
+        # Eşleşen izleri güncelle
+        if matches:
+            rows, cols = (np.array(i) for i in zip(*matches))
+            old_centers = (boxes[rows, :2] + boxes[rows, 2:]) / 2
+            new_centers = (det_boxes[cols, :2] + det_boxes[cols, 2:]) / 2
+            steps = (new_centers - old_centers) / gaps[rows, None]
+            new_velocities = 0.5 * velocities[rows] + 0.5 * steps
+
+            for k, (ti, di) in enumerate(matches):
+                track = self.tracks[ti]
+                track.bbox = det_boxes[di]
+                track.velocity = new_velocities[k]
+                track.detection = detections[di]
+                track.confidence = detections[di].get('confidence', 1.0)
+                track.hits += 1
+                track.age += 1
+                track.time_since_update = 0
+
+                matched_tracks.add(ti)
+                matched_dets.add(di)
+
+        # Eşleşmeyen izleri yaşlandır, ölenleri çıkar
+        alive = []
+        for t_idx, track in enumerate(self.tracks):
+            if t_idx not in matched_tracks:
+                track.age += 1
+                track.time_since_update += 1
+
+                # Onaylanmamış iz ilk kaçırmada, onaylı iz max_age sonunda ölür
+                if track.hits < self.min_hits or track.time_since_update > self.max_age:
+                    logger.debug(f"İz silindi: #{track.track_id}")
+                    continue
+
+            alive.append(track)
+
+        # Eşleşmeyen tespitlerden yeni izler doğur
+        for d_idx, detection in enumerate(detections):
+            if d_idx in matched_dets:
+                continue
+
+            alive.append(Track(
+                track_id=self.next_id,
+                bbox=det_boxes[d_idx],
+                confidence=detection.get('confidence', 1.0),
+                detection=detection
+            ))
+            self.next_id += 1
+
+        self.tracks = alive
+
+        return [t for t in self.tracks if t.hits >= self.min_hits]
+
+    def get_track(self, track_id: int) -> Optional[Track]:
+        """Kimliği verilen canlı izi döndür"""
+        for track in self.tracks:
+            if track.track_id == track_id:
+                return track
+        return None
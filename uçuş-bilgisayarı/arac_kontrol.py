@@ -0,0 +1,390 @@
+"""
+Asenkron Araç Kontrol Modülü
+MAVLink mesajlarıyla tetiklenen, zaman aşımı destekli asyncio araç komutları
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Görev protokolü alanları (mission_type vb.) MAVLink 2 gerektirir
+os.environ.setdefault('MAVLINK20', '1')
+
+from pymavlink import mavutil  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+mavlink = mavutil.mavlink
+
+# Araç olarak kabul edilmeyen heartbeat kaynakları
+_NON_VEHICLE_TYPES = (
+    mavlink.MAV_TYPE_GCS,
+    mavlink.MAV_TYPE_ONBOARD_CONTROLLER,
+    mavlink.MAV_TYPE_GIMBAL,
+    mavlink.MAV_TYPE_ADSB
+)
+
+
+class CommandError(Exception):
+    """Otopilot komutu reddetti veya yanıt vermedi"""
+
+
+class _Waiter:
+    """Belirli mesaj tiplerinde koşul sağlanınca tamamlanan bekleme kaydı"""
+
+    __slots__ = ('types', 'condition', 'future')
+
+    def __init__(self, types: Tuple[str, ...], condition: Callable[[Any], bool], future: asyncio.Future):
+        self.types = types
+        self.condition = condition
+        self.future = future
+
+
+class Vehicle:
+    """Tek MAVLink bağlantısı üzerinden eşzamanlı görevlerin kullanabildiği araç"""
+
+    def __init__(self, connection_string: str, source_system: int = 255,
+                 source_component: int = mavlink.MAV_COMP_ID_ONBOARD_COMPUTER2, heartbeat_timeout: float = 3.0):
+        self.connection_string = connection_string
+        self.source_system = source_system
+        # Yönlendiricide görüntü işlemeden (191) ayrılabilmek için kendi bileşen kimliği
+        self.source_component = source_component
+        self.heartbeat_timeout = heartbeat_timeout
+
+        self.connection = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Son telemetri durumu (sadece olay döngüsü iş parçacığında güncellenir)
+        self.system_id = 0
+        self.component_id = 0
+        self.vehicle_type = None
+        self.is_armed = False
+        self.mode_name = 'UNKNOWN'
+        self.system_status = mavlink.MAV_STATE_UNINIT
+        self.gps_fix = 0
+        self.location: Optional[Dict[str, float]] = None
+        self.relative_altitude = 0.0
+        self.airspeed = 0.0
+        self.last_heartbeat = 0.0
+
+        self._listeners: Dict[str, List[Callable]] = {}
+        self._waiters: List[_Waiter] = []
+        self._reader = None
+        self._running = threading.Event()
+
+    @property
+    def is_connected(self) -> bool:
+        """Son heartbeat zaman aşımı süresi içinde mi geldi"""
+        return self.system_id != 0 and time.monotonic() - self.last_heartbeat < self.heartbeat_timeout
+
+    @property
+    def is_armable(self) -> bool:
+        """3B GPS fix'i var ve otopilot başlatmayı bitirdi mi"""
+        return self.gps_fix >= 3 and self.system_status in (mavlink.MAV_STATE_STANDBY, mavlink.MAV_STATE_ACTIVE)
+
+    async def connect(self, timeout: float = 30.0):
+        """
+        Bağlantıyı aç ve ilk araç heartbeat'ini bekle
+
+        Args:
+            timeout: Heartbeat bekleme süresi (s)
+
+        Raises:
+            asyncio.TimeoutError: Süre içinde heartbeat gelmezse
+        """
+        self.loop = asyncio.get_running_loop()
+        self.connection = await self.loop.run_in_executor(
+            None,
+            lambda: mavutil.mavlink_connection(
+                self.connection_string,
+                source_system=self.source_system,
+                source_component=self.source_component
+            )
+        )
+
+        self._running.set()
+        self._reader = threading.Thread(target=self._read_loop, name='mavlink-reader', daemon=True)
+        self._reader.start()
+
+        # UDP istemci bağlantılarında otopilot ilk paketi görene kadar yayın yapmaz
+        self.connection.mav.heartbeat_send(mavlink.MAV_TYPE_GCS, mavlink.MAV_AUTOPILOT_INVALID, 0, 0, 0)
+
+        await self.wait_until(lambda: self.system_id != 0, ('HEARTBEAT',), timeout)
+        logger.info(f"Araç bağlandı: sistem {self.system_id}, mod {self.mode_name}")
+
+    def close(self):
+        """Okuma iş parçacığını durdur ve bağlantıyı kapat"""
+        self._running.clear()
+        if self._reader is not None:
+            self._reader.join(timeout=2)
+            self._reader = None
+
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+        for waiter in self._waiters:
+            if not waiter.future.done():
+                waiter.future.cancel()
+        self._waiters.clear()
+
+    def _read_loop(self):
+        """Bloklayan okumayı ayrı iş parçacığında yapıp mesajları olay döngüsüne aktar"""
+        while self._running.is_set():
+            try:
+                msg = self.connection.recv_match(blocking=True, timeout=0.5)
+            except Exception as e:
+                if self._running.is_set():
+                    logger.error(f"MAVLink okuma hatası: {e}")
+                    time.sleep(0.1)
+                continue
+
+            if msg is None or msg.get_type() == 'BAD_DATA':
+                continue
+
+            try:
+                self.loop.call_soon_threadsafe(self._dispatch, msg)
+            except RuntimeError:
+                # Olay döngüsü kapandı
+                break
+
+    def _dispatch(self, msg):
+        """Durumu güncelle, dinleyicileri çağır ve koşulu sağlanan beklemeleri tamamla"""
+        msg_type = msg.get_type()
+
+        if msg_type == 'HEARTBEAT':
+            if msg.type in _NON_VEHICLE_TYPES:
+                return
+            if self.system_id == 0:
+                self.system_id = msg.get_srcSystem()
+                self.component_id = msg.get_srcComponent()
+                self.connection.target_system = self.system_id
+                self.connection.target_component = self.component_id
+            elif msg.get_srcSystem() != self.system_id:
+                return
+        elif self.system_id and msg.get_srcSystem() != self.system_id:
+            return
+
+        self._update_state(msg_type, msg)
+
+        for callback in self._listeners.get(msg_type, ()):
+            try:
+                callback(msg)
+            except Exception as e:
+                logger.error(f"Mesaj dinleyici hatası ({msg_type}): {e}")
+
+        if not self._waiters:
+            return
+
+        remaining = []
+        for waiter in self._waiters:
+            if waiter.future.done():
+                continue
+            if msg_type in waiter.types:
+                try:
+                    if waiter.condition(msg):
+                        waiter.future.set_result(msg)
+                        continue
+                except Exception as e:
+                    waiter.future.set_exception(e)
+                    continue
+            remaining.append(waiter)
+        self._waiters = remaining
+
+    def _update_state(self, msg_type: str, msg):
+        """Telemetri durumunu mesajdan güncelle"""
+        if msg_type == 'HEARTBEAT':
+            self.vehicle_type = msg.type
+            self.is_armed = bool(msg.base_mode & mavlink.MAV_MODE_FLAG_SAFETY_ARMED)
+            self.mode_name = mavutil.mode_string_v10(msg)
+            self.system_status = msg.system_status
+            self.last_heartbeat = time.monotonic()
+        elif msg_type == 'GLOBAL_POSITION_INT':
+            self.location = {
+                'lat': msg.lat / 1e7,
+                'lon': msg.lon / 1e7,
+                'alt': msg.alt / 1000.0
+            }
+            self.relative_altitude = msg.relative_alt / 1000.0
+        elif msg_type == 'GPS_RAW_INT':
+            self.gps_fix = msg.fix_type
+        elif msg_type == 'VFR_HUD':
+            self.airspeed = msg.airspeed
+
+    def on(self, msg_type: str, callback: Callable[[Any], None]):
+        """
+        Mesaj tipi için dinleyici kaydet
+
+        Args:
+            msg_type: MAVLink mesaj tipi
+            callback: Mesajı alan fonksiyon (olay döngüsünde çağrılır)
+        """
+        self._listeners.setdefault(msg_type, []).append(callback)
+
+    def off(self, msg_type: str, callback: Callable[[Any], None]):
+        """Dinleyici kaydını sil"""
+        callbacks = self._listeners.get(msg_type, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    async def wait_message(
+        self,
+        msg_type,
+        condition: Optional[Callable[[Any], bool]] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Koşulu sağlayan bir sonraki mesajı bekle
+
+        Args:
+            msg_type: Mesaj tipi veya tipler listesi
+            condition: Mesajı kabul eden fonksiyon (None ise ilk mesaj)
+            timeout: Zaman aşımı (s), None ise süresiz
+
+        Returns:
+            Mesaj
+
+        Raises:
+            asyncio.TimeoutError: Süre dolarsa
+        """
+        types = (msg_type,) if isinstance(msg_type, str) else tuple(msg_type)
+        future = self.loop.create_future()
+        self._waiters.append(_Waiter(types, condition or (lambda msg: True), future))
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            # Zaman aşımı veya iptalde kayıt bir sonraki mesajda temizlenir
+            future.cancel()
+
+    async def wait_until(self, predicate: Callable[[], bool], msg_types: Tuple[str, ...], timeout: Optional[float] = None):
+        """
+        Durum koşulu sağlanana kadar bekle; koşul şu an sağlanıyorsa hemen döner
+
+        Args:
+            predicate: Araç durumunu kontrol eden fonksiyon
+            msg_types: Durumu değiştirebilen mesaj tipleri
+            timeout: Zaman aşımı (s)
+        """
+        if predicate():
+            return
+        await self.wait_message(msg_types, lambda msg: predicate(), timeout)
+
+    async def armed(self, timeout: Optional[float] = None):
+        """Araç arm edilene kadar bekle"""
+        await self.wait_until(lambda: self.is_armed, ('HEARTBEAT',), timeout)
+
+    async def disarmed(self, timeout: Optional[float] = None):
+        """Araç disarm edilene kadar bekle"""
+        await self.wait_until(lambda: not self.is_armed, ('HEARTBEAT',), timeout)
+
+    async def armable(self, timeout: Optional[float] = None):
+        """GPS ve otopilot arm için hazır olana kadar bekle"""
+        await self.wait_until(lambda: self.is_armable, ('HEARTBEAT', 'GPS_RAW_INT'), timeout)
+
+    async def mode(self, name: str, timeout: Optional[float] = None):
+        """
+        Uçuş modu verilen moda geçene kadar bekle
+
+        Args:
+            name: Mod adı (ör. 'GUIDED')
+            timeout: Zaman aşımı (s)
+        """
+        await self.wait_until(lambda: self.mode_name == name, ('HEARTBEAT',), timeout)
+
+    async def altitude_at_least(self, altitude: float, timeout: Optional[float] = None):
+        """
+        Göreli irtifa verilen değere ulaşana kadar bekle
+
+        Args:
+            altitude: Eve göre irtifa (m)
+            timeout: Zaman aşımı (s)
+        """
+        await self.wait_until(lambda: self.relative_altitude >= altitude, ('GLOBAL_POSITION_INT',), timeout)
+
+    async def command(self, command: int, *params: float, timeout: float = 3.0, retries: int = 3) -> int:
+        """
+        COMMAND_LONG gönder ve COMMAND_ACK bekle; yanıt gelmezse tekrar dene
+
+        Args:
+            command: MAV_CMD değeri
+            *params: En fazla 7 komut parametresi
+            timeout: Her deneme için ACK bekleme süresi (s)
+            retries: Deneme sayısı
+
+        Returns:
+            MAV_RESULT değeri
+
+        Raises:
+            CommandError: Komut reddedilirse veya ACK gelmezse
+        """
+        values = list(params) + [0] * (7 - len(params))
+
+        for confirmation in range(retries):
+            self.connection.mav.command_long_send(
+                self.system_id,
+                self.component_id,
+                command,
+                confirmation,
+                *values
+            )
+
+            try:
+                ack = await self.wait_message(
+                    'COMMAND_ACK',
+                    lambda msg: msg.command == command and msg.result != mavlink.MAV_RESULT_IN_PROGRESS,
+                    timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"Komut {command} için ACK gelmedi (deneme {confirmation + 1}/{retries})")
+                continue
+
+            if ack.result not in (mavlink.MAV_RESULT_ACCEPTED,):
+                raise CommandError(f"Komut {command} reddedildi: sonuç {ack.result}")
+            return ack.result
+
+        raise CommandError(f"Komut {command} yanıtsız kaldı")
+
+    async def arm(self, timeout: float = 10.0):
+        """Arm komutu gönder ve arm durumunu bekle"""
+        await self.command(mavlink.MAV_CMD_COMPONENT_ARM_DISARM, 1)
+        await self.armed(timeout)
+
+    async def disarm(self, timeout: float = 10.0):
+        """Disarm komutu gönder ve disarm durumunu bekle"""
+        await self.command(mavlink.MAV_CMD_COMPONENT_ARM_DISARM, 0)
+        await self.disarmed(timeout)
+
+    async def set_mode(self, name: str, timeout: float = 5.0):
+        """
+        Uçuş modunu değiştir ve heartbeat'te görünmesini bekle
+
+        Args:
+            name: Mod adı (ör. 'TAKEOFF', 'GUIDED', 'RTL')
+            timeout: Zaman aşımı (s)
+
+        Raises:
+            CommandError: Mod bu araç tipi için tanımlı değilse
+        """
+        mode_map = mavutil.mode_mapping_byname(self.vehicle_type)
+        if not mode_map or name not in mode_map:
+            raise CommandError(f"Bilinmeyen mod: {name}")
+
+        await self.command(
+            mavlink.MAV_CMD_DO_SET_MODE,
+            mavlink.MAV_MODE_FLAG_CUSTOM_MODE_ENABLED,
+            mode_map[name]
+        )
+        await self.mode(name, timeout)
+
+    async def set_airspeed(self, speed: float):
+        """
+        Hedef hava hızını ayarla
+
+        Args:
+            speed: Hava hızı (m/s)
+        """
+        await self.command(mavlink.MAV_CMD_DO_CHANGE_SPEED, 0, speed, -1)
@@ -0,0 +1,355 @@
+"""
+Görev Yükleme Modülü
+MAVLink görev protokolüyle toplu/kısmi rota yükleme ve görev ilerleme takibi
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+# Görev protokolü alanları (mission_type vb.) MAVLink 2 gerektirir
+os.environ.setdefault('MAVLINK20', '1')
+
+from pymavlink import mavutil  # noqa: E402
+
+from arac_kontrol import Vehicle, CommandError
+
+logger = logging.getLogger(__name__)
+
+mavlink = mavutil.mavlink
+
+
+class MissionError(Exception):
+    """Görev aktarımı başarısız"""
+
+
+@dataclass
+class MissionItem:
+    """Tek görev adımı (varsayılan: göreli irtifalı ara nokta)"""
+    lat: float
+    lon: float
+    alt: float
+    command: int = mavlink.MAV_CMD_NAV_WAYPOINT
+    param1: float = 0.0
+    param2: float = 0.0
+    param3: float = 0.0
+    param4: float = 0.0
+    frame: int = mavlink.MAV_FRAME_GLOBAL_RELATIVE_ALT_INT
+    autocontinue: int = 1
+
+
+class Mission:
+    """Araç üzerindeki görev listesini yükleyen ve ilerlemesini izleyen yönetici"""
+
+    def __init__(
+        self,
+        vehicle: Vehicle,
+        item_timeout: float = 1.5,
+        retries: int = 5,
+        mission_type: int = mavlink.MAV_MISSION_TYPE_MISSION
+    ):
+        self.vehicle = vehicle
+        self.item_timeout = item_timeout
+        self.retries = retries
+        self.mission_type = mission_type
+
+        # Araçtaki görev listesi (seq -> MissionItem); sıfırıncı adım ArduPilot'ta ev konumudur
+        self.items: Dict[int, MissionItem] = {}
+        self.current_seq = 0
+        self.reached: List[int] = []
+        self._progress_callbacks: List[Callable[[int, int], None]] = []
+
+        vehicle.on('MISSION_ITEM_REACHED', self._on_item_reached)
+        vehicle.on('MISSION_CURRENT', self._on_current)
+
+    @property
+    def count(self) -> int:
+        return len(self.items)
+
+    def _on_item_reached(self, msg):
+        self.reached.append(msg.seq)
+        logger.info(f"Görev adımı tamamlandı: {msg.seq}/{self.count - 1}")
+        for callback in self._progress_callbacks:
+            callback(msg.seq, self.count)
+
+    def _on_current(self, msg):
+        self.current_seq = msg.seq
+
+    def on_progress(self, callback: Callable[[int, int], None]):
+        """
+        Her MISSION_ITEM_REACHED mesajında çağrılacak fonksiyonu kaydet
+
+        Args:
+            callback: (ulaşılan seq, toplam adım) alan fonksiyon
+        """
+        self._progress_callbacks.append(callback)
+
+    async def wait_reached(self, seq: int, timeout: Optional[float] = None):
+        """
+        Verilen görev adımına ulaşılana kadar bekle
+
+        Args:
+            seq: Görev adımı sırası
+            timeout: Zaman aşımı (s)
+        """
+        await self.vehicle.wait_until(lambda: seq in self.reached, ('MISSION_ITEM_REACHED',), timeout)
+
+    def _encode(self, seq: int, item: MissionItem):
+        """Görev adımını gönderime hazır MISSION_ITEM_INT mesajına çevir"""
+        return self.vehicle.connection.mav.mission_item_int_encode(
+            self.vehicle.system_id,
+            self.vehicle.component_id,
+            seq,
+            item.frame,
+            item.command,
+            0,
+            item.autocontinue,
+            item.param1,
+            item.param2,
+            item.param3,
+            item.param4,
+            int(round(item.lat * 1e7)),
+            int(round(item.lon * 1e7)),
+            item.alt,
+            self.mission_type
+        )
+
+    async def upload(self, items: List[MissionItem]):
+        """
+        Tüm görev listesini yükle (MISSION_COUNT ile başlar, araç adımları ister)
+
+        Args:
+            items: Sıfırıncı adım (ev) dahil görev adımları
+
+        Raises:
+            MissionError: Araç reddederse veya yanıt vermezse
+        """
+        mav = self.vehicle.connection.mav
+        start = mav.mission_count_encode(
+            self.vehicle.system_id,
+            self.vehicle.component_id,
+            len(items),
+            self.mission_type
+        )
+
+        new_items = dict(enumerate(items))
+        await self._transfer(start, new_items)
+        self.items = new_items
+        self.reached.clear()
+        logger.info(f"Görev yüklendi: {len(items)} adım")
+
+    async def update(self, start_seq: int, items: List[MissionItem]):
+        """
+        Mevcut görevin bir bölümünü değiştir (MISSION_WRITE_PARTIAL_LIST)
+
+        Args:
+            start_seq: Değiştirilecek ilk adım
+            items: Yeni adımlar; mevcut görevin sonunu aşamaz
+
+        Raises:
+            MissionError: Aralık geçersizse veya araç reddederse
+        """
+        end_seq = start_seq + len(items) - 1
+        if not items or start_seq < 0 or end_seq >= self.count:
+            raise MissionError(f"Geçersiz kısmi güncelleme aralığı: {start_seq}-{end_seq} (görev {self.count} adım)")
+
+        mav = self.vehicle.connection.mav
+        start = mav.mission_write_partial_list_encode(
+            self.vehicle.system_id,
+            self.vehicle.component_id,
+            start_seq,
+            end_seq,
+            self.mission_type
+        )
+
+        new_items = {start_seq + i: item for i, item in enumerate(items)}
+        await self._transfer(start, new_items)
+        self.items.update(new_items)
+        logger.info(f"Görev güncellendi: adım {start_seq}-{end_seq}")
+
+    async def _transfer(self, start_msg, items: Dict[int, MissionItem]):
+        """
+        Başlatma mesajını gönder ve aracın adım isteklerini MISSION_ACK gelene kadar yanıtla
+
+        Mesajlar önceden kodlanır; istek gelir gelmez aynı olay döngüsü adımında
+        yanıtlanır. Araç sessiz kalırsa son gönderilen mesaj tekrarlanır.
+        """
+        vehicle = self.vehicle
+        encoded = {seq: self._encode(seq, item) for seq, item in items.items()}
+        state = {'last_seq': None, 'last_request': time.monotonic(), 'failures': 0}
+
+        def on_request(msg):
+            if getattr(msg, 'mission_type', 0) != self.mission_type:
+                return
+            packet = encoded.get(msg.seq)
+            if packet is None:
+                logger.warning(f"Araç aralık dışı görev adımı istedi: {msg.seq}")
+                return
+            vehicle.connection.mav.send(packet)
+            state['last_seq'] = msg.seq
+            state['last_request'] = time.monotonic()
+            state['failures'] = 0
+
+        vehicle.on('MISSION_REQUEST_INT', on_request)
+        vehicle.on('MISSION_REQUEST', on_request)
+
+        try:
+            vehicle.connection.mav.send(start_msg)
+
+            while True:
+                try:
+                    ack = await vehicle.wait_message(
+                        'MISSION_ACK',
+                        lambda msg: getattr(msg, 'mission_type', 0) == self.mission_type,
+                        self.item_timeout
+                    )
+                except asyncio.TimeoutError:
+                    # İstekler akmaya devam ediyorsa aktarım sürüyor demektir
+                    if time.monotonic() - state['last_request'] < self.item_timeout:
+                        continue
+
+                    # Deneme sayacı araç her yeni adım istediğinde sıfırlanır
+                    state['failures'] += 1
+                    if state['failures'] > self.retries:
+                        raise MissionError("Görev aktarımı zaman aşımına uğradı")
+
+                    logger.warning(f"Görev aktarımında yanıt yok, tekrar deneniyor ({state['failures']}/{self.retries})")
+                    if state['last_seq'] is None:
+                        vehicle.connection.mav.send(start_msg)
+                    else:
+                        vehicle.connection.mav.send(encoded[state['last_seq']])
+                    state['last_request'] = time.monotonic()
+                    continue
+
+                if ack.type != mavlink.MAV_MISSION_ACCEPTED:
+                    raise MissionError(f"Görev reddedildi: MAV_MISSION_RESULT {ack.type}")
+                return
+        finally:
+            vehicle.off('MISSION_REQUEST_INT', on_request)
+            vehicle.off('MISSION_REQUEST', on_request)
+
+    async def clear(self):
+        """Araçtaki görevi sil"""
+        self.vehicle.connection.mav.mission_clear_all_send(
+            self.vehicle.system_id,
+            self.vehicle.component_id,
+            self.mission_type
+        )
+        ack = await self.vehicle.wait_message(
+            'MISSION_ACK',
+            lambda msg: getattr(msg, 'mission_type', 0) == self.mission_type,
+            self.item_timeout * self.retries
+        )
+        if ack.type != mavlink.MAV_MISSION_ACCEPTED:
+            raise MissionError(f"Görev silinemedi: MAV_MISSION_RESULT {ack.type}")
+
+        self.items = {}
+        self.reached.clear()
+
+    async def set_current(self, seq: int):
+        """
+        Aktif görev adımını değiştir
+
+        Args:
+            seq: Yeni aktif adım
+        """
+        try:
+            await self.vehicle.command(mavlink.MAV_CMD_DO_SET_MISSION_CURRENT, seq)
+        except CommandError:
+            # Komutu desteklemeyen eski otopilotlar için MISSION_SET_CURRENT
+            self.vehicle.connection.mav.mission_set_current_send(
+                self.vehicle.system_id,
+                self.vehicle.component_id,
+                seq
+            )
+        await self.vehicle.wait_until(lambda: self.current_seq == seq, ('MISSION_CURRENT',), self.item_timeout * self.retries)
+
+    async def start(self):
+        """Görevi AUTO modda başlat"""
+        await self.vehicle.set_mode('AUTO')
+
+
+def _expect(condition: bool, message: str):
+    if not condition:
+        raise AssertionError(message)
+
+
+async def selftest(port: int = 14590):
+    """
+    Simüle araca rota yükle, kısmen güncelle, aktif adımı değiştir, ilerlemeyi bekle ve sil
+
+    Araçtaki görev ve araca gelen adım sayıları (her adım bir istek/yanıt turu) doğrulanır.
+
+    Args:
+        port: Simüle aracın dinlediği yerel UDP portu
+
+    Raises:
+        AssertionError: Araçtaki durum beklenenden farklıysa
+    """
+    from sim_arac import SimulatedVehicle, CirclePath, _offset
+
+    home = (39.9255, 32.8368)
+    sim = SimulatedVehicle([f'udpin:127.0.0.1:{port}'], CirclePath(home, speed=25.0))
+    sim.start()
+    vehicle = Vehicle(f'udpout:127.0.0.1:{port}')
+
+    try:
+        await vehicle.connect(timeout=10)
+        mission = Mission(vehicle)
+
+        # Ev + kuzeye 60 m aralıklı dört ara nokta
+        route = [MissionItem(home[0], home[1], 0.0)] + [
+            MissionItem(*_offset(home[0], home[1], 60.0 * i, 0.0), 50.0) for i in range(1, 5)
+        ]
+        await mission.upload(route)
+        _expect(sorted(sim.mission) == list(range(5)), f"Araçtaki görev adımları: {sorted(sim.mission)}")
+        _expect(len(sim.commands('MISSION_ITEM_INT')) == 5, "Yükleme 5 adım turunda bitmeli")
+        _expect(len(sim.commands('MISSION_COUNT')) == 1, "MISSION_COUNT tekrarlanmamalı")
+
+        # Sadece 2. ve 3. adımlar değişir
+        changed = [MissionItem(*_offset(home[0], home[1], 60.0 * i, 30.0), 60.0) for i in (2, 3)]
+        await mission.update(2, changed)
+        for seq, item in zip((2, 3), changed):
+            _expect(sim.mission[seq].x == int(round(item.lat * 1e7)), f"Adım {seq} güncellenmedi")
+            _expect(sim.mission[seq].z == 60.0, f"Adım {seq} irtifası güncellenmedi")
+        _expect(sim.mission[4].z == 50.0, "Güncelleme aralığı dışındaki adım değişti")
+        _expect(len(sim.commands('MISSION_ITEM_INT')) == 7, "Kısmi güncelleme 2 adım turunda bitmeli")
+
+        await mission.start()
+        await vehicle.arm()
+        await mission.wait_reached(1, timeout=30)
+
+        await mission.set_current(3)
+        _expect(sim.mission_current == 3, f"Araçtaki aktif adım: {sim.mission_current}")
+        await mission.wait_reached(3, timeout=30)
+        reached = list(mission.reached)
+
+        await mission.clear()
+        _expect(not sim.mission, "Görev silinmedi")
+        print(f"Görev öz testi başarılı: ulaşılan adımlar {reached}")
+    finally:
+        vehicle.close()
+        sim.stop()
+
+
+def main():
+    """Görev protokolünü komut satırından simüle araca karşı dene"""
+    parser = argparse.ArgumentParser(description='Görev yükleme modülü')
+    parser.add_argument('--selftest', action='store_true', help='Simüle araca karşı yükleme/güncelleme/ilerleme testi')
+    parser.add_argument('--port', type=int, default=14590, help='Öz test için yerel UDP portu')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    if args.selftest:
+        asyncio.run(selftest(args.port))
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
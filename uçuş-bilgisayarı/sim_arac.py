@@ -0,0 +1,553 @@
+"""
+Simüle MAVLink Aracı
+Senaryolu uçuş yolunda telemetri yayınlayan, komutları kaydeden yerel test aracı (SITL yerine)
+"""
+
+import argparse
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Görev protokolü alanları (mission_type vb.) MAVLink 2 gerektirir
+os.environ.setdefault('MAVLINK20', '1')
+
+from pymavlink import mavutil  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+mavlink = mavutil.mavlink
+
+EARTH_RADIUS = 6378137.0  # metre
+GRAVITY = 9.80665
+
+# Varsayılan yayın hızları (Hz)
+DEFAULT_RATES = {
+    'HEARTBEAT': 1.0,
+    'SYS_STATUS': 1.0,
+    'GPS_RAW_INT': 2.0,
+    'GLOBAL_POSITION_INT': 10.0,
+    'ATTITUDE': 20.0,
+    'VFR_HUD': 5.0,
+    'MISSION_CURRENT': 1.0
+}
+
+# REQUEST_DATA_STREAM akışlarının ArduPilot'taki mesaj grupları
+DATA_STREAMS = {
+    mavlink.MAV_DATA_STREAM_EXTENDED_STATUS: ('SYS_STATUS', 'GPS_RAW_INT', 'MISSION_CURRENT'),
+    mavlink.MAV_DATA_STREAM_POSITION: ('GLOBAL_POSITION_INT',),
+    mavlink.MAV_DATA_STREAM_EXTRA1: ('ATTITUDE',),
+    mavlink.MAV_DATA_STREAM_EXTRA2: ('VFR_HUD',)
+}
+
+# ArduPlane mod numaraları
+MODES = mavutil.mode_mapping_byname(mavlink.MAV_TYPE_FIXED_WING)
+
+
+def _offset(lat: float, lon: float, north: float, east: float) -> Tuple[float, float]:
+    """Noktayı kuzey/doğu metre kadar kaydır"""
+    lat2 = lat + math.degrees(north / EARTH_RADIUS)
+    lon2 = lon + math.degrees(east / (EARTH_RADIUS * math.cos(math.radians(lat))))
+    return lat2, lon2
+
+
+@dataclass
+class PathSample:
+    """Uçuş yolunun belirli andaki durumu"""
+    lat: float
+    lon: float
+    alt: float
+    heading: float  # radyan, kuzeyden saat yönünde
+    roll: float
+    speed: float
+    index: Optional[int] = None  # Ara nokta yolunda hedeflenen nokta
+
+
+class CirclePath:
+    """Merkez etrafında sabit hız ve irtifada dairesel uçuş"""
+
+    def __init__(self, center: Tuple[float, float], radius: float = 150.0, altitude: float = 50.0, speed: float = 18.0):
+        self.center = center
+        self.radius = radius
+        self.altitude = altitude
+        self.speed = speed
+
+    def sample(self, t: float) -> PathSample:
+        angle = self.speed * t / self.radius
+        lat, lon = _offset(self.center[0], self.center[1], self.radius * math.cos(angle), self.radius * math.sin(angle))
+        return PathSample(
+            lat=lat,
+            lon=lon,
+            alt=self.altitude,
+            heading=(angle + math.pi / 2) % (2 * math.pi),
+            roll=math.atan(self.speed ** 2 / (GRAVITY * self.radius)),
+            speed=self.speed
+        )
+
+
+class WaypointPath:
+    """Ara noktalar arasında düz çizgilerle uçuş (son noktadan sonra başa döner)"""
+
+    def __init__(self, waypoints: List[Tuple[float, float, float]], speed: float = 18.0, loop: bool = True):
+        self.waypoints = waypoints
+        self.speed = speed
+        self.loop = loop
+
+        # Her bacağın başlangıç noktasına göre yerel uzunluğu
+        lat0, lon0 = waypoints[0][:2]
+        self._local = [
+            (math.radians(lat - lat0) * EARTH_RADIUS, math.radians(lon - lon0) * EARTH_RADIUS * math.cos(math.radians(lat0)))
+            for lat, lon, _ in waypoints
+        ]
+        legs = list(zip(range(len(waypoints)), range(1, len(waypoints))))
+        if loop and len(waypoints) > 2:
+            legs.append((len(waypoints) - 1, 0))
+        self.legs = legs
+        self.lengths = [max(math.dist(self._local[a], self._local[b]), 1e-6) for a, b in legs]
+        self.total = sum(self.lengths) if self.lengths else 0.0
+
+    def sample(self, t: float) -> PathSample:
+        if not self.legs:
+            lat, lon, alt = self.waypoints[0]
+            return PathSample(lat, lon, alt, 0.0, 0.0, 0.0, 0)
+
+        distance = self.speed * t
+        distance = distance % self.total if self.loop else min(distance, self.total - 1e-6)
+
+        for (a, b), length in zip(self.legs, self.lengths):
+            if distance <= length:
+                break
+            distance -= length
+
+        f = min(distance / length, 1.0)
+        (lat_a, lon_a, alt_a), (lat_b, lon_b, alt_b) = self.waypoints[a], self.waypoints[b]
+        (na, ea), (nb, eb) = self._local[a], self._local[b]
+        return PathSample(
+            lat=lat_a + (lat_b - lat_a) * f,
+            lon=lon_a + (lon_b - lon_a) * f,
+            alt=alt_a + (alt_b - alt_a) * f,
+            heading=math.atan2(eb - ea, nb - na) % (2 * math.pi),
+            roll=0.0,
+            speed=self.speed,
+            index=b
+        )
+
+
+class SimulatedVehicle:
+    """UDP/TCP üzerinden MAVLink konuşan, komutları kaydeden simüle sabit kanat"""
+
+    def __init__(
+        self,
+        endpoints: List[str],
+        path: Any,
+        rates: Optional[Dict[str, float]] = None,
+        system_id: int = 1,
+        component_id: int = 1,
+        climb_rate: float = 5.0,
+        record_limit: Optional[int] = 10000
+    ):
+        self.endpoints = endpoints
+        self.path = path
+        self.default_rates = dict(DEFAULT_RATES, **(rates or {}))
+        self.system_id = system_id
+        self.component_id = component_id
+        self.climb_rate = climb_rate
+
+        # Yayın paketleri tek kez kodlanıp tüm uç noktalara aynı bayt dizisi olarak yazılır
+        self.mav = mavlink.MAVLink(None, srcSystem=system_id, srcComponent=component_id)
+        self.connections = []
+
+        self.lock = threading.Lock()
+        self.rates = dict(self.default_rates)
+        self.armed = False
+        self.custom_mode = MODES['MANUAL']
+        self.servos: Dict[int, int] = {}
+        self.airspeed_target = path.speed
+        self.mission: Dict[int, Any] = {}
+        self.mission_current = 0
+        self.reached: List[int] = []
+        self._mission_path = False
+        self.boot_time = time.monotonic()
+        self.flight_time = 0.0
+        self.climb = 0.0
+
+        # Gelen son mesajlar (zaman, tip, alanlar) test doğrulamaları için;
+        # record_limit=None sınırsız, 0 kayıt tutmaz (uzun yük testleri)
+        self.record = record_limit != 0
+        self.received: Deque[Tuple[float, str, Dict[str, Any]]] = deque(maxlen=record_limit or None)
+        self.received_count = 0
+        self.sent_count = 0
+
+        self._upload: Optional[Tuple[int, int]] = None
+        self._running = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        """Bağlantıları aç, yayın ve alım iş parçacıklarını başlat"""
+        self.connections = [
+            mavutil.mavlink_connection(endpoint, source_system=self.system_id, source_component=self.component_id)
+            for endpoint in self.endpoints
+        ]
+        self._running.set()
+
+        self._threads = [threading.Thread(target=self._publish_loop, name='sim-publish', daemon=True)]
+        for conn in self.connections:
+            self._threads.append(threading.Thread(target=self._receive_loop, args=(conn,), name='sim-receive', daemon=True))
+
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Simüle araç başlatıldı: {', '.join(self.endpoints)}")
+
+    def stop(self):
+        """İş parçacıklarını durdur ve bağlantıları kapat"""
+        self._running.clear()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads = []
+
+        for conn in self.connections:
+            conn.close()
+        self.connections = []
+
+    def reboot(self):
+        """Otopilot yeniden başlatmasını taklit et (yayın hızları varsayılana döner)"""
+        with self.lock:
+            self._reboot()
+
+    def _boot_ms(self) -> int:
+        """Açılıştan beri geçen süre (time_boot_ms alanları için)"""
+        return int((time.monotonic() - self.boot_time) * 1000)
+
+    def _reboot(self):
+        self.rates = dict(self.default_rates)
+        self.armed = False
+        self.boot_time = time.monotonic()
+        logger.info("Simüle araç yeniden başlatıldı")
+
+    def commands(self, msg_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Kaydedilen gelen mesajları döndür
+
+        Args:
+            msg_type: Sadece bu tipteki mesajlar (None ise tümü)
+
+        Returns:
+            Mesaj alan sözlükleri
+        """
+        with self.lock:
+            return [fields for _, t, fields in self.received if msg_type is None or t == msg_type]
+
+    def _broadcast(self, msg):
+        """Mesajı bir kez paketleyip tüm uç noktalara yaz"""
+        buf = msg.pack(self.mav)
+        self.mav.seq = (self.mav.seq + 1) % 256
+        for conn in self.connections:
+            try:
+                conn.write(buf)
+            except OSError:
+                pass
+        self.sent_count += 1
+
+    def _reply(self, conn, msg):
+        """Mesajı sadece isteği gönderen bağlantıya yaz"""
+        buf = msg.pack(self.mav)
+        self.mav.seq = (self.mav.seq + 1) % 256
+        conn.write(buf)
+
+    def _state(self, dt: float) -> PathSample:
+        """Simülasyon durumunu dt kadar ilerlet"""
+        if self.armed:
+            self.flight_time += dt
+            self.climb = min(self.climb + self.climb_rate * dt, 1.0e6)
+
+        sample = self.path.sample(self.flight_time)
+        sample.alt = min(sample.alt, self.climb)
+        if not self.armed:
+            sample.speed = 0.0
+            sample.roll = 0.0
+
+        # AUTO modda ara nokta geçişleri görev ilerlemesi olarak bildirilir
+        if self.custom_mode == MODES['AUTO'] and sample.index is not None and sample.index != self.mission_current:
+            previous = self.mission_current
+            self.mission_current = sample.index
+            self.reached.append(previous)
+            self._broadcast(self.mav.mission_item_reached_encode(previous))
+
+        return sample
+
+    def _encode(self, name: str, sample: PathSample, boot_ms: int):
+        """Yayın mesajını kodla"""
+        mav = self.mav
+        if name == 'HEARTBEAT':
+            base_mode = mavlink.MAV_MODE_FLAG_CUSTOM_MODE_ENABLED
+            if self.armed:
+                base_mode |= mavlink.MAV_MODE_FLAG_SAFETY_ARMED
+            return mav.heartbeat_encode(
+                mavlink.MAV_TYPE_FIXED_WING,
+                mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA,
+                base_mode,
+                self.custom_mode,
+                mavlink.MAV_STATE_ACTIVE if self.armed else mavlink.MAV_STATE_STANDBY
+            )
+        if name == 'SYS_STATUS':
+            return mav.sys_status_encode(0, 0, 0, 500, 12600, 1500, 80, 0, 0, 0, 0, 0, 0)
+        if name == 'GPS_RAW_INT':
+            return mav.gps_raw_int_encode(
+                boot_ms * 1000, 3, int(sample.lat * 1e7), int(sample.lon * 1e7), int(sample.alt * 1000),
+                90, 120, int(sample.speed * 100), int(math.degrees(sample.heading) * 100), 14
+            )
+        if name == 'GLOBAL_POSITION_INT':
+            vn = sample.speed * math.cos(sample.heading)
+            ve = sample.speed * math.sin(sample.heading)
+            return mav.global_position_int_encode(
+                boot_ms, int(sample.lat * 1e7), int(sample.lon * 1e7), int(sample.alt * 1000),
+                int(sample.alt * 1000), int(vn * 100), int(ve * 100), 0,
+                int(math.degrees(sample.heading) * 100) % 36000
+            )
+        if name == 'ATTITUDE':
+            yaw = sample.heading if sample.heading <= math.pi else sample.heading - 2 * math.pi
+            return mav.attitude_encode(boot_ms, sample.roll, 0.0, yaw, 0.0, 0.0, 0.0)
+        if name == 'VFR_HUD':
+            return mav.vfr_hud_encode(
+                sample.speed, sample.speed, int(math.degrees(sample.heading)) % 360,
+                60 if self.armed else 0, sample.alt, 0.0
+            )
+        if name == 'MISSION_CURRENT':
+            return mav.mission_current_encode(self.mission_current)
+        return None
+
+    def _publish_loop(self):
+        """Her mesajı kendi hızında zamanlayarak yayınla"""
+        next_due: Dict[str, float] = {}
+        last = time.perf_counter()
+
+        while self._running.is_set():
+            now = time.perf_counter()
+            with self.lock:
+                sample = self._state(now - last)
+                boot_ms = self._boot_ms()
+
+                due_soonest = now + 0.05
+                for name, rate in self.rates.items():
+                    if rate <= 0:
+                        next_due.pop(name, None)
+                        continue
+
+                    due = next_due.setdefault(name, now)
+                    if due <= now:
+                        msg = self._encode(name, sample, boot_ms)
+                        if msg is not None:
+                            self._broadcast(msg)
+                        # Geride kalındıysa birikmiş mesajlar atlanır
+                        due = max(due + 1.0 / rate, now)
+                        next_due[name] = due
+                    due_soonest = min(due_soonest, due)
+            last = now
+
+            delay = due_soonest - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    def _receive_loop(self, conn):
+        """Bağlantıdan gelen komutları işle"""
+        while self._running.is_set():
+            try:
+                msg = conn.recv_match(blocking=True, timeout=0.2)
+            except OSError:
+                continue
+            if msg is None or msg.get_type() == 'BAD_DATA':
+                continue
+
+            msg_type = msg.get_type()
+            with self.lock:
+                if msg_type != 'HEARTBEAT':
+                    self.received_count += 1
+                    if self.record:
+                        self.received.append((time.monotonic(), msg_type, msg.to_dict()))
+                try:
+                    self._handle(conn, msg_type, msg)
+                except Exception as e:
+                    logger.error(f"Simüle araç komut hatası ({msg_type}): {e}")
+
+    def _handle(self, conn, msg_type: str, msg):
+        """Tek mesajı işle (kilit altında çağrılır)"""
+        mav = self.mav
+
+        if msg_type == 'COMMAND_LONG':
+            result = self._handle_command(conn, msg)
+            self._reply(conn, mav.command_ack_encode(msg.command, result))
+
+        elif msg_type == 'SET_MODE':
+            self.custom_mode = msg.custom_mode
+
+        elif msg_type == 'REQUEST_DATA_STREAM':
+            rate = msg.req_message_rate if msg.start_stop else 0
+            streams = DATA_STREAMS if msg.req_stream_id == mavlink.MAV_DATA_STREAM_ALL else {
+                msg.req_stream_id: DATA_STREAMS.get(msg.req_stream_id, ())
+            }
+            for names in streams.values():
+                for name in names:
+                    self.rates[name] = float(rate)
+
+        elif msg_type == 'MISSION_COUNT':
+            self.mission = {}
+            if msg.count == 0:
+                # Boş görev: istenecek öğe yok, hemen onaylanır
+                self._upload = None
+                self._reply(conn, mav.mission_ack_encode(msg.get_srcSystem(), msg.get_srcComponent(),
+                                                         mavlink.MAV_MISSION_ACCEPTED, msg.mission_type))
+            else:
+                self._upload = (0, msg.count)
+                self._request_item(conn, msg, 0)
+
+        elif msg_type == 'MISSION_WRITE_PARTIAL_LIST':
+            self._upload = (msg.start_index, msg.end_index + 1)
+            self._request_item(conn, msg, msg.start_index)
+
+        elif msg_type in ('MISSION_ITEM_INT', 'MISSION_ITEM') and self._upload is not None:
+            start, end = self._upload
+            self.mission[msg.seq] = msg
+            if msg.seq + 1 < end:
+                self._request_item(conn, msg, msg.seq + 1)
+            else:
+                self._upload = None
+                self._reply(conn, mav.mission_ack_encode(msg.get_srcSystem(), msg.get_srcComponent(),
+                                                         mavlink.MAV_MISSION_ACCEPTED, msg.mission_type))
+                self._follow_mission()
+
+        elif msg_type == 'MISSION_CLEAR_ALL':
+            self.mission = {}
+            self._reply(conn, mav.mission_ack_encode(msg.get_srcSystem(), msg.get_srcComponent(),
+                                                     mavlink.MAV_MISSION_ACCEPTED, msg.mission_type))
+
+        elif msg_type == 'MISSION_REQUEST_LIST':
+            self._reply(conn, mav.mission_count_encode(msg.get_srcSystem(), msg.get_srcComponent(),
+                                                       len(self.mission), msg.mission_type))
+
+        elif msg_type == 'MISSION_REQUEST_INT' and msg.seq in self.mission:
+            item = self.mission[msg.seq]
+            self._reply(conn, mav.mission_item_int_encode(
+                msg.get_srcSystem(), msg.get_srcComponent(), item.seq, item.frame, item.command,
+                0, item.autocontinue, item.param1, item.param2, item.param3, item.param4,
+                item.x, item.y, item.z, item.mission_type
+            ))
+
+    def _request_item(self, conn, msg, seq: int):
+        """Görev adımını, aktarımı yürüten mesajın göndericisinden iste"""
+        self._reply(conn, self.mav.mission_request_int_encode(
+            msg.get_srcSystem(), msg.get_srcComponent(), seq, msg.mission_type
+        ))
+
+    def _follow_mission(self):
+        """Yüklenen görevin ara noktalarını (ev hariç) uçuş yolu yap"""
+        points = [
+            (item.x / 1e7, item.y / 1e7, item.z)
+            for seq, item in sorted(self.mission.items())
+            if seq > 0 and item.command == mavlink.MAV_CMD_NAV_WAYPOINT
+        ]
+        if len(points) >= 2:
+            home = self.mission[0]
+            self.path = WaypointPath([(home.x / 1e7, home.y / 1e7, home.z)] + points, self.path.speed)
+            self.flight_time = 0.0
+            self.mission_current = 1
+            self._mission_path = True
+
+    def _handle_command(self, conn, msg) -> int:
+        """COMMAND_LONG işle, MAV_RESULT döndür"""
+        command = msg.command
+
+        if command == mavlink.MAV_CMD_COMPONENT_ARM_DISARM:
+            self.armed = msg.param1 == 1
+        elif command == mavlink.MAV_CMD_DO_SET_MODE:
+            self.custom_mode = int(msg.param2)
+        elif command == mavlink.MAV_CMD_DO_SET_SERVO:
+            self.servos[int(msg.param1)] = int(msg.param2)
+        elif command == mavlink.MAV_CMD_DO_CHANGE_SPEED:
+            self.airspeed_target = msg.param2
+        elif command == mavlink.MAV_CMD_SET_MESSAGE_INTERVAL:
+            name = mavlink.mavlink_map[int(msg.param1)].msgname if int(msg.param1) in mavlink.mavlink_map else None
+            if name is None:
+                return mavlink.MAV_RESULT_DENIED
+            interval = msg.param2
+            if interval == 0:
+                self.rates[name] = self.default_rates.get(name, 0.0)
+            elif interval < 0:
+                self.rates[name] = 0.0
+            else:
+                self.rates[name] = 1e6 / interval
+        elif command == mavlink.MAV_CMD_REQUEST_MESSAGE:
+            msg_id = int(msg.param1)
+            if msg_id not in mavlink.mavlink_map:
+                return mavlink.MAV_RESULT_DENIED
+            sample = self.path.sample(self.flight_time)
+            reply = self._encode(mavlink.mavlink_map[msg_id].msgname, sample, self._boot_ms())
+            if reply is None:
+                return mavlink.MAV_RESULT_UNSUPPORTED
+            self._reply(conn, reply)
+        elif command == mavlink.MAV_CMD_DO_SET_MISSION_CURRENT:
+            seq = int(msg.param1)
+            self.mission_current = seq
+            # Görev yolunda araç hedef adıma giden bacağın başına taşınır
+            if self._mission_path and 0 < seq < len(self.path.waypoints):
+                self.flight_time = sum(self.path.lengths[:seq - 1]) / self.path.speed
+        elif command == mavlink.MAV_CMD_MISSION_START:
+            self.custom_mode = MODES['AUTO']
+        elif command == mavlink.MAV_CMD_PREFLIGHT_REBOOT_SHUTDOWN:
+            self._reboot()
+        else:
+            return mavlink.MAV_RESULT_UNSUPPORTED
+
+        return mavlink.MAV_RESULT_ACCEPTED
+
+
+def main():
+    """Simüle aracı komut satırından çalıştır"""
+    parser = argparse.ArgumentParser(description='Simüle MAVLink aracı (yük/dayanıklılık testi)')
+    parser.add_argument('--out', type=str, action='append',
+                        help='Uç nokta (ör. udpout:127.0.0.1:14550, tcpin:0.0.0.0:5760); birden çok verilebilir')
+    parser.add_argument('--home', type=float, nargs=2, default=[39.9255, 32.8368], metavar=('LAT', 'LON'),
+                        help='Daire merkezi')
+    parser.add_argument('--radius', type=float, default=150.0, help='Daire yarıçapı (m)')
+    parser.add_argument('--altitude', type=float, default=50.0, help='Uçuş irtifası (m)')
+    parser.add_argument('--speed', type=float, default=18.0, help='Yer hızı (m/s)')
+    parser.add_argument('--rate', type=str, action='append', default=[],
+                        help='Mesaj hızı MESAJ=HZ (ör. ATTITUDE=500)')
+    parser.add_argument('--armed', action='store_true', help='Arm edilmiş başla')
+    parser.add_argument('--record-limit', type=int, default=10000,
+                        help='Saklanacak son gelen mesaj sayısı (0 kaydetme)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    rates = {}
+    for item in args.rate:
+        name, value = item.split('=')
+        rates[name.upper()] = float(value)
+
+    endpoints = args.out or ['udpout:127.0.0.1:14550', 'udpout:127.0.0.1:14551']
+    vehicle = SimulatedVehicle(
+        endpoints,
+        CirclePath(tuple(args.home), args.radius, args.altitude, args.speed),
+        rates,
+        record_limit=args.record_limit
+    )
+    vehicle.armed = args.armed
+    vehicle.start()
+
+    try:
+        last_count = 0
+        while True:
+            time.sleep(5)
+            count = vehicle.sent_count
+            logger.info(f"Yayın: {(count - last_count) / 5:.0f} mesaj/s, alınan komut: {vehicle.received_count}")
+            last_count = count
+    except KeyboardInterrupt:
+        vehicle.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,66 +1,73 @@
-import collections
-import collections.abc
-
-# Dronekit Python 3.10+ hatasını düzeltmek için yama
-if not hasattr(collections, 'MutableMapping'):
-    collections.MutableMapping = collections.abc.MutableMapping
-
-
 """
 Simple script for take off and control with arrow keys
 """
+import asyncio
+import logging
 import time
-from dronekit import connect, VehicleMode, LocationGlobalRelative
 
-#-- Connect to the vehicle
-print('Connecting...')
-vehicle = connect('udp:127.0.0.1:14551', wait_ready=False)
+from arac_kontrol import Vehicle
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
 
 #-- Define the function for takeoff
-def arm_and_takeoff(tgt_altitude):
+async def arm_and_takeoff(vehicle, tgt_altitude):
     print("Uçak hazırlanıyor...")
 
-    while not vehicle.is_armable:
-        print("Uçağın hazır olması bekleniyor (GPS vb.)...")
-        time.sleep(1)
+    print("Uçağın hazır olması bekleniyor (GPS vb.)...")
+    await vehicle.armable(timeout=120)
 
     # Uçaklarda kalkış için genellikle TAKEOFF modu kullanılır
-    vehicle.mode = VehicleMode("TAKEOFF")
-    vehicle.armed = True
+    await vehicle.set_mode("TAKEOFF")
 
-    while not vehicle.armed:
-        print("Arm bekleniyor...")
-        time.sleep(1)
+    print("Arm bekleniyor...")
+    await vehicle.arm(timeout=10)
 
     print("Kalkış başlatıldı! (Pistte hızlanıyor...)")
 
-    # İrtifa kontrolü
-    while True:
-        altitude = vehicle.location.global_relative_frame.alt
-        print(f"Şu anki İrtifa: {altitude:.1f}m")
-        if altitude >= tgt_altitude - 1:
-            print("Hedef irtifaya ulaşıldı.")
-            break
-        time.sleep(1)
+    # İrtifa kontrolü her GLOBAL_POSITION_INT mesajında yapılır, ekrana saniyede bir yazılır
+    last_report = 0.0
+
+    def report_altitude(msg):
+        nonlocal last_report
+        now = time.monotonic()
+        if now - last_report >= 1.0:
+            last_report = now
+            print(f"Şu anki İrtifa: {msg.relative_alt / 1000.0:.1f}m")
+
+    vehicle.on('GLOBAL_POSITION_INT', report_altitude)
+    try:
+        await vehicle.altitude_at_least(tgt_altitude - 1, timeout=120)
+    finally:
+        vehicle.off('GLOBAL_POSITION_INT', report_altitude)
+    print("Hedef irtifaya ulaşıldı.")
 
     # Kalktıktan sonra komut göndermek için GUIDED moda geçmelisin
-    vehicle.mode = VehicleMode("GUIDED")
+    await vehicle.set_mode("GUIDED")
 
 
-#MAIN PROGRAM
-arm_and_takeoff(10)
+async def main():
+    #-- Connect to the vehicle
+    print('Connecting...')
+    vehicle = Vehicle('udp:127.0.0.1:14551')
+    await vehicle.connect(timeout=30)
 
-#set the default speed
-vehicle.airspeed = 15
+    try:
+        await arm_and_takeoff(vehicle, 10)
 
+        #set the default speed
+        await vehicle.set_airspeed(15)
 
-time.sleep(3)
+        await asyncio.sleep(3)
 
-#Coming back
-print("Coming back")
-vehicle.mode = VehicleMode("RTL")
+        #Coming back
+        print("Coming back")
+        await vehicle.set_mode("RTL")
+    finally:
+        #Close connection
+        vehicle.close()
 
-time.sleep(2)
 
-#Close connection
-vehicle.close()
+#MAIN PROGRAM
+if __name__ == '__main__':
+    asyncio.run(main())